@@ -38,7 +38,7 @@ def render(base_dir: Path, config: dict):
     
     if st.button("🚀 Run SIM-LITE", type="primary"):
         with st.spinner("Running Monte Carlo simulation..."):
-            sim_result = run_simulation(returns, base_dir, n_sims=n_sims, horizon=horizon)
+            sim_result = run_simulation(returns, base_dir, n_sims=n_sims, horizon=horizon, seed=config.get("seed"))
             
             st.success("✅ Simulation completed!")
             
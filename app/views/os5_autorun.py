@@ -4,8 +4,8 @@ import time
 import pandas as pd
 from pathlib import Path
 
-from src.scenarios import load_scenarios, apply_scenario
-from src.core_pipeline import run_observation, run_simulation, evaluate_gates
+from src.scenarios import load_scenarios
+from src.scenario_runner import ScenarioContext, execute_scenario as run_scenario
 from src.explainer import explain_decision_flow
 from src.visualization import plot_market_with_decision, plot_gates_timeline
 
@@ -74,11 +74,13 @@ def render_run_all(base_dir: Path, config: dict, scenarios: list):
         
         progress_bar = st.progress(0)
         status_text = st.empty()
+        # un seul contexte pour le lot : store ouvert et OS1/OS2 de base calculés une fois
+        context = ScenarioContext.from_base_dir(base_dir)
         
         for i, scenario in enumerate(scenarios):
             status_text.text(f"Running {scenario['id']}...")
             
-            result = execute_scenario(base_dir, config, scenario)
+            result = execute_scenario(base_dir, config, scenario, context)
             results.append(result)
             
             progress_bar.progress((i + 1) / len(scenarios))
@@ -123,9 +125,10 @@ def render_comparison(base_dir: Path, config: dict, scenarios: list):
     if st.button("🔄 Load All Scenarios", type="primary"):
         with st.spinner("Loading all scenarios..."):
             results = []
+            context = ScenarioContext.from_base_dir(base_dir)
             
             for scenario in scenarios:
-                result = execute_scenario(base_dir, config, scenario)
+                result = execute_scenario(base_dir, config, scenario, context)
                 results.append(result)
             
             st.session_state["comparison_results"] = results
@@ -153,65 +156,12 @@ def render_comparison(base_dir: Path, config: dict, scenarios: list):
                         fig = plot_gates_timeline(result["gates_result"])
                         st.plotly_chart(fig, use_container_width=True, key=f"os5_timeline_{result['scenario_id']}")
 
-def execute_scenario(base_dir: Path, config: dict, scenario: dict) -> dict:
-    """Exécute un scénario complet et retourne les résultats."""
-    
-    # Appliquer le scénario
-    params = apply_scenario(scenario)
-    
-    # Charger les données
-    data_path = base_dir / "data" / "trading" / "BTC_1h.csv"
-    df = pd.read_csv(data_path)
-    prices = df["close"].values
-    returns = pd.Series(prices).pct_change().dropna().values
-    
-    # OS1: Observation
-    features = run_observation(returns, base_dir)
-    
-    # Override avec market_conditions du scénario si présent
-    if "market_conditions" in params:
-        features.update(params["market_conditions"])
-    
-    # OS2: Simulation
-    sim_result = run_simulation(returns, base_dir, n_sims=100, horizon=10)
-    
-    # Override simulation si présent
-    if params.get("simulation_override"):
-        sim_result.update(params["simulation_override"])
-    
-    # OS3: Gates
-    intent = params.get("intent", {})
-    intent["timestamp"] = time.time()
-    intent["coherence"] = features.get("coherence", 0.5)
-    
-    state = {
-        "last_invest_ts": 0.0,
-        "equity_curve": [1.0],
-        "consecutive_losses": 0,
-        "cooldown_remaining": 0
-    }
-    
-    gates_result = evaluate_gates(
-        intent=intent,
-        features=features,
-        sim_result=sim_result,
-        hold_started_ts=params.get("time_elapsed", 0.0),
-        tau_seconds=params.get("tau", 10.0),
-        state=state,
-        returns=returns,
-        base_dir=base_dir
-    )
-    
-    return {
-        "scenario_id": scenario["id"],
-        "expected_decision": params.get("expected_decision"),
-        "expected_reason": params.get("expected_reason"),
-        "actual_decision": gates_result.get("decision"),
-        "actual_reason": gates_result.get("reason"),
-        "features": features,
-        "sim_result": sim_result,
-        "gates_result": gates_result
-    }
+def execute_scenario(base_dir: Path, config: dict, scenario: dict, context: ScenarioContext = None) -> dict:
+    """Exécute un scénario complet et retourne les résultats (voir src.scenario_runner).
+
+    `context` partage returns, features de base et simulation entre les scénarios d'un lot.
+    """
+    return run_scenario(base_dir, scenario, context)
 
 def display_scenario_result(result: dict, scenario: dict):
     """Affiche les résultats détaillés d'un scénario."""
@@ -4,7 +4,8 @@ from pathlib import Path
 import pandas as pd
 
 from src.scenario_generator import ScenarioGenerator
-from src.core_pipeline import run_observation, run_simulation, evaluate_gates
+from src.core_pipeline import evaluate_gates
+from src.scenario_runner import ScenarioContext
 from src.visualization import plot_market_with_decision, plot_features_radar, plot_gates_timeline
 from src.explainer import explain_decision_flow
 
@@ -104,6 +105,7 @@ def render_batch(base_dir: Path, config: dict):
         
         if st.button("▶️ Run All Scenarios"):
             results = []
+            context = ScenarioContext.from_base_dir(base_dir)
             
             progress_bar = st.progress(0)
             status_text = st.empty()
@@ -111,7 +113,7 @@ def render_batch(base_dir: Path, config: dict):
             for i, scenario in enumerate(scenarios):
                 status_text.text(f"Running scenario {i+1}/{len(scenarios)}...")
                 
-                result = execute_scenario(base_dir, config, scenario)
+                result = execute_scenario(base_dir, config, scenario, context)
                 results.append(result)
                 
                 progress_bar.progress((i + 1) / len(scenarios))
@@ -160,6 +162,7 @@ def render_stress_test(base_dir: Path, config: dict):
         scenarios = generator.generate_stress_test_suite()
         
         results = []
+        context = ScenarioContext.from_base_dir(base_dir)
         
         progress_bar = st.progress(0)
         status_text = st.empty()
@@ -167,7 +170,7 @@ def render_stress_test(base_dir: Path, config: dict):
         for i, scenario in enumerate(scenarios):
             status_text.text(f"Running {scenario['name']}...")
             
-            result = execute_scenario(base_dir, config, scenario)
+            result = execute_scenario(base_dir, config, scenario, context)
             results.append(result)
             
             progress_bar.progress((i + 1) / len(scenarios))
@@ -198,24 +201,19 @@ def render_stress_test(base_dir: Path, config: dict):
                     fig = plot_gates_timeline(result["gates_result"])
                     st.plotly_chart(fig, use_container_width=True, key=f"os6_stress_{result['scenario_id']}_{idx}")
 
-def execute_scenario(base_dir: Path, config: dict, scenario: dict) -> dict:
-    """Exécute un scénario et retourne les résultats."""
-    
-    # Charger les données
-    data_path = base_dir / "data" / "trading" / "BTC_1h.csv"
-    df = pd.read_csv(data_path)
-    prices = df["close"].values
-    returns = pd.Series(prices).pct_change().dropna().values
-    
-    # OS1: Observation
-    features = run_observation(returns, base_dir)
+def execute_scenario(base_dir: Path, config: dict, scenario: dict, context: ScenarioContext = None) -> dict:
+    """Exécute un scénario et retourne les résultats.
+
+    `context` partage returns, features de base et simulation entre les scénarios d'un lot.
+    """
+    context = context or ScenarioContext.from_base_dir(base_dir)
+    returns = context.returns
     
-    # Override avec market_conditions
-    if "market_conditions" in scenario:
-        features.update(scenario["market_conditions"])
+    # OS1: Observation (features de base + market_conditions)
+    features = context.features(scenario.get("market_conditions"))
     
-    # OS2: Simulation
-    sim_result = run_simulation(returns, base_dir, n_sims=100, horizon=10)
+    # OS2: Simulation (tirage non seedé, partagé par le lot)
+    sim_result = context.simulation(None)
     
     # OS3: Gates
     intent = scenario.get("intent", {})
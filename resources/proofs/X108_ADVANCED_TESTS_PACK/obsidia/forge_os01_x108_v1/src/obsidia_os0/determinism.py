@@ -1,7 +1,7 @@
 from __future__ import annotations
-import json, hashlib
-from dataclasses import is_dataclass, asdict
-from typing import Any
+import copy, json, hashlib
+from dataclasses import fields, is_dataclass, asdict
+from typing import Any, List, Tuple
 
 def _to_primitive(x: Any):
     if is_dataclass(x):
@@ -14,7 +14,125 @@ def _to_primitive(x: Any):
         return x
     return {"__repr__": repr(x)}
 
+# ===== Fragments JSON mémoïsés =====
+# canonical_hash reste, au bit près, le sha256 de json.dumps(_to_primitive(x), sort_keys=True) ;
+# seul le fragment JSON de chaque nœud IR est mémoïsé sur l'attribut _canonical. Comme asdict
+# aplatit les nœuds imbriqués, seul un nœud rencontré hors de tout nœud porte "__type__" : le
+# fragment mémoïsé est celui des champs, "__type__" est ajouté à la volée. Un nœud dont le
+# sous-arbre contient des listes ou des dicts (FLOW.steps, LOOP.body...) garde un instantané de
+# leurs éléments et n'est réutilisé que si aucun n'a changé ; une copie (copy, deepcopy, pickle)
+# ne réutilise jamais le fragment de l'original.
+
+_CACHE_ATTR = "_canonical"
+
+class _Unsupported(Exception):
+    """Structure laissée à la sérialisation de référence."""
+
+class _Walk:
+    """Conteneurs mutables et nœuds à revalider rencontrés sous un nœud."""
+    def __init__(self):
+        self.watch: List[Tuple[Any, tuple]] = []
+        self.deps: List[Any] = []
+        self.ok = True
+
+def _dump(x: Any) -> str:
+    return json.dumps(x, ensure_ascii=False, separators=(",",":"))
+
+def _dict_fragment(items) -> str:
+    # mêmes clés/ordre que _to_primitive(dict) + json.dumps(sort_keys=True)
+    d = {}
+    for k, frag in sorted(items, key=lambda kv: str(kv[0])):
+        d[str(k)] = frag
+    return "{" + ",".join(_dump(k) + ":" + d[k] for k in sorted(d)) + "}"
+
+def _snapshot(box: Any) -> tuple:
+    return tuple(box) if isinstance(box, list) else tuple(v for kv in box.items() for v in kv)
+
+def _fresh(x: Any, entry: tuple) -> bool:
+    owner, _, watch, deps = entry
+    if owner != id(x):
+        return False
+    for box, snap in watch:
+        cur = _snapshot(box)
+        if len(cur) != len(snap) or any(a is not b for a, b in zip(cur, snap)):
+            return False
+    return all(_cached_body(d) is not None for d in deps)
+
+def _cached_body(x: Any):
+    entry = getattr(x, "__dict__", {}).get(_CACHE_ATTR)
+    return entry[1] if entry is not None and _fresh(x, entry) else None
+
+def _node_body(x: Any, walk: _Walk) -> str:
+    """JSON des champs du nœud x tel que produit par asdict (sans "__type__")."""
+    entry = getattr(x, "__dict__", {}).get(_CACHE_ATTR)
+    if entry is not None and _fresh(x, entry):
+        if entry[2] or entry[3]:
+            walk.deps.append(x)
+        return entry[1]
+    own = _Walk()
+    body = _dict_fragment([(f.name, _inner(getattr(x, f.name), own)) for f in fields(x)])
+    cached = False
+    if own.ok and x.__dataclass_params__.frozen:
+        try:
+            object.__setattr__(x, _CACHE_ATTR, (id(x), body, tuple(own.watch), tuple(own.deps)))
+            cached = True
+        except AttributeError:  # __slots__
+            pass
+    if not cached:
+        walk.ok = False
+    elif own.watch or own.deps:
+        walk.deps.append(x)
+    return body
+
+def _inner(x: Any, walk: _Walk) -> str:
+    # valeur d'un champ de nœud : asdict puis _to_primitive
+    if is_dataclass(x):
+        if isinstance(x, type):
+            raise _Unsupported
+        return _node_body(x, walk)
+    if isinstance(x, (list, tuple)):
+        if isinstance(x, list):
+            walk.watch.append((x, _snapshot(x)))
+        return "[" + ",".join(_inner(i, walk) for i in x) + "]"
+    if isinstance(x, dict):
+        walk.watch.append((x, _snapshot(x)))
+        items = []
+        for k, v in x.items():
+            if not (isinstance(k, (str,int,float,bool)) or k is None):
+                raise _Unsupported  # asdict convertit aussi les clés
+            items.append((k, _inner(v, walk)))
+        return _dict_fragment(items)
+    if isinstance(x, (str,int,float,bool)) or x is None:
+        return _dump(x)
+    walk.ok = False
+    return _dump({"__repr__": repr(copy.deepcopy(x))})  # asdict copie les objets arbitraires
+
+def _typed(x: Any, body: str) -> str:
+    name = x.__class__.__name__
+    if all(f.name > "__type__" for f in fields(x)):
+        return "{" + _dump("__type__") + ":" + _dump(name) + ("}" if body == "{}" else "," + body[1:])
+    # champ triant avant "__type__" : on reconstruit le dict complet
+    walk = _Walk()
+    return _dict_fragment([("__type__", _dump(name))] + [(f.name, _inner(getattr(x, f.name), walk)) for f in fields(x)])
+
+def _outer(x: Any) -> str:
+    # _to_primitive hors de tout nœud : les nœuds portent "__type__"
+    if is_dataclass(x):
+        if isinstance(x, type):
+            raise _Unsupported
+        return _typed(x, _node_body(x, _Walk()))
+    if isinstance(x, (list, tuple)):
+        return "[" + ",".join(_outer(i) for i in x) + "]"
+    if isinstance(x, dict):
+        return _dict_fragment([(k, _outer(v)) for k, v in x.items()])
+    if isinstance(x, (str,int,float,bool)) or x is None:
+        return _dump(x)
+    return _dump({"__repr__": repr(x)})
+
 def canonical_hash(ir_program: Any) -> str:
-    prim=_to_primitive(ir_program)
-    blob=json.dumps(prim, ensure_ascii=False, sort_keys=True, separators=(",",":"))
+    try:
+        blob = _outer(ir_program)
+    except (_Unsupported, RecursionError):
+        prim=_to_primitive(ir_program)
+        blob=json.dumps(prim, ensure_ascii=False, sort_keys=True, separators=(",",":"))
     return hashlib.sha256(blob.encode("utf-8")).hexdigest()
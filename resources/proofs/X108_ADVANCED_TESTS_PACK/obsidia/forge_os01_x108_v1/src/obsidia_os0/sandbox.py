@@ -1,6 +1,9 @@
 from __future__ import annotations
+import operator
+from array import array
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Dict, List, Callable, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Callable, Optional, Tuple, Union
 from . import ir
 
 @dataclass
@@ -9,20 +12,155 @@ class ExecLog:
     node: str
     detail: str
 
+# off : rien ; counters : compteurs par nœud ; ring : compteurs + N dernières entrées ; full : tout
+LOG_MODES = ("off", "counters", "ring", "full")
+
+Template = Union[str, Callable[..., str]]
+
+def _format_detail(template: Template, args: tuple) -> str:
+    if callable(template):
+        return template(*args)
+    return template.format(*args) if args else template
+
+def _format_call(fn: Any, *args: Any) -> str:
+    return f"{fn}({', '.join(map(repr,args))})"
+
+# types immuables : formatés à la lecture ; toute autre valeur est figée (repr) à l'enregistrement
+_LAZY_TYPES = frozenset((bool, int, float, complex, str, bytes, type(None)))
+
+class _Snapshot:
+    """repr d'une valeur au moment de l'enregistrement (sert aussi pour str/format)."""
+    __slots__ = ("text",)
+
+    def __init__(self, value: Any):
+        self.text = repr(value)
+
+    def __repr__(self) -> str:
+        return self.text
+
+    __str__ = __repr__
+
+def _freeze(args: tuple) -> tuple:
+    return tuple(a if type(a) in _LAZY_TYPES else _Snapshot(a) for a in args)
+
+class ExecLogBuffer:
+    """
+    Journal d'exécution de la Sandbox.
+
+    Les détails sont stockés sous forme (gabarit, arguments) et formatés à la lecture.
+    Seuls les scalaires immuables (int, float, str...) restent des références : toute autre
+    valeur est figée par son repr à l'enregistrement, si bien que le journal montre l'état
+    au moment du pas et ne garde aucune valeur du programme en vie. En mode "full", pas et
+    nœuds sont dans des tableaux compacts (array) ; en mode "ring", seules les `capacity`
+    dernières entrées sont gardées (mémoire bornée). Se lit comme une liste d'ExecLog.
+    """
+
+    def __init__(self, mode: str = "full", capacity: int = 10_000):
+        if mode not in LOG_MODES:
+            raise ValueError(f"log mode must be one of {LOG_MODES}, got {mode!r}")
+        self.mode = mode
+        self.capacity = max(1, int(capacity))
+        self.counters: Dict[str, int] = {}
+        self._codes: Dict[Any, int] = {}
+        self._interned: List[Any] = []  # noms de nœuds et gabarits, indexés par code
+        self._steps = array("q")
+        self._nodes = array("I")
+        self._templates = array("I")
+        self._args: List[tuple] = []
+        self._ring: deque = deque(maxlen=self.capacity)
+
+    def record(self, step: int, node: str, template: Template, args: tuple = ()) -> None:
+        mode = self.mode
+        if mode == "off":
+            return
+        counters = self.counters
+        counters[node] = counters.get(node, 0) + 1
+        if mode == "counters":
+            return
+        for a in args:
+            if type(a) not in _LAZY_TYPES:
+                args = _freeze(args)
+                break
+        if mode == "full":
+            self._steps.append(step)
+            self._nodes.append(self._intern(node))
+            self._templates.append(self._intern(template))
+            self._args.append(args)
+        elif mode == "ring":
+            self._ring.append((step, node, template, args))
+
+    def clear(self) -> None:
+        self.counters.clear()
+        del self._steps[:], self._nodes[:], self._templates[:], self._args[:]
+        self._ring.clear()
+
+    def _intern(self, key: Any) -> int:
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self._interned)
+            self._interned.append(key)
+        return code
+
+    def _entry(self, i: int) -> ExecLog:
+        if self.mode == "full":
+            template = self._interned[self._templates[i]]
+            return ExecLog(self._steps[i], self._interned[self._nodes[i]], _format_detail(template, self._args[i]))
+        step, node, template, args = self._ring[i]
+        return ExecLog(step, node, _format_detail(template, args))
+
+    def __len__(self) -> int:
+        if self.mode == "full":
+            return len(self._steps)
+        return len(self._ring)
+
+    def __getitem__(self, idx):
+        n = len(self)
+        if isinstance(idx, slice):
+            return [self._entry(i) for i in range(*idx.indices(n))]
+        if idx < 0:
+            idx += n
+        if not 0 <= idx < n:
+            raise IndexError("log index out of range")
+        return self._entry(idx)
+
+    def __iter__(self) -> Iterator[ExecLog]:
+        for i in range(len(self)):
+            yield self._entry(i)
+
+    def to_list(self) -> List[ExecLog]:
+        return list(self)
+
 class Sandbox:
-    def __init__(self, call_registry: Optional[Dict[str, Callable[..., Any]]] = None):
+    """
+    Exécuteur IR L2.
+
+    `compiled=True` compile chaque programme (compile_program) avant exécution ;
+    un CompiledProgram peut aussi être passé directement à run().
+    `log_mode` / `log_capacity` : voir ExecLogBuffer (défaut "full", journal complet).
+    """
+
+    def __init__(self, call_registry: Optional[Dict[str, Callable[..., Any]]] = None, compiled: bool = False,
+                 log_mode: str = "full", log_capacity: int = 10_000):
         self.state: Dict[str, Any] = {}
         self.time: int = 0
-        self.log: List[ExecLog] = []
+        self.log = ExecLogBuffer(log_mode, log_capacity)
         self._step = 0
         self.calls = call_registry or {}
+        self.compiled = compiled
 
     def run(self, program: Any) -> Any:
+        if isinstance(program, CompiledProgram):
+            return program.run(self)
+        if self.compiled:
+            return compile_program(program).run(self)
         return self._exec(program)
 
-    def _tick(self, node: Any, detail: str = ""):
+    def _record(self, node_name: str, template: Template = "", args: tuple = ()):
         self._step += 1
-        self.log.append(ExecLog(self._step, node.__class__.__name__, detail))
+        self.log.record(self._step, node_name, template, args)
+
+    def _tick(self, node: Any, template: Template = "", *args: Any):
+        self._record(node.__class__.__name__, template, args)
 
     def _eval(self, x: Any) -> Any:
         # VALUE
@@ -64,30 +202,30 @@ class Sandbox:
             if node.t < self.time:
                 raise ir.ERROR(f"TIME désordonné: {node.t} < {self.time}", code="R8")
             self.time = node.t
-            self._tick(node, f"time={self.time}")
+            self._tick(node, "time={}", self.time)
             return None
 
         if isinstance(node, ir.EVENT):
             # R7: EVENT should be external; we only log it, no mutation unless user handles it explicitly.
-            self._tick(node, f"event={node.name} t={node.t} payload={node.payload!r}")
+            self._tick(node, "event={} t={} payload={!r}", node.name, node.t, node.payload)
             return None
 
         if isinstance(node, ir.STATE):
             # Decl only
             if node.name not in self.state:
                 self.state[node.name] = None
-            self._tick(node, f"declare {node.name}")
+            self._tick(node, "declare {}", node.name)
             return None
 
         if isinstance(node, ir.WRITE):
             val = self._eval(node.value)
             self.state[node.state.name] = val
-            self._tick(node, f"{node.state.name}={val!r}")
+            self._tick(node, "{}={!r}", node.state.name, val)
             return None
 
         if isinstance(node, ir.READ):
             val=self._eval(node)
-            self._tick(node, f"{node.state.name} -> {val!r}")
+            self._tick(node, "{} -> {!r}", node.state.name, val)
             return ir.VALUE(val)
 
         if isinstance(node, ir.FLOW):
@@ -98,7 +236,7 @@ class Sandbox:
 
         if isinstance(node, ir.COND):
             res=bool(self._eval(node.expr))
-            self._tick(node, f"cond={res}")
+            self._tick(node, "cond={}", res)
             return res
 
         if isinstance(node, ir.LOOP):
@@ -108,7 +246,7 @@ class Sandbox:
                     raise ir.ERROR("LOOP sans sortie (max_iters atteint)", code="R6")
                 it += 1
                 if not bool(self._exec(node.cond)):
-                    self._tick(node, f"loop_exit iters={it}")
+                    self._tick(node, "loop_exit iters={}", it)
                     return None
                 for s in node.body:
                     self._exec(s)
@@ -117,7 +255,7 @@ class Sandbox:
             if node.fn not in self.calls:
                 raise ir.ERROR(f"CALL inconnu: {node.fn}", code="R4")
             args=[self._eval(a) for a in node.args]
-            self._tick(node, f"{node.fn}({', '.join(map(repr,args))})")
+            self._tick(node, _format_call, node.fn, *args)
             try:
                 ret=self.calls[node.fn](*args)
             except Exception as e:
@@ -125,7 +263,240 @@ class Sandbox:
             return ir.RETURN(ir.VALUE(ret))
 
         if isinstance(node, ir.RETURN):
-            self._tick(node, f"return {node.value!r}")
+            self._tick(node, "return {!r}", node.value)
             return node.value
 
         raise ir.ERROR(f"Hors-alphabet: {type(node).__name__}", code="R10")
+
+
+# ===== Mode compilé =====
+# Le programme IR est abaissé une fois en arbre de closures f(sb, slots) : plus de chaîne
+# isinstance ni d'échelle de if par évaluation, et l'état nommé vit dans une liste indexée
+# par slot (synchronisée avec sb.state en sortie, y compris sur ERROR ; le dernier élément de la
+# liste garde l'ordre de première affectation, pour que sb.state ait le même ordre de clés). Les erreurs R2/R4/R6/R8
+# sont levées au même point d'exécution que l'interpréteur ; tout nœud non reconnu (R10,
+# expression callable, STATE mal formé...) est délégué à l'interpréteur au moment où il s'exécute.
+
+_UNSET = object()
+
+_BINOPS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "==": operator.eq, "!=": operator.ne,
+    "+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv,
+}
+
+class CompiledProgram:
+    """Programme IR compilé ; réutilisable sur plusieurs Sandbox."""
+
+    def __init__(self, root: Callable[[Sandbox, List[Any]], Any], names: List[str]):
+        self._root = root
+        self.names = names
+
+    def run(self, sb: Sandbox) -> Any:
+        slots = [sb.state.get(n, _UNSET) for n in self.names]
+        slots.append([])
+        try:
+            return self._root(sb, slots)
+        finally:
+            _store(sb, self.names, slots)
+
+def _store(sb: Sandbox, names: List[str], slots: List[Any]) -> None:
+    state = sb.state
+    for i in slots[-1]:
+        state[names[i]] = slots[i]
+    slots[-1].clear()
+    for name, v in zip(names, slots):
+        if v is not _UNSET:
+            state[name] = v
+
+def _load(sb: Sandbox, names: List[str], slots: List[Any]) -> None:
+    state = sb.state
+    for i, name in enumerate(names):
+        slots[i] = state.get(name, _UNSET)
+
+class _Compiler:
+    def __init__(self):
+        self.names: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def slot(self, name: str) -> int:
+        i = self._index.get(name)
+        if i is None:
+            i = self._index[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    # --- repli interpréteur (état dict synchronisé autour de l'appel) ---
+
+    def _fallback_exec(self, node: Any):
+        names = self.names
+        def run(sb, slots):
+            _store(sb, names, slots)
+            try:
+                return sb._exec(node)
+            finally:
+                _load(sb, names, slots)
+        return run
+
+    def _fallback_eval(self, x: Any):
+        names = self.names
+        def run(sb, slots):
+            _store(sb, names, slots)
+            try:
+                return sb._eval(x)
+            finally:
+                _load(sb, names, slots)
+        return run
+
+    # --- expressions ---
+
+    def expr(self, x: Any):
+        if isinstance(x, ir.VALUE):
+            v = x.v
+            return lambda sb, slots: v
+        if isinstance(x, ir.READ):
+            if not isinstance(x.state, ir.STATE):
+                return self._fallback_eval(x)
+            name = x.state.name
+            i = self.slot(name)
+            def read(sb, slots):
+                v = slots[i]
+                if v is _UNSET:
+                    raise ir.ERROR(f"READ vide: {name}", code="R2")
+                return v
+            return read
+        if isinstance(x, tuple) and len(x) == 3:
+            op, a, b = x
+            fa = self.expr(a)
+            fb = self.expr(b)
+            fn = _BINOPS.get(op) if isinstance(op, str) else None
+            if fn is None:
+                # opérateur inconnu : opérandes évaluées puis expression renvoyée telle quelle
+                def unknown(sb, slots):
+                    fa(sb, slots); fb(sb, slots)
+                    return x
+                return unknown
+            return lambda sb, slots: fn(fa(sb, slots), fb(sb, slots))
+        if callable(x):
+            return self._fallback_eval(x)
+        return lambda sb, slots: x
+
+    # --- instructions ---
+
+    def seq(self, nodes: Any):
+        fs = [self.stmt(n) for n in nodes]
+        def run(sb, slots):
+            out = None
+            for f in fs:
+                out = f(sb, slots)
+            return out
+        return run
+
+    def stmt(self, node: Any):
+        if isinstance(node, list):
+            return self.seq(node)
+
+        if isinstance(node, ir.TIME):
+            t = node.t
+            def time(sb, slots):
+                if t < sb.time:
+                    raise ir.ERROR(f"TIME désordonné: {t} < {sb.time}", code="R8")
+                sb.time = t
+                sb._record("TIME", "time={}", (t,))
+            return time
+
+        if isinstance(node, ir.STATE):
+            name = node.name
+            i = self.slot(name)
+            detail = f"declare {name}"  # constant : formaté une seule fois
+            def declare(sb, slots):
+                if slots[i] is _UNSET:
+                    slots[i] = None
+                    slots[-1].append(i)
+                sb._record("STATE", detail)
+            return declare
+
+        if isinstance(node, ir.WRITE) and isinstance(node.state, ir.STATE):
+            fv = self.expr(node.value)
+            name = node.state.name
+            i = self.slot(name)
+            def write(sb, slots):
+                val = fv(sb, slots)
+                if slots[i] is _UNSET:
+                    slots[-1].append(i)
+                slots[i] = val
+                sb._record("WRITE", "{}={!r}", (name, val))
+            return write
+
+        if isinstance(node, ir.READ) and isinstance(node.state, ir.STATE):
+            fv = self.expr(node)
+            name = node.state.name
+            def read(sb, slots):
+                val = fv(sb, slots)
+                sb._record("READ", "{} -> {!r}", (name, val))
+                return ir.VALUE(val)
+            return read
+
+        if isinstance(node, ir.FLOW):
+            return self.seq(node.steps)
+
+        if isinstance(node, ir.COND):
+            fe = self.expr(node.expr)
+            def cond(sb, slots):
+                res = bool(fe(sb, slots))
+                sb._record("COND", "cond={}", (res,))
+                return res
+            return cond
+
+        if isinstance(node, ir.LOOP):
+            fc = self.stmt(node.cond)
+            body = [self.stmt(s) for s in node.body]
+            max_iters = node.max_iters
+            def loop(sb, slots):
+                it = 0
+                while True:
+                    if it >= max_iters:
+                        raise ir.ERROR("LOOP sans sortie (max_iters atteint)", code="R6")
+                    it += 1
+                    if not bool(fc(sb, slots)):
+                        sb._record("LOOP", "loop_exit iters={}", (it,))
+                        return None
+                    for f in body:
+                        f(sb, slots)
+            return loop
+
+        if isinstance(node, ir.CALL):
+            fn = node.fn
+            fargs = [self.expr(a) for a in node.args]
+            def call(sb, slots):
+                calls = sb.calls
+                if fn not in calls:
+                    raise ir.ERROR(f"CALL inconnu: {fn}", code="R4")
+                args = [f(sb, slots) for f in fargs]
+                sb._record("CALL", _format_call, (fn, *args))
+                try:
+                    ret = calls[fn](*args)
+                except Exception as e:
+                    raise ir.ERROR(f"CALL error: {e}", code="R4")
+                return ir.RETURN(ir.VALUE(ret))
+            return call
+
+        if isinstance(node, ir.EVENT):
+            def event(sb, slots):
+                sb._record("EVENT", "event={} t={} payload={!r}", (node.name, node.t, node.payload))
+            return event
+
+        if isinstance(node, ir.RETURN):
+            def return_(sb, slots):
+                sb._record("RETURN", "return {!r}", (node.value,))
+                return node.value
+            return return_
+
+        # hors-alphabet (R10) ou nœud mal formé : l'interpréteur lève la même erreur
+        return self._fallback_exec(node)
+
+def compile_program(program: Any) -> CompiledProgram:
+    """Compile un programme IR (liste de nœuds ou nœud) en CompiledProgram."""
+    c = _Compiler()
+    root = c.stmt(program)
+    return CompiledProgram(root, c.names)
@@ -8,3 +8,4 @@ OS1 ne décide pas à la place de l'humain :
 """
 
 from .os1 import run_request, OS1Decision
+from .validation_cache import ValidationCache, get_validation_cache, configure_validation_cache
@@ -8,6 +8,7 @@ from obsidia_os0.sandbox import Sandbox
 
 from .x108 import X108Gate, X108Check
 from .parse_input import parse_input
+from .validation_cache import ValidationCache, get_validation_cache
 
 
 @dataclass
@@ -32,6 +33,8 @@ def run_request(
     sandbox: Optional[Sandbox] = None,
     x108_gate: Optional[X108Gate] = None,
     x108_ctx: Optional[Dict[str, Any]] = None,
+    validation_cache: Optional[ValidationCache] = None,
+    use_cache: bool = True,
 ) -> OS1Decision:
     """Pipeline OS1 minimal.
 
@@ -40,13 +43,24 @@ def run_request(
     3) X108 check (HOLD/ACT) si gate fourni
     4) exécution OS0 sandbox si ACT
     5) SSR explicative
+
+    Parse et validation passent par un ValidationCache (défaut : cache partagé du process) ;
+    use_cache=False rétablit le parse + validate complet à chaque requête.
     """
 
     sb = sandbox or Sandbox()
+    cache = (validation_cache or get_validation_cache()) if use_cache else None
 
     # 1) Traduction vers IR (déterminisme)
     try:
-        ir = parse_input(raw_input)
+        if cache is not None:
+            program, meta, digest = cache.parse(raw_input)
+        else:
+            ir = parse_input(raw_input)
+            # parse_input returns a dict: {"program": [IR nodes], "meta": {...}}
+            program = ir.get("program", ir)
+            meta = ir.get("meta", {}) if isinstance(ir, dict) else {}
+            digest = None
     except Exception as e:
         return OS1Decision(
             decision="REJECT",
@@ -56,13 +70,12 @@ def run_request(
             os0_result=None,
         )
 
-    # parse_input returns a dict: {"program": [IR nodes], "meta": {...}}
-    program = ir.get("program", ir)
-    meta = ir.get("meta", {}) if isinstance(ir, dict) else {}
-
     # 2) Contrat
     try:
-        validate_contract(program)
+        if cache is not None:
+            cache.violations(program, digest)
+        else:
+            validate_contract(program)
     except Exception as e:
         return OS1Decision(
             decision="REJECT",
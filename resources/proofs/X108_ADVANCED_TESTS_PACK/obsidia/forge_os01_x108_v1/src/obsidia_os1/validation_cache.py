@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from obsidia_os0.contract import Violation, validate as validate_contract
+from obsidia_os0.determinism import canonical_hash
+
+from .parse_input import parse_input
+
+
+class ValidationCache:
+    """Cache OS1 parse + contrat (LRU bornés, thread-safe).
+
+    - texte brut -> canonical_hash du programme : un gabarit déjà vu n'est pas re-haché
+    - canonical_hash -> violations du contrat : un programme déjà validé n'est pas re-parcouru
+
+    Le texte est re-parsé à chaque requête : le programme IR rendu appartient à l'appelant
+    (le Sandbox peut exposer ses valeurs dans l'état résultat), aucun objet n'est partagé
+    entre requêtes. Seuls les programmes issus d'un texte sont mis en cache : canonical_hash
+    représente les objets hors IR par leur repr, ce qui suffit pour l'alphabet produit par
+    parse_input mais pas pour identifier un programme fourni avec des objets arbitraires.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = int(max_entries)
+        self._digests: "OrderedDict[str, str]" = OrderedDict()
+        self._violations: "OrderedDict[str, List[Violation]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.parse_hits = 0
+        self.parse_misses = 0
+        self.validation_hits = 0
+        self.validation_misses = 0
+
+    # --- parse ---
+
+    def _parse_text(self, text: str) -> Tuple[List[Any], Dict[str, Any], str]:
+        parsed = parse_input(text)
+        program = parsed["program"]
+        with self._lock:
+            digest = self._digests.get(text)
+            if digest is not None:
+                self._digests.move_to_end(text)
+                self.parse_hits += 1
+                return program, parsed.get("meta", {}), digest
+            self.parse_misses += 1
+        digest = canonical_hash(program)
+        with self._lock:
+            self._store(self._digests, text, digest)
+        return program, parsed.get("meta", {}), digest
+
+    def parse(self, raw: Any) -> Tuple[Any, Dict[str, Any], Optional[str]]:
+        """Équivalent de parse_input(raw) -> (programme, meta, canonical_hash ou None si non cacheable)."""
+        if isinstance(raw, str):
+            return self._parse_text(raw)
+        # enveloppe des runners : {"text": "...", "x108": {...}} -> seul le texte est mis en cache
+        if isinstance(raw, dict) and isinstance(raw.get("text"), str) and "program" not in raw and "ir" not in raw:
+            program, meta, digest = self._parse_text(raw["text"])
+            meta.update({k: v for k, v in raw.items() if k != "text"})
+            return program, meta, digest
+        parsed = parse_input(raw)
+        program = parsed.get("program", parsed)
+        meta = parsed.get("meta", {}) if isinstance(parsed, dict) else {}
+        return program, meta, None
+
+    # --- contrat ---
+
+    def violations(self, program: Any, digest: Optional[str] = None) -> List[Violation]:
+        """Violations du contrat pour `program` (validate), en cache sous `digest` (voir parse)."""
+        if digest is None:
+            return validate_contract(program)
+        key = digest
+        with self._lock:
+            cached = self._violations.get(key)
+            if cached is not None:
+                self._violations.move_to_end(key)
+                self.validation_hits += 1
+                return list(cached)
+            self.validation_misses += 1
+        found = validate_contract(program)
+        with self._lock:
+            self._store(self._violations, key, list(found))
+        return found
+
+    # --- gestion ---
+
+    def clear(self) -> None:
+        with self._lock:
+            self._digests.clear()
+            self._violations.clear()
+            self.parse_hits = self.parse_misses = 0
+            self.validation_hits = self.validation_misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "parsed_entries": len(self._digests),
+                "validated_entries": len(self._violations),
+                "parse_hits": self.parse_hits,
+                "parse_misses": self.parse_misses,
+                "validation_hits": self.validation_hits,
+                "validation_misses": self.validation_misses,
+            }
+
+    def _store(self, table: OrderedDict, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.max_entries:
+            table.popitem(last=False)
+
+
+_cache = ValidationCache()
+_cache_lock = threading.Lock()
+
+
+def get_validation_cache() -> ValidationCache:
+    """Retourne le cache partagé du process."""
+    return _cache
+
+
+def configure_validation_cache(max_entries: int = 4096) -> ValidationCache:
+    """Remplace le cache partagé (max_entries=0 désactive la mise en cache)."""
+    global _cache
+    with _cache_lock:
+        _cache = ValidationCache(max_entries=max_entries)
+    return _cache
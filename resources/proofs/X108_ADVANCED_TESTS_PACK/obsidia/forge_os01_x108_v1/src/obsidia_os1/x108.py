@@ -1,7 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Iterator, List, Optional
+
+try:  # check_batch vectorisé avec NumPy ; repli pur Python sinon
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# codes de décision de check_batch (index dans DECISIONS)
+ACT, HOLD = 0, 1
+DECISIONS = ("ACT", "HOLD")
 
 
 @dataclass
@@ -11,6 +20,45 @@ class X108Check:
     reason: str
 
 
+class X108Batch:
+    """Résultat de X108Gate.check_batch : codes et attentes en colonnes, raisons à la demande.
+
+    - codes : ACT (0) / HOLD (1) par élément (ndarray uint8, ou liste sans NumPy)
+    - wait_s : attente restante (0.0 si ACT)
+    Les raisons ne sont formatées que via reason(i) / check(i), identiques à X108Gate.check.
+    """
+
+    def __init__(self, gate: "X108Gate", elapsed: Any, irreversible: Any, codes: Any, wait_s: Any):
+        self.gate = gate
+        self.elapsed = elapsed
+        self.irreversible = irreversible
+        self.codes = codes
+        self.wait_s = wait_s
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decision(self, i: int) -> str:
+        return DECISIONS[int(self.codes[i])]
+
+    def decisions(self) -> List[str]:
+        return [DECISIONS[int(c)] for c in self.codes]
+
+    def hold_count(self) -> int:
+        return int(sum(self.codes)) if np is None else int(np.count_nonzero(self.codes))
+
+    def reason(self, i: int, note: str = "") -> str:
+        return self.check(i, note).reason
+
+    def check(self, i: int, note: str = "") -> X108Check:
+        """X108Check complet de l'élément i (même résultat que gate.check sur cet élément)."""
+        return self.gate.check(float(self.elapsed[i]), bool(self.irreversible[i]), note)
+
+    def __iter__(self) -> Iterator[X108Check]:
+        for i in range(len(self)):
+            yield self.check(i)
+
+
 class X108Gate:
     """Gate X108 minimal, compatible with your x108.py logic.
 
@@ -33,3 +81,28 @@ class X108Gate:
             wait,
             f"X108 HOLD: need +{wait:.2f}s (elapsed={elapsed_s:.2f}s, min={self.min_wait_s:.2f}s). {note}".strip(),
         )
+
+    def check_batch(self, elapsed_s: Any, irreversible: Any = True) -> X108Batch:
+        """Version colonne de check pour un tableau de temps écoulés.
+
+        irreversible : tableau de booléens de même longueur, ou un booléen pour tout le lot.
+        Mêmes règles que check (NaN -> HOLD), sans construire de raison par élément.
+        """
+        if np is None:
+            elapsed = [float(e) for e in elapsed_s]
+            irrev = [bool(irreversible)] * len(elapsed) if isinstance(irreversible, bool) else [bool(x) for x in irreversible]
+            if len(irrev) != len(elapsed):
+                raise ValueError("elapsed_s and irreversible must have the same length")
+            hold = [r and not e >= self.min_wait_s for e, r in zip(elapsed, irrev)]
+            codes = [HOLD if h else ACT for h in hold]
+            wait = [self.min_wait_s - e if h else 0.0 for e, h in zip(elapsed, hold)]
+            return X108Batch(self, elapsed, irrev, codes, wait)
+
+        elapsed = np.asarray(elapsed_s, dtype=np.float64).reshape(-1)
+        irrev = np.asarray(irreversible, dtype=bool)
+        irrev = np.broadcast_to(irrev, elapsed.shape) if irrev.ndim == 0 else irrev.reshape(-1)
+        if irrev.shape != elapsed.shape:
+            raise ValueError("elapsed_s and irreversible must have the same length")
+        hold = irrev & ~(elapsed >= self.min_wait_s)
+        wait = np.where(hold, self.min_wait_s - elapsed, 0.0)
+        return X108Batch(self, elapsed, irrev, hold.astype(np.uint8), wait)
@@ -12,6 +12,11 @@ from dataclasses import dataclass
 from typing import List
 import math
 
+try:  # NumPy vectorise l'énumération des triangles ; repli pur Python sinon
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
 @dataclass
 class Metrics:
     T_mean: float
@@ -19,7 +24,27 @@ class Metrics:
     A_score: float
     S: float
 
+def _triangle_mean_np(W: List[List[float]], theta: float) -> float:
+    A = np.asarray(W, dtype=float)
+    n = len(A)
+    total = 0.0
+    count = 0
+    for i in range(n - 2):
+        # toutes les paires j<k au-dessus de i, en ordre lexicographique
+        j, k = np.triu_indices(n - i - 1, k=1)
+        j += i + 1
+        k += i + 1
+        t = (A[i, j] + A[j, k] + A[k, i]) / 3.0
+        t = t[t >= theta]
+        if len(t):
+            # cumsum est séquentielle : même somme, au bit près, que la boucle Python
+            total = float(np.cumsum(np.concatenate(([total], t)))[-1])
+            count += len(t)
+    return total/count if count else 0.0
+
 def triangle_mean(W: List[List[float]], theta: float = 0.0) -> float:
+    if np is not None:
+        return _triangle_mean_np(W, theta)
     n = len(W)
     triangles = []
     for i in range(n):
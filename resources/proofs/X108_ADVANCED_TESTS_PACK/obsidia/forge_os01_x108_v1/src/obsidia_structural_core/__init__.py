@@ -1,3 +1,4 @@
 from .core_split import CORE_1BASED, WORLD_1BASED, core_nodes_0based, world_nodes_0based
 from .metrics import compute_metrics, compute_metrics_core_fixed, decision_act_hold
 from .svg import render_core_svg
+from .incremental import IncrementalStructuralState
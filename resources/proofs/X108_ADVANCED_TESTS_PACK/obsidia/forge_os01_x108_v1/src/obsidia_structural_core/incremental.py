@@ -0,0 +1,174 @@
+"""
+Incremental structural metrics under edge-weight updates.
+
+IncrementalStructuralState keeps the strong-triangle set, the weighted degrees and the
+per-pivot best hexagons of a (possibly core-restricted) weight matrix, and updates them
+when a few edges change instead of recomputing compute_metrics from scratch:
+
+- triangles: only triples containing both endpoints of the edge are rescored (O(n))
+- degrees: only the source row sum is recomputed (O(n))
+- hexagons: only pivots whose radial weights or candidate ring changed are re-searched,
+  lazily, on the next metrics() call
+
+metrics() returns exactly what compute_metrics / compute_metrics_core_fixed would return
+for the current matrix.
+"""
+
+from __future__ import annotations
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .metrics import (
+    Hexagon, Metrics, Number, Triangle, _BudgetExceeded, _HexagonIncumbent, _hexagon_candidates,
+    _mean, _search_pivot, decision_act_hold, find_strong_triangles, relabel_metrics, triangle_score,
+)
+
+class IncrementalStructuralState:
+    """
+    Streaming counterpart of compute_metrics (same thresholds and weights).
+
+    Args:
+        W: Initial weight matrix (copied)
+        core_nodes: If given, metrics are computed on the core submatrix only, like
+            compute_metrics_core_fixed; updates to edges outside the core are ignored
+        hexagon_time_budget_s: Optional time budget per pivot re-search
+    """
+
+    def __init__(self, W: List[List[Number]], core_nodes: Optional[Sequence[int]] = None,
+                 theta_T=0.7, theta_R=0.7, theta_A=0.6, alpha=1.0, beta=1.0, gamma=1.0, lam=1.0,
+                 hexagon_time_budget_s: Optional[float] = None):
+        self.nodes=list(core_nodes) if core_nodes is not None else list(range(len(W)))
+        self._local={g:l for l,g in enumerate(self.nodes)}
+        self.W=[[W[i][j] for j in self.nodes] for i in self.nodes]
+        self.theta_T=theta_T; self.theta_R=theta_R; self.theta_A=theta_A
+        self.alpha=alpha; self.beta=beta; self.gamma=gamma; self.lam=lam
+        self.hexagon_time_budget_s=hexagon_time_budget_s
+        n=len(self.W)
+        self._degrees=[sum(self.W[i][j] for j in range(n)) for i in range(n)]
+        # triangles forts, triés comme find_strong_triangles : (-score, i, j, k)
+        strong=find_strong_triangles(self.W, theta_T)
+        self._tri_keys: List[Tuple[float,int,int,int]]=[(-t.score,t.i,t.j,t.k) for t in strong]
+        self._tri_score: Dict[Tuple[int,int,int], float]={(t.i,t.j,t.k):t.score for t in strong}
+        # par pivot : (exact, hexagone, clé, prouvé). exact=False signifie « dominé » : le meilleur
+        # hexagone du pivot est moins bon que (hexagone, clé), gagnant global au moment de la recherche
+        self._pivots: List[Tuple[bool, Optional[Hexagon], Optional[tuple], bool]]=[(True, None, None, True)]*n
+        self._dirty: Set[int]=set(range(n))
+        self._cached: Optional[Metrics]=None
+        self.pivot_searches=0
+
+    # --- mises à jour ---
+
+    def update_edge(self, i: int, j: int, w: Number) -> None:
+        """Fixe W[i][j]=w (indices globaux). Pour un graphe non orienté, mettre à jour (j, i) aussi."""
+        a=self._local.get(i); b=self._local.get(j)
+        if a is None or b is None:
+            return  # arête hors core : sans effet sur les métriques
+        if self.W[a][b]==w:
+            return
+        self.W[a][b]=w
+        self._cached=None
+        n=len(self.W)
+        self._degrees[a]=sum(self.W[a][x] for x in range(n))
+        if a==b:
+            return
+        for c in range(n):
+            if c!=a and c!=b:
+                self._rescore_triangle(*sorted((a,b,c)))
+        # pivots touchés : a (poids radial) et tout pivot dont a et b sont candidats (arête d'anneau)
+        self._dirty.add(a)
+        Wr=self.W; tR=self.theta_R
+        for p in range(n):
+            if p!=a and p!=b and Wr[p][a]>=tR and Wr[p][b]>=tR:
+                self._dirty.add(p)
+
+    def update_edges(self, updates: Iterable[Tuple[int, int, Number]]) -> None:
+        for i, j, w in updates:
+            self.update_edge(i, j, w)
+
+    # --- lecture ---
+
+    def metrics(self) -> Metrics:
+        if self._cached is not None:
+            return self._cached
+        self._refresh_hexagons()
+        strong=[Triangle(i,j,k,-neg) for neg,i,j,k in self._tri_keys]
+        tmean=_mean([t.score for t in strong]) if strong else 0.0
+        hx=self._winner()[0]
+        hstar=hx.score if hx else 0.0
+        s=self._degrees; n=len(s)
+        sbar=sum(s)/n
+        A=sum(abs(si-sbar) for si in s)/n
+        S=self.alpha*tmean + self.beta*hstar - self.gamma*A
+        m=Metrics(strong, tmean, hx, A, S, all(rec[3] for rec in self._pivots))
+        self._cached=relabel_metrics(m, self.nodes)
+        return self._cached
+
+    def decide(self, theta_S: float) -> str:
+        return decision_act_hold(self.metrics(), theta_S)
+
+    # --- interne ---
+
+    def _rescore_triangle(self, i: int, j: int, k: int) -> None:
+        W=self.W
+        old=self._tri_score.pop((i,j,k), None)
+        if old is not None:
+            keys=self._tri_keys
+            del keys[bisect_left(keys, (-old,i,j,k))]
+        if W[i][j]>0 and W[j][k]>0 and W[k][i]>0:
+            t=triangle_score(W,i,j,k)
+            if t>=self.theta_T:
+                self._tri_score[(i,j,k)]=t
+                insort(self._tri_keys, (-t,i,j,k))
+
+    @staticmethod
+    def _better(h1: Optional[Hexagon], k1, h2: Optional[Hexagon], k2) -> bool:
+        # ordre de l'énumération exhaustive : score décroissant puis clé (pivot, sous-ensemble, anneau)
+        if h1 is None: return False
+        if h2 is None: return True
+        return h1.score>h2.score or (h1.score==h2.score and k1<k2)
+
+    def _winner(self) -> Tuple[Optional[Hexagon], Optional[tuple]]:
+        hx=None; key=None
+        for p, (exact, h, k, _) in enumerate(self._pivots):
+            if exact and p not in self._dirty and self._better(h, k, hx, key):
+                hx=h; key=k
+        return hx, key
+
+    def _refresh_hexagons(self) -> None:
+        """
+        Re-cherche les pivots modifiés, en partant du gagnant des pivots inchangés comme
+        borne (élagage comme la recherche complète). Un pivot dominé n'est re-cherché que
+        si le gagnant courant devient moins bon que celui qui l'a dominé.
+        """
+        winner, wkey=self._winner()
+        todo=[]
+        for p, (exact, h, k, _) in enumerate(self._pivots):
+            if p in self._dirty or (not exact and self._better(h, k, winner, wkey)):
+                cand=_hexagon_candidates(self.W, p, self.theta_R, self.theta_A)
+                top6=sum(self.W[p][x] for x in cand[:6])/6.0 if cand else float("-inf")
+                todo.append((top6, p, cand))
+        # pivots les plus prometteurs d'abord : le gagnant monte vite
+        todo.sort(key=lambda x:(-x[0], x[1]))
+        budget=self.hexagon_time_budget_s
+        for _, p, cand in todo:
+            exact, h, k, _=self._pivots[p]
+            if p not in self._dirty and not self._better(h, k, winner, wkey):
+                continue  # dominé par un gagnant qui a remonté entre-temps
+            if not cand:
+                self._pivots[p]=(True, None, None, True)
+                continue
+            inc=_HexagonIncumbent(None if budget is None else time.perf_counter()+budget)
+            inc.best=winner; inc.key=wkey
+            proven=True
+            try:
+                _search_pivot(self.W, p, cand, self.theta_A, self.lam, inc)
+            except _BudgetExceeded:
+                proven=False
+            self.pivot_searches+=1
+            if inc.key is not None and inc.key[0]==p:
+                self._pivots[p]=(True, inc.best, inc.key, proven)
+                winner, wkey=inc.best, inc.key
+            else:
+                self._pivots[p]=(False, winner, wkey, proven)
+        self._dirty.clear()
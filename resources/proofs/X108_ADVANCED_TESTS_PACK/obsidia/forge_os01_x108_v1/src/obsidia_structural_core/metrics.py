@@ -12,9 +12,16 @@ All graphs are treated as weighted, undirected adjacency matrices W with weights
 
 from __future__ import annotations
 from dataclasses import dataclass
-from itertools import combinations, permutations
+import time
+from bisect import bisect_right
+from itertools import permutations
 from typing import List, Tuple, Optional, Sequence
 
+try:  # NumPy accélère la recherche de triangles ; repli pur Python sinon
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
 Number = float
 
 @dataclass(frozen=True)
@@ -29,6 +36,13 @@ class Hexagon:
     radial_var: float
     score: float
 
+@dataclass(frozen=True)
+class HexagonSearch:
+    best: Optional[Hexagon]
+    proven_optimal: bool
+    subsets_explored: int
+    elapsed_s: float
+
 @dataclass(frozen=True)
 class Metrics:
     strong_triangles: List[Triangle]
@@ -36,6 +50,7 @@ class Metrics:
     best_hexagon: Optional[Hexagon]
     asymmetry: float
     S: float
+    hexagon_optimal: bool = True
 
 def _mean(xs: List[Number]) -> float:
     return sum(xs)/len(xs) if xs else 0.0
@@ -48,45 +63,200 @@ def _var(xs: List[Number]) -> float:
 def triangle_score(W: List[List[Number]], i: int, j: int, k: int) -> float:
     return (W[i][j]+W[j][k]+W[k][i])/3.0
 
-def find_strong_triangles(W: List[List[Number]], theta_T: float) -> List[Triangle]:
+def _strong_triangles_py(W: List[List[Number]], theta_T: float) -> List[Triangle]:
+    # i<j<k en ordre lexicographique ; seuls les k voisins de i (W[k][i]>0) et de j sont visités
     n=len(W)
     out=[]
-    for i,j,k in combinations(range(n),3):
-        if W[i][j]>0 and W[j][k]>0 and W[k][i]>0:
-            t=triangle_score(W,i,j,k)
-            if t>=theta_T:
-                out.append(Triangle(i,j,k,t))
+    for i in range(n):
+        K=[k for k in range(i+1,n) if W[k][i]>0]
+        if not K: continue
+        for j in range(i+1,n):
+            if not W[i][j]>0: continue
+            Wj=W[j]
+            for k in K[bisect_right(K,j):]:
+                if Wj[k]>0:
+                    t=triangle_score(W,i,j,k)
+                    if t>=theta_T:
+                        out.append(Triangle(i,j,k,t))
+    return out
+
+def _strong_triangles_np(W: List[List[Number]], theta_T: float) -> List[Triangle]:
+    A=np.asarray(W, dtype=float)
+    P=A>0
+    n=len(A)
+    parts=[]
+    for i in range(n-2):
+        # J: voisins i->j (j>i), K: voisins k->i (k>i) ; paires (j,k) j<k reliées par j->k
+        J=np.flatnonzero(P[i, i+1:])+i+1
+        K=np.flatnonzero(P[i+1:, i])+i+1
+        if not len(J) or not len(K): continue
+        jj,kk=np.nonzero(P[np.ix_(J,K)] & (J[:,None]<K[None,:]))
+        if not len(jj): continue
+        j=J[jj]; k=K[kk]
+        t=(A[i,j]+A[j,k]+A[k,i])/3.0
+        keep=t>=theta_T
+        parts.append((np.full(int(keep.sum()), i), j[keep], k[keep], t[keep]))
+    if not parts:
+        return []
+    I,Jc,Kc,T=(np.concatenate(c) for c in zip(*parts))
+    return [Triangle(int(a),int(b),int(c),float(t)) for a,b,c,t in zip(I.tolist(),Jc.tolist(),Kc.tolist(),T.tolist())]
+
+def find_strong_triangles(W: List[List[Number]], theta_T: float) -> List[Triangle]:
+    out=_strong_triangles_np(W, theta_T) if np is not None else _strong_triangles_py(W, theta_T)
+    # tri stable : à score égal, ordre lexicographique (i,j,k) conservé
     out.sort(key=lambda t:t.score, reverse=True)
     return out
 
-def find_best_hexagon(W: List[List[Number]], theta_R: float, theta_A: float, lam: float,
-                      max_candidates_per_p: int = 2000) -> Optional[Hexagon]:
+class _BudgetExceeded(Exception):
+    pass
+
+def _first_ring(W: List[List[Number]], subset: Tuple[int, ...], theta_A: float) -> Optional[Tuple[int, ...]]:
+    # premier anneau valide du sous-ensemble trié, dans l'ordre (first,)+permutations(others)
+    first=subset[0]; others=subset[1:]
+    for perm in permutations(others,5):
+        ring=(first,)+perm
+        if all(W[ring[i]][ring[(i+1)%6]]>=theta_A for i in range(6)):
+            return ring
+    return None
+
+def _hexagon_candidates(W: List[List[Number]], p: int, theta_R: float, theta_A: float) -> List[int]:
+    # candidats radiaux du pivot p, triés par poids radial décroissant
     n=len(W)
-    best=None
-    for p in range(n):
-        cand=[h for h in range(n) if h!=p and W[p][h]>=theta_R]
-        if len(cand)<6: continue
-        tried=0
-        for subset in combinations(cand,6):
-            first=subset[0]; others=subset[1:]
-            for perm in permutations(others,5):
-                ring=(first,)+perm
-                ok=True
-                for i in range(6):
-                    a=ring[i]; b=ring[(i+1)%6]
-                    if W[a][b]<theta_A:
-                        ok=False; break
-                if not ok: continue
-                radial=[W[p][h] for h in ring]
-                rmean=_mean(radial); rvar=_var(radial)
-                score=rmean - lam*rvar
-                hx=Hexagon(p, ring, rmean, rvar, score)
-                if best is None or hx.score>best.score:
-                    best=hx
-                tried += 1
-                if tried>=max_candidates_per_p: break
-            if tried>=max_candidates_per_p: break
-    return best
+    cand=[h for h in range(n) if h!=p and W[p][h]>=theta_R]
+    # un sommet d'anneau a au moins un successeur et un prédécesseur parmi les candidats
+    changed=True
+    while changed and len(cand)>=6:
+        cs=set(cand)
+        keep=[h for h in cand
+              if any(W[h][x]>=theta_A for x in cs if x!=h) and any(W[x][h]>=theta_A for x in cs if x!=h)]
+        changed=len(keep)!=len(cand)
+        cand=keep
+    if len(cand)<6: return []
+    cand.sort(key=lambda h:(-W[p][h], h))
+    return cand
+
+class _HexagonIncumbent:
+    """Meilleur hexagone courant d'une recherche (partagé entre pivots)."""
+    def __init__(self, deadline: Optional[float] = None):
+        self.best: Optional[Hexagon]=None
+        self.key=None
+        self.explored=0
+        self.deadline=deadline
+
+def _slack(x: float) -> float:
+    # marge flottante : la borne est exacte en réels, pas forcément au dernier bit ;
+    # deux scores à moins de cette marge sont à égalité
+    return 1e-12*(1.0+abs(x))
+
+def _search_pivot(W: List[List[Number]], p: int, cand: List[int], theta_A: float, lam: float,
+                  inc: _HexagonIncumbent) -> None:
+    wts=[W[p][h] for h in cand]
+    m=len(cand)
+    wmin=min(wts); wmax=max(wts)
+    # prefix[i] = somme des poids cand[:i] (triés décroissants)
+    prefix=[0.0]
+    for w in wts:
+        prefix.append(prefix[-1]+w)
+    chosen: List[int]=[]
+    # suffix_ids[i] = sommets de cand[i:] triés : complétion lexicographiquement minimale d'une branche
+    suffix_ids=[sorted(cand[i:]) for i in range(m+1)]
+
+    def _loses_tie(ids: List[int], start: int, need: int) -> bool:
+        # à score égal, une branche ne gagne que si sa plus petite clé (p, sous-ensemble)
+        # précède celle du meilleur courant (même ordre que l'énumération exhaustive)
+        best_p, best_subset, _ = inc.key
+        if p != best_p:
+            return p > best_p
+        return tuple(sorted(ids+suffix_ids[start][:need])) >= best_subset
+
+    def _bound(sel_sum: float, sel_sq: float, k: int, rest_top: float) -> float:
+        ub_mean=(sel_sum+rest_top)/6.0
+        if lam>=0:
+            # var(6 valeurs) >= (k/6) * var(k valeurs déjà choisies)
+            var_sel=(sel_sq/k-(sel_sum/k)**2) if k else 0.0
+            return ub_mean-lam*(k/6.0)*max(var_sel,0.0)
+        return ub_mean-lam*(wmax-wmin)**2/4.0
+
+    def rec(start: int, sel_sum: float, sel_sq: float):
+        k=len(chosen)
+        if k==6:
+            inc.explored+=1
+            if inc.deadline is not None and time.perf_counter()>inc.deadline:
+                raise _BudgetExceeded
+            subset=tuple(sorted(cand[i] for i in chosen))
+            # poids pris dans l'ordre de cand : même somme flottante pour un même multiensemble
+            radial=[wts[i] for i in chosen]
+            rmean=_mean(radial); rvar=_var(radial)
+            score=rmean - lam*rvar
+            if inc.best is not None:
+                best=inc.best.score; slack=_slack(best)
+                if score<best-slack or (score<=best+slack and (p, subset)>=inc.key[:2]):
+                    return
+            ring=_first_ring(W, subset, theta_A)
+            if ring is not None:
+                inc.best=Hexagon(p, ring, rmean, rvar, score); inc.key=(p, subset, ring)
+            return
+        need=6-k
+        for i in range(start, m-need+1):
+            w=wts[i]
+            ns=sel_sum+w; nq=sel_sq+w*w
+            if inc.best is not None:
+                rest_top=prefix[i+need]-prefix[i+1]
+                ub=_bound(ns, nq, k+1, rest_top)
+                best=inc.best.score; slack=_slack(best)
+                if ub<best-2*slack:
+                    if lam>=0 and k==0:
+                        break  # i croissant ⇒ poids décroissant : plus aucune branche utile
+                    continue
+                # égalité (à la marge flottante près) : seul l'ordre lexicographique départage
+                if ub<=best+slack/2 and _loses_tie([cand[j] for j in chosen]+[cand[i]], i+1, need-1):
+                    continue
+            chosen.append(i)
+            rec(i+1, ns, nq)
+            chosen.pop()
+
+    if inc.best is not None:
+        ub=_bound(prefix[6], sum(w*w for w in wts[:6]), 0, 0.0)
+        best=inc.best.score; slack=_slack(best)
+        if ub<best-2*slack or (ub<=best+slack/2 and _loses_tie([], 0, 6)):
+            return
+    rec(0, 0.0, 0.0)
+
+def search_best_hexagon(W: List[List[Number]], theta_R: float, theta_A: float, lam: float,
+                        time_budget_s: Optional[float] = None) -> HexagonSearch:
+    """
+    Recherche exacte (branch-and-bound) du meilleur hexagone radial.
+
+    Le score ne dépend que de l'ensemble des 6 sommets : on énumère les sous-ensembles de
+    candidats triés par poids radial décroissant et on élague toute branche dont la borne
+    supérieure de radial_mean - lam*radial_var ne peut battre le meilleur courant ; l'existence
+    d'un anneau (arêtes >= theta_A) n'est vérifiée qu'aux feuilles prometteuses.
+    Deux scores à la marge flottante près (`_slack`) sont à égalité : le gagnant est alors le
+    plus petit (pivot, sous-ensemble) en ordre lexicographique, avec son premier anneau valide,
+    et une branche à égalité est élaguée dès que sa plus petite clé possible ne précède pas
+    celle du meilleur courant (poids uniformes compris). Si `time_budget_s` est dépassé,
+    renvoie le meilleur trouvé avec proven_optimal=False.
+    """
+    t0=time.perf_counter()
+    inc=_HexagonIncumbent(None if time_budget_s is None else t0+float(time_budget_s))
+    pivots=[]
+    for p in range(len(W)):
+        cand=_hexagon_candidates(W, p, theta_R, theta_A)
+        if cand:
+            pivots.append((sum(W[p][h] for h in cand[:6])/6.0, p, cand))
+    # pivots les plus prometteurs d'abord : le meilleur courant monte vite
+    pivots.sort(key=lambda x:(-x[0], x[1]))
+    try:
+        for _, p, cand in pivots:
+            _search_pivot(W, p, cand, theta_A, lam, inc)
+        proven=True
+    except _BudgetExceeded:
+        proven=False
+    return HexagonSearch(inc.best, proven, inc.explored, time.perf_counter()-t0)
+
+def find_best_hexagon(W: List[List[Number]], theta_R: float, theta_A: float, lam: float,
+                      time_budget_s: Optional[float] = None) -> Optional[Hexagon]:
+    return search_best_hexagon(W, theta_R, theta_A, lam, time_budget_s).best
 
 def asymmetry_weighted_degree(W: List[List[Number]]) -> float:
     n=len(W)
@@ -95,14 +265,16 @@ def asymmetry_weighted_degree(W: List[List[Number]]) -> float:
     return sum(abs(si-sbar) for si in s)/n
 
 def compute_metrics(W: List[List[Number]], theta_T=0.7, theta_R=0.7, theta_A=0.6,
-                    alpha=1.0, beta=1.0, gamma=1.0, lam=1.0) -> Metrics:
+                    alpha=1.0, beta=1.0, gamma=1.0, lam=1.0,
+                    hexagon_time_budget_s: Optional[float] = None) -> Metrics:
     strong=find_strong_triangles(W, theta_T)
     tmean=_mean([t.score for t in strong]) if strong else 0.0
-    hx=find_best_hexagon(W, theta_R, theta_A, lam)
+    hs=search_best_hexagon(W, theta_R, theta_A, lam, hexagon_time_budget_s)
+    hx=hs.best
     hstar=hx.score if hx else 0.0
     A=asymmetry_weighted_degree(W)
     S=alpha*tmean + beta*hstar - gamma*A
-    return Metrics(strong, tmean, hx, A, S)
+    return Metrics(strong, tmean, hx, A, S, hs.proven_optimal)
 
 def submatrix(W: List[List[Number]], nodes: Sequence[int]) -> List[List[Number]]:
     nodes=list(nodes)
@@ -115,7 +287,7 @@ def relabel_metrics(metrics: Metrics, nodes: Sequence[int]) -> Metrics:
     if metrics.best_hexagon:
         h=metrics.best_hexagon
         hx=Hexagon(nodes[h.p], tuple(nodes[x] for x in h.ring), h.radial_mean, h.radial_var, h.score)
-    return Metrics(strong, metrics.strong_triangle_mean, hx, metrics.asymmetry, metrics.S)
+    return Metrics(strong, metrics.strong_triangle_mean, hx, metrics.asymmetry, metrics.S, metrics.hexagon_optimal)
 
 def compute_metrics_core_fixed(W_full: List[List[Number]], core_nodes: Sequence[int], **kwargs) -> Metrics:
     Wc=submatrix(W_full, core_nodes)
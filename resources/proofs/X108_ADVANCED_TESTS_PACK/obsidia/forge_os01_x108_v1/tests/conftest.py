@@ -3,5 +3,7 @@ from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
-if str(SRC) not in sys.path:
-    sys.path.insert(0, str(SRC))
+TOOLS = ROOT / "tools"
+for path in (SRC, TOOLS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
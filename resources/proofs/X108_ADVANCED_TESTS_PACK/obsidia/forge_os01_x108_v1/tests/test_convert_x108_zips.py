@@ -0,0 +1,60 @@
+import gzip
+import json
+import subprocess
+import sys
+import zipfile
+
+from conftest import TOOLS
+from convert_x108_zips_to_json import iter_scenarios_from_zip
+
+CONVERTER = TOOLS / "convert_x108_zips_to_json.py"
+
+
+def _csv(n, prefix):
+    lines = ["id,time_elapsed,IST,CMEC,irreversible"]
+    lines += [f"{prefix}{i},{i % 7}.5,0.{i % 10},0.25,{'false' if i % 3 else 'true'}" for i in range(n)]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _zip(path, members):
+    with zipfile.ZipFile(path, "w") as z:
+        for name, data in members.items():
+            z.writestr(name, data)
+    return str(path)
+
+
+def _convert(tmp_path, zips, *args):
+    out = tmp_path / "out.json"
+    proc = subprocess.run([sys.executable, str(CONVERTER), "--zips", *zips, "--out", str(out), *args],
+                          capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(out.read_text(encoding="utf-8"))
+
+
+def test_csv_gz_member_is_streamed(tmp_path):
+    zp = _zip(tmp_path / "a.zip", {"rows.csv.gz": gzip.compress(_csv(3000, "r"))})
+    scenarios = list(iter_scenarios_from_zip(zp, limit=None))
+    assert len(scenarios) == 3000
+    assert scenarios[1] == {"id": "r1", "time_elapsed": 1.5, "IST": 0.1, "CMEC": 0.25,
+                            "irreversible": False, "raw_source": "a.zip::rows.csv.gz"}
+
+
+def test_member_failing_partway_is_dropped_whole(tmp_path, capsys):
+    truncated = gzip.compress(_csv(3000, "bad"))[:-2000]
+    zp = _zip(tmp_path / "a.zip", {"a_bad.csv.gz": truncated, "b_good.csv": _csv(5, "good")})
+    scenarios = list(iter_scenarios_from_zip(zp, limit=None))
+    assert [sc["id"] for sc in scenarios] == [f"good{i}" for i in range(5)]
+    assert "a_bad.csv.gz" in capsys.readouterr().err
+
+
+def test_limit_zero_means_no_limit(tmp_path):
+    zp = _zip(tmp_path / "a.zip", {"rows.csv": _csv(1500, "r")})
+    assert len(_convert(tmp_path, [zp], "--limit", "0")) == 1500
+    assert len(_convert(tmp_path, [zp], "--limit", "10")) == 10
+
+
+def test_workers_keep_zip_order(tmp_path):
+    zips = [_zip(tmp_path / f"z{k}.zip", {"rows.csv": _csv(200 - 50 * k, f"z{k}_")}) for k in range(3)]
+    serial = _convert(tmp_path, zips)
+    assert _convert(tmp_path, zips, "--workers", "2") == serial
+    assert [sc["raw_source"] for sc in serial[::50]] == ["z0.zip::rows.csv"] * 4 + ["z1.zip::rows.csv"] * 3 + ["z2.zip::rows.csv"] * 2
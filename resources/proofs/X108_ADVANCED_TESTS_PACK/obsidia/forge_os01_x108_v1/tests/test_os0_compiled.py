@@ -0,0 +1,41 @@
+from obsidia_os0 import ir
+from obsidia_os0.sandbox import Sandbox, compile_program
+from obsidia_os0.translate import python_like_to_ir
+
+
+def _run(prog, compiled, calls=None):
+    sb = Sandbox(call_registry=calls, compiled=compiled)
+    try:
+        out = ("ok", sb.run(prog))
+    except ir.ERROR as e:
+        out = ("error", e.code, e.message)
+    return out, sb.state, [(l.step, l.node, l.detail) for l in sb.log], sb.time
+
+
+def test_compiled_matches_interpreter():
+    def boom(x):
+        raise ValueError("bad")
+
+    calls = {"print": lambda *a: None, "boom": boom}
+    progs = [
+        python_like_to_ir("x = 0\nwhile x < 5:\n  print(x)\n  x = x + 1\n"),
+        [ir.READ(ir.STATE("x"))],                                            # R2
+        [ir.TIME(10), ir.TIME(9)],                                           # R8
+        [ir.STATE("x"), ir.CALL("nope", [])],                                # R4
+        [ir.WRITE(ir.STATE("x"), ir.VALUE(2)), ir.CALL("boom", [ir.READ(ir.STATE("x"))])],
+        [ir.STATE("x"), ir.WRITE(ir.STATE("x"), ir.VALUE(0)),
+         ir.LOOP(ir.COND((">=", ir.READ(ir.STATE("x")), ir.VALUE(0))), [], max_iters=4)],  # R6
+        [ir.WRITE(ir.STATE("y"), ir.VALUE(1)), {"type": "unknown"}],        # R10
+        [ir.EVENT("e", {"k": 1}, 3), ir.FLOW([ir.COND(lambda st: "y" in st), ir.RETURN(ir.VALUE(7))])],
+    ]
+    for prog in progs:
+        assert _run(prog, True, calls) == _run(prog, False, calls)
+
+
+def test_compiled_program_is_reusable():
+    prog = compile_program([ir.STATE("x"), ir.WRITE(ir.STATE("x"), ("*", ir.VALUE(6), ir.VALUE(7)))])
+    for _ in range(2):
+        sb = Sandbox()
+        sb.run(prog)
+        assert sb.state == {"x": 42}
+        assert [l.node for l in sb.log] == ["STATE", "WRITE"]
@@ -0,0 +1,68 @@
+import copy
+
+from obsidia_os0 import ir
+from obsidia_os0.determinism import _CACHE_ATTR, canonical_hash
+from obsidia_os0.translate import python_like_to_ir
+
+LOOP_SRC = "x = 0\nwhile x < 3:\n  print(x)\n  x = x + 1\n"
+
+
+def _programs():
+    loop = python_like_to_ir(LOOP_SRC)
+    return [
+        loop,
+        loop + [ir.EVENT("é", {"b": 1, 2: "x", "2": [1.5, None]}, 3)],      # partage le sous-arbre LOOP
+        [ir.FLOW([ir.RETURN(ir.VALUE((1, "a"))), ir.TIME(4)]), {"k": ir.STATE("z")}, [float("nan"), True]],
+        ir.WRITE(ir.STATE("y"), ("+", ir.READ(ir.STATE("x")), ir.VALUE([ir.VALUE(2)]))),
+    ]
+
+
+def test_cached_hash_matches_a_fresh_copy():
+    for program in _programs():
+        first = canonical_hash(program)
+        assert canonical_hash(program) == first  # second appel : empreintes en cache
+        assert canonical_hash(copy.deepcopy(program)) == first
+
+
+def test_canonical_hash_is_structural():
+    a = [ir.STATE("x"), ir.WRITE(ir.STATE("x"), ir.VALUE(1))]
+    b = [ir.STATE("x"), ir.WRITE(ir.STATE("x"), ir.VALUE(1))]
+    canonical_hash(a)
+    assert canonical_hash(a) == canonical_hash(b)
+    assert canonical_hash(a) != canonical_hash([ir.STATE("x"), ir.WRITE(ir.STATE("x"), ir.VALUE(2))])
+    assert canonical_hash(ir.RETURN(ir.STATE("x"))) != canonical_hash(ir.RETURN(ir.EVENT("x")))
+
+
+def test_list_fields_mutated_after_hashing_change_the_hash():
+    flow = ir.FLOW([ir.TIME(1)])
+    loop = python_like_to_ir("x = 0\nwhile x < 3:\n  x = x + 1\n")[-1]
+    before = canonical_hash([flow, loop])
+    flow.steps.append(ir.TIME(2))
+    loop.body.append(ir.RETURN(ir.VALUE(0)))
+    after = canonical_hash([flow, loop])
+    assert after != before
+    assert after == canonical_hash([ir.FLOW([ir.TIME(1), ir.TIME(2)]), copy.deepcopy(loop)])
+
+
+def test_hashes_match_the_reference_serialisation():
+    # valeurs de sha256(json.dumps(_to_primitive(x), sort_keys=True)) avant mémoïsation
+    expected = [
+        "49e98d174387df8450bc8921164a25c6538bf553353ebbd1f192bd0b4a28dd32",
+        "b68cc2be2b5443e1bb906e3304c44c35e0a65b60b78c3018da42cc655384c5b2",
+        "139edaabd8b0cd015d210fb39b465f3d976acbf9ff47a5292fbf40330293c1c4",
+        "2acce2e2e243e987d0600095f8884d250645a148eca8e83c8d0628890faaa708",
+    ]
+    for program, digest in zip(_programs(), expected):
+        assert canonical_hash(program) == digest
+        assert canonical_hash(program) == digest  # fragments en cache
+
+
+def test_list_nodes_reuse_their_fragment_until_the_list_changes():
+    loop = python_like_to_ir(LOOP_SRC)[-1]
+    canonical_hash(loop)
+    entry = loop.__dict__[_CACHE_ATTR]
+    canonical_hash([loop])
+    assert loop.__dict__[_CACHE_ATTR] is entry
+    loop.body.pop()
+    canonical_hash(loop)
+    assert loop.__dict__[_CACHE_ATTR] is not entry
@@ -0,0 +1,57 @@
+import pytest
+
+from obsidia_os0 import ir
+from obsidia_os0.sandbox import Sandbox
+
+
+def _counter_loop(n):
+    return [
+        ir.STATE("x"),
+        ir.WRITE(ir.STATE("x"), ir.VALUE(0)),
+        ir.LOOP(ir.COND(("<", ir.READ(ir.STATE("x")), ir.VALUE(n))),
+                [ir.WRITE(ir.STATE("x"), ("+", ir.READ(ir.STATE("x")), ir.VALUE(1)))], max_iters=n + 1),
+    ]
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_log_modes(compiled):
+    full = Sandbox(compiled=compiled)
+    full.run(_counter_loop(50))
+    entries = list(full.log)
+    assert len(entries) == 2 + 50 * 2 + 2
+    assert entries[1].detail == "x=0" and entries[-1].detail == "loop_exit iters=51"
+
+    ring = Sandbox(compiled=compiled, log_mode="ring", log_capacity=5)
+    ring.run(_counter_loop(50))
+    assert list(ring.log) == entries[-5:]
+    assert ring.log.counters == full.log.counters == {"STATE": 1, "WRITE": 51, "COND": 51, "LOOP": 1}
+
+    counters = Sandbox(compiled=compiled, log_mode="counters")
+    counters.run(_counter_loop(50))
+    assert len(counters.log) == 0 and counters.log.counters["WRITE"] == 51
+
+    off = Sandbox(compiled=compiled, log_mode="off")
+    off.run(_counter_loop(50))
+    assert len(off.log) == 0 and not off.log.counters
+    assert off.state == full.state == {"x": 50}
+
+
+def test_unknown_log_mode_rejected():
+    with pytest.raises(ValueError):
+        Sandbox(log_mode="verbose")
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+@pytest.mark.parametrize("log_mode", ["full", "ring"])
+def test_log_keeps_mutable_values_as_of_each_step(compiled, log_mode):
+    x = ir.STATE("x")
+    program = [
+        x,
+        ir.WRITE(x, ir.VALUE([])),
+        ir.CALL("push", [ir.READ(x), ir.VALUE(1)]),
+        ir.CALL("push", [ir.READ(x), ir.VALUE(2)]),
+    ]
+    sb = Sandbox(call_registry={"push": lambda xs, v: xs.append(v)}, compiled=compiled, log_mode=log_mode)
+    sb.run(program)
+    assert sb.state["x"] == [1, 2]
+    assert [e.detail for e in sb.log] == ["declare x", "x=[]", "push([], 1)", "push([1], 2)"]
@@ -0,0 +1,51 @@
+from obsidia_os1.os1 import run_request
+from obsidia_os1.validation_cache import ValidationCache
+from obsidia_os1.x108 import X108Gate
+
+TEXTS = ["x = 1", "x = 0\nwhile x < 3:\n  x = x + 1\n", "exec('x')", "y = 2"]
+
+
+def _decide(raw, **kw):
+    dec = run_request(raw_input=raw, x108_gate=X108Gate(108.0), x108_ctx={"time_elapsed": 200.0}, **kw)
+    return dec.decision, dec.contract_ok, dec.ssr
+
+
+def test_repeated_templates_hit_the_cache():
+    cache = ValidationCache()
+    for _ in range(3):
+        for text in TEXTS:
+            run_request(raw_input={"text": text, "x108": {}}, validation_cache=cache)
+    st = cache.stats()
+    assert st["parse_misses"] == len(TEXTS) and st["parse_hits"] == 2 * len(TEXTS)
+    assert st["validation_hits"] + st["validation_misses"] <= 3 * len(TEXTS)
+    assert st["validation_hits"] > 0
+
+
+def test_cached_decisions_match_uncached():
+    cache = ValidationCache()
+    raws = TEXTS + [{"text": t, "tag": i} for i, t in enumerate(TEXTS)] + [{"program": [{"name": "e"}]}]
+    for raw in raws + raws:
+        assert _decide(raw, validation_cache=cache) == _decide(raw, use_cache=False)
+
+
+def test_cache_is_bounded():
+    cache = ValidationCache(max_entries=2)
+    for i in range(10):
+        cache.parse(f"x = {i}")
+    assert cache.stats()["parsed_entries"] == 2
+    cache.parse("x = 9")
+    assert cache.stats()["parse_hits"] == 1
+    off = ValidationCache(max_entries=0)
+    off.parse("x = 1"); off.parse("x = 1")
+    assert off.stats()["parse_hits"] == 0
+
+
+def test_mutating_a_result_does_not_leak_into_the_next_request():
+    cache = ValidationCache()
+    first = run_request(raw_input="x = [1, 2]", validation_cache=cache)
+    first.os0_result["state"]["x"].append(99)
+    program, _, _ = cache.parse("x = [1, 2]")
+    program.append("garbage")
+    second = run_request(raw_input="x = [1, 2]", validation_cache=cache)
+    assert second.os0_result["state"]["x"] == [1, 2]
+    assert cache.stats()["parse_hits"] == 2
@@ -0,0 +1,47 @@
+import io
+import json
+
+import pytest
+
+import jsonstream
+from conftest import ROOT
+from run_os0_os1_on_scenarios import iter_scenarios, run_stream
+
+SAMPLE = ROOT / "tests" / "scenarios_sample.json"
+
+
+def _scenarios(copies=8):
+    base = list(iter_scenarios(SAMPLE))
+    return [dict(sc, id=f"{sc['id']}#{k}") for k in range(copies) for sc in base]
+
+
+def test_run_stream_ordered_pool_matches_serial():
+    scenarios = _scenarios()
+    serial = list(run_stream(scenarios))
+    assert [row["id"] for row in serial] == [sc["id"] for sc in scenarios]
+    pooled = list(run_stream(iter(scenarios), workers=2, batch_size=3, max_pending=2))
+    assert pooled == serial
+
+
+def test_run_stream_unordered_yields_every_row_once():
+    scenarios = _scenarios()
+    serial = list(run_stream(scenarios))
+    rows = list(run_stream(iter(scenarios), workers=2, batch_size=3, ordered=False, max_pending=2))
+    assert sorted(rows, key=lambda r: r["id"]) == sorted(serial, key=lambda r: r["id"])
+
+
+DOC = ' [ -1.5e3 ,{"a": "x,]y", "b": [1, [2, {}]]},\n"\\u00e9\\"]" , 12345678901234567890, true,null, [] ,0.25 ] '
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 7, 64])
+def test_iter_json_array_small_chunks(monkeypatch, chunk):
+    monkeypatch.setattr(jsonstream, "_READ_CHUNK", chunk)
+    assert list(jsonstream.iter_json_array(io.StringIO(DOC))) == json.loads(DOC)
+    assert list(jsonstream.iter_json_array(io.StringIO("[]"))) == []
+
+
+@pytest.mark.parametrize("doc", ['{"a": 1}', "[1, 2", "[1 2]", ""])
+def test_iter_json_array_rejects_malformed_input(monkeypatch, doc):
+    monkeypatch.setattr(jsonstream, "_READ_CHUNK", 2)
+    with pytest.raises(ValueError):
+        list(jsonstream.iter_json_array(io.StringIO(doc)))
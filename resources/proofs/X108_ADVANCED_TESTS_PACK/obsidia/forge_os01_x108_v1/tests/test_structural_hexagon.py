@@ -0,0 +1,70 @@
+import random
+import time
+from itertools import combinations, permutations
+
+from obsidia_structural_core import metrics as core_metrics
+
+
+def _dense_graph(n, seed, decimals=None):
+    rnd = random.Random(seed)
+    W = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                w = rnd.random()
+                W[i][j] = round(w, decimals) if decimals else w
+    return W
+
+
+def _brute_force_hexagon(W, theta_R, theta_A, lam):
+    # score d'un sous-ensemble (poids radiaux triés décroissants) ; égalité à _slack près,
+    # départagée par le plus petit (pivot, sous-ensemble) puis son premier anneau valide
+    found = []
+    for p in range(len(W)):
+        cand = [h for h in range(len(W)) if h != p and W[p][h] >= theta_R]
+        for subset in combinations(cand, 6):
+            rings = [(subset[0],) + perm for perm in permutations(subset[1:], 5)]
+            rings = [r for r in rings if all(W[r[i]][r[(i + 1) % 6]] >= theta_A for i in range(6))]
+            if not rings:
+                continue
+            radial = sorted((W[p][h] for h in subset), reverse=True)
+            rmean = core_metrics._mean(radial)
+            rvar = core_metrics._var(radial)
+            found.append(core_metrics.Hexagon(p, rings[0], rmean, rvar, rmean - lam * rvar))
+    if not found:
+        return None
+    top = max(hx.score for hx in found)
+    return next(hx for hx in found if hx.score >= top - core_metrics._slack(top))
+
+
+def test_hexagon_search_matches_exhaustive_enumeration():
+    for seed in range(30):
+        # grille à 1 décimale : beaucoup d'égalités de score
+        W = _dense_graph(8 + seed % 3, seed, decimals=1 if seed % 2 else None)
+        for lam in (0.0, 1.0, -1.0):
+            expected = _brute_force_hexagon(W, 0.3, 0.5, lam)
+            report = core_metrics.search_best_hexagon(W, 0.3, 0.5, lam)
+            assert report.proven_optimal
+            assert report.best == expected
+
+
+def test_hexagon_search_breaks_uniform_ties_quickly():
+    n = 25
+    W = [[0.0 if i == j else 0.8 for j in range(n)] for i in range(n)]
+    for lam in (0.0, 1.0):
+        t0 = time.perf_counter()
+        report = core_metrics.search_best_hexagon(W, 0.3, 0.5, lam)
+        assert time.perf_counter() - t0 < 2.0
+        assert report.proven_optimal
+        assert (report.best.p, report.best.ring) == (0, (1, 2, 3, 4, 5, 6))
+    small = [row[:10] for row in W[:10]]
+    assert core_metrics.search_best_hexagon(small, 0.3, 0.5, 1.0).best == _brute_force_hexagon(small, 0.3, 0.5, 1.0)
+
+
+def test_hexagon_search_time_budget_reports_unproven():
+    W = _dense_graph(16, 0)
+    report = core_metrics.search_best_hexagon(W, 0.3, 0.4, 1.0, time_budget_s=0.0)
+    assert not report.proven_optimal
+    m = core_metrics.compute_metrics(W, theta_R=0.3, theta_A=0.4, hexagon_time_budget_s=0.0)
+    assert not m.hexagon_optimal
+    assert core_metrics.compute_metrics(W, theta_R=0.3, theta_A=0.4).hexagon_optimal
@@ -0,0 +1,38 @@
+import random
+
+from obsidia_structural_core import IncrementalStructuralState
+from obsidia_structural_core import metrics as core_metrics
+
+
+def _graph(n, seed):
+    rnd = random.Random(seed)
+    return [[0.0 if i == j else rnd.choice([0.0, 0.4, 0.8, rnd.random()]) for j in range(n)] for i in range(n)]
+
+
+def test_incremental_metrics_match_full_recompute():
+    kw = dict(theta_T=0.5, theta_R=0.4, theta_A=0.4)
+    for seed in range(5):
+        rnd = random.Random(100 + seed)
+        W = _graph(12, seed)
+        core = sorted(rnd.sample(range(12), 9)) if seed % 2 else None
+        state = IncrementalStructuralState(W, core_nodes=core, **kw)
+        for _ in range(40):
+            i, j = rnd.randrange(12), rnd.randrange(12)
+            w = rnd.choice([0.0, 0.5, 0.9, rnd.random()])
+            W[i][j] = w
+            state.update_edge(i, j, w)
+            if core is None:
+                expected = core_metrics.compute_metrics(W, **kw)
+            else:
+                expected = core_metrics.compute_metrics_core_fixed(W, core, **kw)
+            assert state.metrics() == expected
+
+
+def test_world_edges_do_not_trigger_research():
+    W = _graph(10, 7)
+    state = IncrementalStructuralState(W, core_nodes=[0, 1, 2, 3, 4, 5, 6])
+    before = state.metrics()
+    searches = state.pivot_searches
+    state.update_edge(8, 9, 0.9)
+    assert state.metrics() is before
+    assert state.pivot_searches == searches
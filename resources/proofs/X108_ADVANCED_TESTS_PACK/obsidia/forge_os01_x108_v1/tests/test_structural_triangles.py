@@ -0,0 +1,44 @@
+import random
+from itertools import combinations
+
+from obsidia_structural_core import metrics as core_metrics
+from obsidia_os2.metrics import triangle_mean
+
+
+def _random_graph(n, p, seed):
+    rnd = random.Random(seed)
+    W = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            if i != j and rnd.random() < p:
+                W[i][j] = rnd.choice([1.0, 0.5, rnd.random()])
+    return W
+
+
+def _brute_force_triangles(W, theta_T):
+    out = []
+    for i, j, k in combinations(range(len(W)), 3):
+        if W[i][j] > 0 and W[j][k] > 0 and W[k][i] > 0:
+            t = core_metrics.triangle_score(W, i, j, k)
+            if t >= theta_T:
+                out.append(core_metrics.Triangle(i, j, k, t))
+    out.sort(key=lambda t: t.score, reverse=True)
+    return out
+
+
+def test_strong_triangles_match_exhaustive_enumeration():
+    for seed in range(20):
+        W = _random_graph(18, 0.5, seed)
+        for theta in (0.0, 0.7):
+            expected = _brute_force_triangles(W, theta)
+            assert core_metrics.find_strong_triangles(W, theta) == expected
+            pruned = sorted(core_metrics._strong_triangles_py(W, theta), key=lambda t: t.score, reverse=True)
+            assert pruned == expected
+
+
+def test_triangle_mean_matches_sequential_sum():
+    for seed in range(10):
+        W = _random_graph(15, 0.6, seed)
+        n = len(W)
+        ts = [(W[i][j] + W[j][k] + W[k][i]) / 3.0 for i, j, k in combinations(range(n), 3)]
+        assert triangle_mean(W) == sum(ts) / len(ts)
@@ -0,0 +1,28 @@
+import random
+
+from obsidia_os1.x108 import ACT, HOLD, X108Gate
+
+
+def test_check_batch_matches_scalar_check():
+    random.seed(1337)
+    gate = X108Gate(10.0)
+    elapsed = [random.uniform(-5.0, 25.0) for _ in range(2000)] + [10.0, float("nan"), 0.0]
+    irrev = [random.choice([True, False]) for _ in elapsed]
+    batch = gate.check_batch(elapsed, irrev)
+    assert len(batch) == len(elapsed)
+    for i, (e, r) in enumerate(zip(elapsed, irrev)):
+        ref = gate.check(e, r)
+        assert batch.decision(i) == ref.decision
+        assert batch.check(i) == ref or e != e  # NaN : wait_s NaN != NaN
+        assert batch.reason(i, "n") == gate.check(e, r, "n").reason
+        if ref.decision == "ACT":
+            assert batch.wait_s[i] == 0.0
+        elif e == e:
+            assert batch.wait_s[i] == ref.wait_s
+    assert batch.hold_count() == sum(1 for c in batch.codes if c == HOLD)
+
+
+def test_check_batch_broadcasts_irreversible():
+    batch = X108Gate(108.0).check_batch([0.0, 108.0, 200.0])
+    assert list(batch.codes) == [HOLD, ACT, ACT]
+    assert list(X108Gate(108.0).check_batch([0.0, 1.0], False).codes) == [ACT, ACT]
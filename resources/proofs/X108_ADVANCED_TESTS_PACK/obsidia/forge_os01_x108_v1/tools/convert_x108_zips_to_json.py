@@ -6,12 +6,17 @@ Objectif:
 - Chercher des fichiers .csv/.csv.gz/.json déjà présents.
 - Si rien trouvé: générer un dataset de scénarios minimal.
 
-Sortie JSON:
+Sortie JSON (ou JSON Lines si --out se termine par .jsonl, une ligne par scénario):
 [
   {"id":"...", "time_elapsed":..., "IST":..., "CMEC":..., "irreversible":true, "raw_source": ...},
   ...
 ]
 
+Tout est en flux : membres décompressés au fil de la lecture (y compris .csv.gz) et
+lignes normalisées une à une ; un membre n'est écrit qu'une fois lu en entier (un membre
+illisible est écarté, mémoire bornée par --limit). --workers convertit plusieurs zips en
+parallèle (sortie dans l'ordre des zips).
+
 Ce script est volontairement robuste/heuristique: il ne suppose pas un format unique.
 """
 
@@ -21,12 +26,20 @@ import argparse
 import csv
 import gzip
 import io
+import itertools
 import json
 import os
 import random
 import re
+import sys
 import zipfile
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from jsonstream import JsonLinesWriter, JsonListWriter, iter_json_array
+
+_SNIFF_CHARS = 4096
 
 
 def _iter_zip_members(z: zipfile.ZipFile) -> Iterable[zipfile.ZipInfo]:
@@ -36,38 +49,32 @@ def _iter_zip_members(z: zipfile.ZipFile) -> Iterable[zipfile.ZipInfo]:
         yield info
 
 
-def _read_text_from_zip(z: zipfile.ZipFile, name: str, limit_bytes: int = 10_000_000) -> str:
-    with z.open(name) as f:
-        b = f.read(limit_bytes)
-    return b.decode("utf-8", errors="replace")
-
-
-def _read_json_from_zip(z: zipfile.ZipFile, name: str) -> Any:
-    txt = _read_text_from_zip(z, name)
-    return json.loads(txt)
-
-
-def _read_csv_rows_from_bytes(data: bytes, is_gz: bool) -> List[Dict[str, str]]:
+def _open_text_member(z: zipfile.ZipFile, name: str, is_gz: bool = False) -> IO[str]:
+    """Flux texte d'un membre (décompression .gz incrémentale, pas de limite de taille)."""
+    raw = z.open(name)
     if is_gz:
-        with gzip.GzipFile(fileobj=io.BytesIO(data)) as gf:
-            txt = gf.read().decode("utf-8", errors="replace")
-    else:
-        txt = data.decode("utf-8", errors="replace")
+        raw = gzip.GzipFile(fileobj=raw)
+    return io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline="")
+
 
-    # auto dialect
-    sample = txt[:4096]
+def _iter_csv_rows(text: IO[str]) -> Iterator[Dict[str, str]]:
+    # auto dialect sur le début du flux (ligne courante complétée), puis lecture ligne à ligne
+    sample = text.read(_SNIFF_CHARS)
+    sample += text.readline()
     try:
-        dialect = csv.Sniffer().sniff(sample)
+        dialect = csv.Sniffer().sniff(sample[:_SNIFF_CHARS])
     except Exception:
         dialect = csv.excel
 
-    reader = csv.DictReader(io.StringIO(txt), dialect=dialect)
-    rows: List[Dict[str, str]] = []
+    reader = csv.DictReader(itertools.chain(io.StringIO(sample, newline=""), text), dialect=dialect)
     for row in reader:
         if row is None:
             continue
-        rows.append({k: (v if v is not None else "") for k, v in row.items()})
-    return rows
+        yield {k: (v if v is not None else "") for k, v in row.items()}
+
+
+def _warn(msg: str) -> None:
+    print(f"warning: {msg}", file=sys.stderr)
 
 
 def _normalize_row(row: Dict[str, str], idx: int, source: str) -> Dict[str, Any]:
@@ -108,82 +115,112 @@ def _normalize_row(row: Dict[str, str], idx: int, source: str) -> Dict[str, Any]
     }
 
 
-def extract_scenarios_from_zip(zip_path: str, limit: int = 1000) -> List[Dict[str, Any]]:
-    scenarios: List[Dict[str, Any]] = []
+def _json_item_scenario(item: Dict[str, Any], name: str, i: int, source: str) -> Dict[str, Any]:
+    return {
+        "id": str(item.get("id", f"{name}#{i}")),
+        "time_elapsed": float(item.get("time_elapsed", item.get("t", 0.0))),
+        "IST": float(item.get("IST", item.get("ist", 0.0))),
+        "CMEC": float(item.get("CMEC", item.get("cmec", 0.0))),
+        "irreversible": bool(item.get("irreversible", True)),
+        "raw_source": source,
+    }
 
+
+def _json_member_scenarios(z: zipfile.ZipFile, name: str, base: str) -> Iterator[Dict[str, Any]]:
+    # liste décodée élément par élément ; un dict est ignoré, trop ambigu
+    with _open_text_member(z, name) as text:
+        for i, item in enumerate(iter_json_array(text)):
+            if isinstance(item, dict):
+                yield _json_item_scenario(item, name, i, f"{base}::{name}")
+
+
+def _csv_member_scenarios(z: zipfile.ZipFile, name: str, is_gz: bool, base: str) -> Iterator[Dict[str, Any]]:
+    with _open_text_member(z, name, is_gz=is_gz) as text:
+        for i, row in enumerate(_iter_csv_rows(text)):
+            yield _normalize_row(row, i, f"{base}::{name}")
+
+
+def _py_member_scenarios(z: zipfile.ZipFile, name: str, base: str) -> Iterator[Dict[str, Any]]:
+    with _open_text_member(z, name) as text:
+        txt = text.read()
+    # extraction naive des tuples (time_elapsed, IST, CMEC)
+    triples = re.finditer(r"\(\s*([0-9]+\.?[0-9]*)\s*,\s*([0-9]+\.?[0-9]*)\s*,\s*([0-9]+\.?[0-9]*)\s*\)", txt)
+    for i, mt in enumerate(triples):
+        t, ist, cmec = mt.groups()
+        yield {
+            "id": f"{base}::{name}#{i}",
+            "time_elapsed": float(t),
+            "IST": float(ist),
+            "CMEC": float(cmec),
+            "irreversible": True,
+            "raw_source": f"{base}::{name}",
+        }
+
+
+def _iter_member_scenarios(z: zipfile.ZipFile, zip_path: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    base = os.path.basename(zip_path)
+    members = list(_iter_zip_members(z))
+    sources: List[Tuple[str, Iterator[Dict[str, Any]]]] = []
+
+    # 1) JSON direct
+    for m in members:
+        if m.filename.lower().endswith(".json"):
+            sources.append((m.filename, _json_member_scenarios(z, m.filename, base)))
+
+    # 2) CSV / CSV.GZ
+    for m in members:
+        fn = m.filename.lower()
+        if fn.endswith(".csv"):
+            sources.append((m.filename, _csv_member_scenarios(z, m.filename, False, base)))
+        elif fn.endswith(".csv.gz") or fn.endswith(".gz"):
+            # only keep gz that likely contains csv
+            if "csv" in fn:
+                sources.append((m.filename, _csv_member_scenarios(z, m.filename, True, base)))
+
+    # 3) Heuristique: script python qui contient une liste/dict de scénarios
+    for m in members:
+        if m.filename.lower().endswith(".py"):
+            sources.append((m.filename, _py_member_scenarios(z, m.filename, base)))
+
+    room = limit
+    for name, scenarios in sources:
+        # un membre est lu jusqu'au bout avant d'être émis : illisible en cours de route, il est
+        # écarté en entier ; au-delà de la limite, ses lignes sont lues mais pas gardées
+        kept: List[Dict[str, Any]] = []
+        try:
+            for sc in scenarios:
+                if room is None or len(kept) < room:
+                    kept.append(sc)
+        except Exception as e:
+            _warn(f"{base}::{name}: {type(e).__name__}: {e} (member skipped)")
+            continue
+        yield from kept
+        if room is not None:
+            room -= len(kept)
+            if room <= 0:
+                return
+
+
+def iter_scenarios_from_zip(zip_path: str, limit: Optional[int] = 1000) -> Iterator[Dict[str, Any]]:
+    """Scénarios d'un zip, en flux (JSON, puis CSV/CSV.GZ, puis .py). limit=None ou 0 : pas de limite."""
     with zipfile.ZipFile(zip_path, "r") as z:
-        members = list(_iter_zip_members(z))
+        yield from _iter_member_scenarios(z, zip_path, limit or None)
+
+
+def extract_scenarios_from_zip(zip_path: str, limit: int = 1000) -> List[Dict[str, Any]]:
+    return list(iter_scenarios_from_zip(zip_path, limit=limit))
 
-        # 1) JSON direct
-        json_candidates = [m.filename for m in members if m.filename.lower().endswith(".json")]
-        for name in json_candidates:
-            try:
-                obj = _read_json_from_zip(z, name)
-                if isinstance(obj, list):
-                    for i, item in enumerate(obj):
-                        if isinstance(item, dict):
-                            item2 = {
-                                "id": str(item.get("id", f"{name}#{i}")),
-                                "time_elapsed": float(item.get("time_elapsed", item.get("t", 0.0))),
-                                "IST": float(item.get("IST", item.get("ist", 0.0))),
-                                "CMEC": float(item.get("CMEC", item.get("cmec", 0.0))),
-                                "irreversible": bool(item.get("irreversible", True)),
-                                "raw_source": f"{os.path.basename(zip_path)}::{name}",
-                            }
-                            scenarios.append(item2)
-                            if len(scenarios) >= limit:
-                                return scenarios
-                # if dict, ignore (too ambiguous)
-            except Exception:
-                continue
-
-        # 2) CSV / CSV.GZ
-        csv_candidates: List[Tuple[str, bool]] = []
-        for m in members:
-            fn = m.filename.lower()
-            if fn.endswith(".csv"):
-                csv_candidates.append((m.filename, False))
-            elif fn.endswith(".csv.gz") or fn.endswith(".gz"):
-                # only keep gz that likely contains csv
-                if "csv" in fn:
-                    csv_candidates.append((m.filename, True))
-
-        for name, is_gz in csv_candidates:
-            try:
-                with z.open(name) as f:
-                    data = f.read(20_000_000)
-                rows = _read_csv_rows_from_bytes(data, is_gz=is_gz)
-                for i, row in enumerate(rows[: max(0, limit - len(scenarios))]):
-                    scenarios.append(_normalize_row(row, i, f"{os.path.basename(zip_path)}::{name}"))
-                if len(scenarios) >= limit:
-                    return scenarios
-            except Exception:
-                continue
-
-        # 3) Heuristique: script python qui contient une liste/dict de scénarios
-        py_candidates = [m.filename for m in members if m.filename.lower().endswith(".py")]
-        for name in py_candidates:
-            try:
-                txt = _read_text_from_zip(z, name)
-                # extraction naive des tuples (time_elapsed, IST, CMEC)
-                triples = re.findall(r"\(\s*([0-9]+\.?[0-9]*)\s*,\s*([0-9]+\.?[0-9]*)\s*,\s*([0-9]+\.?[0-9]*)\s*\)", txt)
-                for i, (t, ist, cmec) in enumerate(triples[: max(0, limit - len(scenarios))]):
-                    scenarios.append(
-                        {
-                            "id": f"{os.path.basename(zip_path)}::{name}#{i}",
-                            "time_elapsed": float(t),
-                            "IST": float(ist),
-                            "CMEC": float(cmec),
-                            "irreversible": True,
-                            "raw_source": f"{os.path.basename(zip_path)}::{name}",
-                        }
-                    )
-                if len(scenarios) >= limit:
-                    return scenarios
-            except Exception:
-                continue
-
-    return scenarios
+
+def _convert_zip_to_part(zip_path: str, limit: Optional[int], part: str) -> int:
+    # worker : un fichier JSONL partiel par zip, réassemblés dans l'ordre des zips
+    with JsonLinesWriter(Path(part)) as w:
+        for sc in iter_scenarios_from_zip(zip_path, limit=limit):
+            w.write(sc)
+        return w.count
+
+
+def _open_writer(out: Path):
+    return JsonLinesWriter(out) if out.suffix.lower() in (".jsonl", ".ndjson") else JsonListWriter(out)
 
 
 def generate_fallback_scenarios(n: int, seed: int = 108) -> List[Dict[str, Any]]:
@@ -201,24 +238,41 @@ def generate_fallback_scenarios(n: int, seed: int = 108) -> List[Dict[str, Any]]
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--zips", nargs="*", default=[], help="Paths to X108 zip packs")
-    ap.add_argument("--limit", type=int, default=1000, help="Max scenarios per zip")
+    ap.add_argument("--limit", type=int, default=1000, help="Max scenarios per zip (0 = no limit)")
     ap.add_argument("--fallback", type=int, default=200, help="If nothing extracted, generate this many")
-    ap.add_argument("--out", required=True, help="Output JSON file")
+    ap.add_argument("--out", required=True, help="Output file (.jsonl = JSON Lines, otherwise a JSON list)")
+    ap.add_argument("--workers", type=int, default=1, help="Zips converted concurrently")
     args = ap.parse_args()
 
-    scenarios: List[Dict[str, Any]] = []
-    for zp in args.zips:
-        if not os.path.exists(zp):
-            continue
-        scenarios.extend(extract_scenarios_from_zip(zp, limit=args.limit))
+    out = Path(args.out)
+    zips = [zp for zp in args.zips if os.path.exists(zp)]
+    limit = args.limit or None
 
-    if not scenarios:
-        scenarios = generate_fallback_scenarios(args.fallback)
-
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(scenarios, f, ensure_ascii=False, indent=2)
-
-    print(f"Wrote {len(scenarios)} scenarios to {args.out}")
+    with _open_writer(out) as writer:
+        if args.workers > 1 and len(zips) > 1:
+            parts = [str(out.with_name(f".{out.name}.part{i}.jsonl")) for i in range(len(zips))]
+            try:
+                with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                    list(pool.map(_convert_zip_to_part, zips, [limit] * len(zips), parts))
+                for part in parts:
+                    with open(part, "r", encoding="utf-8") as f:
+                        for line in f:
+                            writer.write(json.loads(line))
+            finally:
+                for part in parts:
+                    if os.path.exists(part):
+                        os.remove(part)
+        else:
+            for zp in zips:
+                for sc in iter_scenarios_from_zip(zp, limit=limit):
+                    writer.write(sc)
+
+        if not writer.count:
+            for sc in generate_fallback_scenarios(args.fallback):
+                writer.write(sc)
+        total = writer.count
+
+    print(f"Wrote {total} scenarios to {args.out}")
     return 0
 
 
@@ -0,0 +1,126 @@
+"""Lecture / écriture JSON en flux pour les outils (listes de scénarios et rapports).
+
+- iter_json_array : décode une liste JSON élément par élément, mémoire constante
+- JsonListWriter : écrit une liste JSON élément par élément ; le fichier obtenu est
+  identique à json.dump(liste, f, ensure_ascii=False, indent=2)
+- JsonLinesWriter : une ligne JSON par élément
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+_READ_CHUNK = 1 << 20
+
+
+def iter_json_array(f) -> Iterator[Any]:
+    """Décode une liste JSON élément par élément (sans charger le fichier)."""
+    dec = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def _fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(_READ_CHUNK)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def _skip_ws() -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or not _fill():
+                return
+
+    _skip_ws()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("Scenario JSON must be a list")
+    pos += 1
+    first = True
+    while True:
+        _skip_ws()
+        if pos >= len(buf):
+            raise ValueError("Unterminated scenario list")
+        if buf[pos] == "]":
+            return
+        if not first:
+            if buf[pos] != ",":
+                raise ValueError(f"Expected ',' in scenario list, got {buf[pos]!r}")
+            pos += 1
+            _skip_ws()
+        first = False
+        while True:
+            try:
+                item, end = dec.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof or not _fill():
+                    raise
+                continue
+            # un nombre peut être tronqué par la fin du tampon ("-1." + "5e3") : on n'accepte
+            # l'élément que si le séparateur qui le suit (',' ou ']') est déjà lu
+            nxt = end
+            while nxt < len(buf) and buf[nxt].isspace():
+                nxt += 1
+            if nxt < len(buf) and buf[nxt] not in ",]":
+                if isinstance(item, (int, float)) and not eof and _fill():
+                    continue
+            elif nxt >= len(buf) and not eof and _fill():
+                continue
+            break
+        pos = end
+        yield item
+
+
+class JsonListWriter:
+    """Liste JSON écrite au fil de l'eau (à utiliser comme context manager)."""
+
+    def __init__(self, path: Path):
+        self._f = Path(path).open("w", encoding="utf-8")
+        self._f.write("[")
+        self.count = 0
+
+    def write(self, item: Any) -> None:
+        # json.dumps n'émet de retour à la ligne que structurels (ceux des chaînes sont échappés)
+        text = json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        self._f.write(("\n  " if self.count == 0 else ",\n  ") + text)
+        self.count += 1
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.write("\n]" if self.count else "]")
+            self._f.close()
+
+    def __enter__(self) -> "JsonListWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class JsonLinesWriter:
+    """Un objet JSON par ligne (à utiliser comme context manager)."""
+
+    def __init__(self, path: Path):
+        self._f = Path(path).open("w", encoding="utf-8")
+        self.count = 0
+
+    def write(self, item: Any) -> None:
+        self._f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
 """Runner OS0↔OS1 sur des scénarios JSON.
 
-Entrée JSON = liste de scénarios comme produit par convert_x108_zips_to_json.py
+Entrée = scénarios comme produits par convert_x108_zips_to_json.py :
+- liste JSON (.json), lue de façon incrémentale (un élément à la fois)
+- ou JSON lines (.jsonl / .ndjson), une ligne par scénario
+
+Les scénarios sont traités en flux (par lots, éventuellement sur un pool de processus)
+et chaque ligne de rapport est écrite dès qu'elle est disponible : la mémoire reste
+bornée quel que soit le nombre de scénarios.
 
 Sortie:
 - report.json (détaillé)
@@ -13,92 +19,159 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from obsidia_os1.os1 import run_request
+from obsidia_os1.x108 import X108Gate
+
+from jsonstream import JsonListWriter, iter_json_array
 
+CSV_FIELDS = ["id", "decision", "contract_ok", "x108_decision", "wait_s", "x108_reason"]
 
-def _load_json(path: Path) -> List[Dict[str, Any]]:
+def iter_scenarios(path: Path) -> Iterator[Dict[str, Any]]:
+    """Itère les scénarios d'un fichier .json (liste) ou .jsonl/.ndjson."""
     with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    if not isinstance(data, list):
-        raise ValueError("Scenario JSON must be a list")
-    return data
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f)
+
+
+def run_scenario(sc: Dict[str, Any], contract: Any = None, min_wait_s: float = 108.0) -> Dict[str, Any]:
+    """Exécute un scénario via run_request et retourne sa ligne de rapport."""
+    x108_ctx = {
+        "time_elapsed": float(sc.get("time_elapsed", 0.0)),
+        "IST": float(sc.get("IST", 0.0)),
+        "CMEC": float(sc.get("CMEC", 0.0)),
+        "irreversible": bool(sc.get("irreversible", True)),
+    }
+    req = {"text": sc.get("text", "noop"), "x108": x108_ctx, "contract": contract}
+    dec = run_request(raw_input=req, contract=contract, x108_gate=X108Gate(min_wait_s), x108_ctx=x108_ctx)
+    x108 = dec.x108
+    return {
+        "id": sc.get("id"),
+        "decision": dec.decision,
+        "contract_ok": dec.contract_ok,
+        "x108_decision": x108.decision if x108 else None,
+        "wait_s": x108.wait_s if x108 else None,
+        "x108_reason": x108.reason if x108 else None,
+        "ssr": dec.ssr,
+    }
+
+
+def _run_batch(batch: List[Dict[str, Any]], contract: Any, min_wait_s: float) -> List[Dict[str, Any]]:
+    return [run_scenario(sc, contract, min_wait_s) for sc in batch]
+
+
+def _batches(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def run_stream(
+    scenarios: Iterable[Dict[str, Any]],
+    contract: Any = None,
+    min_wait_s: float = 108.0,
+    workers: int = 1,
+    batch_size: int = 256,
+    ordered: bool = True,
+    max_pending: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Exécute les scénarios en flux et produit les lignes de rapport.
+
+    Args:
+        workers: 1 = exécution dans le process courant ; >1 = pool de processus
+        batch_size: Scénarios par tâche envoyée au pool (amortit la sérialisation)
+        ordered: True = lignes dans l'ordre d'entrée ; False = dans l'ordre de complétion
+        max_pending: Lots en vol au maximum (défaut 4 × workers) : borne la mémoire
+    """
+    batches = _batches(scenarios, max(1, int(batch_size)))
+    if workers <= 1:
+        for batch in batches:
+            yield from _run_batch(batch, contract, min_wait_s)
+        return
+
+    max_pending = max_pending or 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for batch in batches:
+            pending.append(pool.submit(_run_batch, batch, contract, min_wait_s))
+            while len(pending) >= max_pending:
+                if ordered:
+                    yield from pending.popleft().result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        pending.remove(fut)
+                        yield from fut.result()
+        if ordered:
+            while pending:
+                yield from pending.popleft().result()
+        else:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    pending.remove(fut)
+                    yield from fut.result()
 
 
 def main() -> None:
     ap = argparse.ArgumentParser()
-    ap.add_argument("--scenarios", required=True, help="Path to scenarios JSON")
+    ap.add_argument("--scenarios", required=True, help="Path to scenarios JSON (.json list or .jsonl)")
     ap.add_argument("--outdir", default="out", help="Output directory")
     ap.add_argument("--contract", default=None, help="Optional contract JSON")
+    ap.add_argument("--min-wait", type=float, default=108.0, help="X108 minimum wait (s)")
+    ap.add_argument("--workers", type=int, default=1, help="Process pool size (1 = sequential)")
+    ap.add_argument("--batch-size", type=int, default=256, help="Scenarios per pool task")
+    ap.add_argument("--unordered", action="store_true", help="Write rows as they complete (input order not kept)")
     args = ap.parse_args()
 
     scenarios_path = Path(args.scenarios).resolve()
     outdir = Path(args.outdir).resolve()
     outdir.mkdir(parents=True, exist_ok=True)
 
-    scenarios = _load_json(scenarios_path)
-
     # optional contract (very small)
     contract_obj = None
     if args.contract:
         with Path(args.contract).open("r", encoding="utf-8") as f:
             contract_obj = json.load(f)
 
-    results: List[Dict[str, Any]] = []
-    for sc in scenarios:
-        req = {
-            "text": sc.get("text", "noop"),
-            "x108": {
-                "time_elapsed": float(sc.get("time_elapsed", 0.0)),
-                "IST": float(sc.get("IST", 0.0)),
-                "CMEC": float(sc.get("CMEC", 0.0)),
-                "irreversible": bool(sc.get("irreversible", True)),
-            },
-            "contract": contract_obj,
-        }
-        dec = run_request(req)
-        results.append(
-            {
-                "id": sc.get("id"),
-                "decision": dec.decision,
-                "contract_ok": dec.contract_ok,
-                "x108_decision": dec.x108.decision,
-                "wait_s": dec.x108.wait_s,
-                "x108_reason": dec.x108.reason,
-                "ssr": dec.ssr,
-            }
-        )
-
     report_json = outdir / "report.json"
     report_csv = outdir / "report.csv"
 
-    with report_json.open("w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-
-    with report_csv.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(
-            f,
-            fieldnames=[
-                "id",
-                "decision",
-                "contract_ok",
-                "x108_decision",
-                "wait_s",
-                "x108_reason",
-            ],
-        )
+    counts = {"ACT": 0, "HOLD": 0, "REJECT": 0}
+    total = 0
+    rows = run_stream(
+        iter_scenarios(scenarios_path),
+        contract=contract_obj,
+        min_wait_s=args.min_wait,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        ordered=not args.unordered,
+    )
+    with JsonListWriter(report_json) as fj, report_csv.open("w", newline="", encoding="utf-8") as fc:
+        w = csv.DictWriter(fc, fieldnames=CSV_FIELDS)
         w.writeheader()
-        for r in results:
-            w.writerow({k: r.get(k) for k in w.fieldnames})
+        for r in rows:
+            fj.write(r)
+            w.writerow({k: r.get(k) for k in CSV_FIELDS})
+            total += 1
+            counts[r["decision"]] = counts.get(r["decision"], 0) + 1
 
     # summary to stdout
-    total = len(results)
-    act = sum(1 for r in results if r["decision"] == "ACT")
-    hold = sum(1 for r in results if r["decision"] == "HOLD")
-    rej = sum(1 for r in results if r["decision"] == "REJECT")
-    print(f"Total: {total} | ACT: {act} | HOLD: {hold} | REJECT: {rej}")
+    print(f"Total: {total} | ACT: {counts['ACT']} | HOLD: {counts['HOLD']} | REJECT: {counts['REJECT']}")
     print(f"Wrote: {report_csv}")
 
 
@@ -0,0 +1,287 @@
+"""Moteur de backtest événementiel : features → sim → score → gates 1/2/3 → Roi → exécution (dry).
+
+Reprend la boucle de scripts/run_backtest.py du pack trading-agent sous forme réutilisable :
+étapes injectables, état incrémental (IncrementalFeatureState), résultats préalloués
+en colonnes et une seule sortie à la fin (pas d'écriture JSONL par pas de temps).
+"""
+import argparse
+import json
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data import load_prices_csv
+from src.features.features import IncrementalFeatureState
+from src.simulation.sim_lite import sim_lite_bootstrap
+from src.score.score import compute_score
+from src.gates.gate1_integrity import gate1_validate_intent
+from src.gates.gate2_x108_temporal import gate2_x108_temporal
+from src.gates.gate3_risk_killswitch import RiskKillState, gate3_risk_kill
+from src.roi_policy.roi import roi_init, roi_decide
+from src.execution.erc8004 import build_trade_intent
+from src.execution.dry_executor import execute_dry
+
+# Même schéma que config.json du pack trading-agent-erc8004-x108
+DEFAULT_BACKTEST_CONFIG = {
+    "hold_seconds": 10,
+    "coherence_threshold": 0.6,
+    "gate3": {
+        "max_drawdown": 0.08,
+        "max_volatility": 0.06,
+        "max_consecutive_losses": 4,
+        "cooldown_steps": 25
+    },
+    "simulation": {
+        "n_sims": 200,
+        "horizon": 20,
+        "bootstrap_window": 200
+    },
+    "score": {
+        "weights": {
+            "w_E": 1.0, "w_sigma": 1.0, "w_DD": 1.0, "w_ruin": 1.0,
+            "w_T": 0.25, "w_V": 0.25, "w_X": 0.5
+        },
+        "dd_threshold": 0.05
+    },
+    "roi": {
+        "strategy_change_min_persist_steps": 100,
+        "roi_cooldown_steps": 200,
+        "risk_levels": [0.0, 0.15, 0.25, 0.35],
+        "default_risk_level": 0.15,
+        "safe_exit_min_hold_steps": 400
+    }
+}
+
+# Valeurs de la colonne "gate" : 0 = passé, 1/2/3 = gate bloquante, 4 = Roi en safe mode
+GATE_PASS, GATE_ROI_SAFE = 0, 4
+
+@dataclass
+class BacktestResult:
+    """Résultat colonne d'un backtest (un tableau par champ, une ligne par pas de temps)."""
+    columns: Dict[str, np.ndarray]
+    final_equity: float
+    config: Dict[str, Any]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns)
+
+    def save(self, path: Path) -> Path:
+        """Écrit le résultat en un seul fichier (.csv ou .npz)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".csv":
+            self.to_frame().to_csv(path, index=False)
+        else:
+            np.savez_compressed(path, **{k: (v.astype(str) if v.dtype == object else v) for k, v in self.columns.items()})
+        return path
+
+class BacktestEngine:
+    """
+    Backtest pas-à-pas réutilisable.
+
+    Chaque étape est un callable remplaçable (mêmes signatures que les fonctions de src/),
+    ce qui permet de balayer des paramètres ou d'instrumenter une étape sans copier la boucle.
+    L'état passé aux gates porte le risque Gate 3 dans state["risk"] (RiskKillState),
+    et non plus en "equity_curve" / "consecutive_losses".
+
+    Args:
+        cfg: Configuration (schéma DEFAULT_BACKTEST_CONFIG)
+        asset: Actif des intents
+        warmup: Nombre de returns avant le premier pas de décision
+        seed: Si fourni, chaque pas simule avec un flux dérivé de (seed, t) → backtest reproductible
+        feature_fn: Remplace l'état incrémental par un calcul sur l'historique (returns[:t]) -> dict
+    """
+
+    def __init__(
+        self,
+        cfg: Optional[Dict[str, Any]] = None,
+        asset: str = "BTC",
+        warmup: int = 60,
+        seed: Optional[int] = None,
+        feature_fn: Optional[Callable[[np.ndarray], Dict[str, Any]]] = None,
+        simulate: Callable[..., Dict[str, Any]] = sim_lite_bootstrap,
+        score: Callable[..., float] = compute_score,
+        gate1: Callable = gate1_validate_intent,
+        gate2: Callable = gate2_x108_temporal,
+        gate3: Callable = gate3_risk_kill,
+        roi: Callable = roi_decide,
+        build_intent: Callable[..., Dict[str, Any]] = build_trade_intent,
+        execute: Callable = execute_dry,
+    ):
+        self.cfg = cfg or DEFAULT_BACKTEST_CONFIG
+        self.asset = asset
+        self.warmup = int(warmup)
+        self.seed = seed
+        self.feature_fn = feature_fn
+        self.simulate = simulate
+        self.score = score
+        self.gate1 = gate1
+        self.gate2 = gate2
+        self.gate3 = gate3
+        self.roi = roi
+        self.build_intent = build_intent
+        self.execute = execute
+
+    def _step_seed(self, t: int) -> Optional[int]:
+        if self.seed is None:
+            return None
+        return int(np.random.SeedSequence([self.seed, t]).generate_state(1)[0])
+
+    def run(self, returns: np.ndarray) -> BacktestResult:
+        cfg = self.cfg
+        returns = np.asarray(returns, dtype=float)
+        start = min(self.warmup, len(returns))
+        n = len(returns) - start
+
+        # Colonnes préallouées
+        cols: Dict[str, np.ndarray] = {
+            "step": np.arange(start, len(returns), dtype=np.int64),
+            "gate": np.zeros(n, dtype=np.int8),
+            "passed": np.zeros(n, dtype=bool),
+            "reason": np.full(n, "pass", dtype=object),
+            "side": np.full(n, "", dtype=object),
+            "amount": np.zeros(n),
+            "volatility": np.zeros(n),
+            "coherence": np.zeros(n),
+            "regime": np.full(n, "", dtype=object),
+            "p_dd": np.zeros(n),
+            "p_ruin": np.zeros(n),
+            "score": np.full(n, np.nan),
+            "roi_action": np.full(n, "", dtype=object),
+            "order_id": np.full(n, "", dtype=object),
+            "equity": np.zeros(n),
+        }
+
+        # risque Gate 3 incrémental (pic, drawdown, volatilité, pertes) : coût constant par pas
+        state = {
+            "last_invest_ts": 0.0,
+            "risk": RiskKillState(1.0, capacity=n + 1),
+            "cooldown_remaining": 0
+        }
+        roi = roi_init(cfg["roi"])
+        scores_window = deque(maxlen=100)
+        feat_state = IncrementalFeatureState()
+        feat_state.extend(returns[:start])
+        equity = 1.0
+        coherence_threshold = cfg["coherence_threshold"]
+
+        for i in range(n):
+            t = start + i
+            # cooldown decrement
+            if state["cooldown_remaining"] > 0:
+                state["cooldown_remaining"] -= 1
+
+            r_hist = returns[:t]
+            feats = self.feature_fn(r_hist) if self.feature_fn else feat_state.features()
+            projected = self.simulate(
+                r_hist,
+                n_sims=cfg["simulation"]["n_sims"],
+                horizon=cfg["simulation"]["horizon"],
+                bootstrap_window=cfg["simulation"]["bootstrap_window"],
+                dd_threshold=cfg["score"]["dd_threshold"],
+                seed=self._step_seed(t)
+            )
+            # l'état incrémental intègre returns[t] pour le pas suivant
+            feat_state.update(returns[t])
+
+            cols["volatility"][i] = feats["volatility"]
+            cols["coherence"][i] = feats["coherence"]
+            cols["regime"][i] = feats["regime"]
+            cols["p_dd"][i] = projected["p_dd"]
+            cols["p_ruin"][i] = projected["p_ruin"]
+            cols["equity"][i] = equity
+
+            # build candidate intent (BUY if coherence high, SELL if low; minimal)
+            side = "BUY" if feats["coherence"] >= coherence_threshold else "SELL"
+            amount = max(0.0, roi.risk_level)  # risk_level is position sizing proxy
+            intent_candidate = {
+                "asset": self.asset,
+                "side": side,
+                "amount": float(amount),
+                "timestamp": float(t),
+                "coherence": float(feats["coherence"]),
+            }
+            cols["side"][i] = side
+            cols["amount"][i] = amount
+
+            # Gate 1
+            ok1, r1 = self.gate1(intent_candidate)
+            if not ok1:
+                cols["gate"][i], cols["reason"][i] = 1, r1
+                continue
+
+            # Score
+            x_bonus = 1.0 if feats["coherence"] >= coherence_threshold else 0.0
+            S = self.score(projected, feats, x_bonus, cfg["score"]["weights"], cfg["score"]["dd_threshold"])
+            scores_window.append(S)
+            mean_score = float(np.mean(scores_window)) if scores_window else 0.0
+            cols["score"][i] = S
+
+            # Gate 2 (X-108 long horizon check)
+            ok2, r2 = self.gate2(state, float(t), cfg["hold_seconds"], float(feats["coherence"]), coherence_threshold)
+            if not ok2:
+                cols["gate"][i], cols["reason"][i] = 2, r2
+                continue
+
+            # Gate 3 (risk/kill) — Roi decides safe exit on kill triggers
+            ok3, r3 = self.gate3(state, r_hist, cfg["gate3"])
+            if not ok3:
+                cols["roi_action"][i] = self.roi(roi, t, mean_score, cfg["roi"], gate3_reason=r3)
+                cols["gate"][i], cols["reason"][i] = 3, r3
+                continue
+
+            # Roi sovereign decisions (rare)
+            roi_action = self.roi(roi, t, mean_score, cfg["roi"])
+            cols["roi_action"][i] = roi_action
+            if roi.safe_mode:
+                cols["gate"][i], cols["reason"][i] = GATE_ROI_SAFE, "roi_safe_mode"
+                continue
+
+            # Build ERC-8004 TradeIntent + execute (dry)
+            intent = self.build_intent(
+                asset=intent_candidate["asset"],
+                side=intent_candidate["side"],
+                amount=intent_candidate["amount"],
+                timestamp=float(t),
+                metadata={"score": S, "regime": feats["regime"]}
+            )
+            ok, info = self.execute(intent)
+            cols["order_id"][i] = info.get("order_id", "")
+
+            # Update investment timestamp for X-108 gate2 (investment-level action)
+            state["last_invest_ts"] = float(t)
+
+            # Update toy PnL / equity
+            step_ret = returns[t - 1]
+            signed = (1 if side == "BUY" else -1) * intent_candidate["amount"]
+            pnl = signed * step_ret
+            equity *= (1.0 + pnl)
+            state["risk"].record_trade(equity, pnl)
+
+            cols["passed"][i] = True
+            cols["gate"][i] = GATE_PASS
+            cols["equity"][i] = equity
+
+        return BacktestResult(columns=cols, final_equity=float(equity), config=cfg)
+
+def main():
+    ap = argparse.ArgumentParser(description="Backtest dry-run (sortie colonne unique).")
+    ap.add_argument("--csv", required=True)
+    ap.add_argument("--config", default=None, help="JSON config (défaut: DEFAULT_BACKTEST_CONFIG)")
+    ap.add_argument("--asset", default="BTC")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--out", default="logs/backtest.csv", help=".csv ou .npz")
+    args = ap.parse_args()
+
+    cfg = json.loads(Path(args.config).read_text(encoding="utf-8")) if args.config else None
+    _, returns = load_prices_csv(args.csv)
+    result = BacktestEngine(cfg, asset=args.asset, seed=args.seed).run(returns)
+    out = result.save(Path(args.out))
+    print(f"DONE. {len(result.columns['step'])} steps, final equity {result.final_equity:.6f} → {out}")
+
+if __name__ == "__main__":
+    main()
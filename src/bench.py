@@ -0,0 +1,309 @@
+"""Benchmarks du pipeline de gouvernance, avec baselines JSON et détection de régressions.
+
+Cas couverts : SIM-LITE (n_sims × horizon), extract_features, evaluate_gates (unitaire et
+en lot), métriques structurelles (compute_metrics, graphes de taille croissante), Sandbox OS0
+(interprété / compilé) et execute_scenario de bout en bout (store, traces et sans cache de
+résultats, dans un répertoire temporaire).
+
+    python -m src.bench run --out benchmarks/current.json
+    python -m src.bench compare benchmarks/baseline.json benchmarks/current.json
+    python -m src.bench run --compare benchmarks/baseline.json    # exécute puis compare
+
+compare sort avec le code 1 si un cas est plus lent que la baseline au-delà du seuil.
+"""
+import argparse
+import atexit
+import json
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core_pipeline import evaluate_gates, evaluate_gates_batch, simulation_verdict
+from src.features.features import extract_features
+from src.simulation.sim_lite import sim_lite_bootstrap
+from src.trace_writer import flush_traces
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+FORGE_SRC = BASE_DIR / "resources" / "proofs" / "X108_ADVANCED_TESTS_PACK" / "obsidia" / "forge_os01_x108_v1" / "src"
+DEFAULT_BASELINE = BASE_DIR / "benchmarks" / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+
+@dataclass
+class BenchCase:
+    """Un cas : `setup()` prépare les données et retourne la fonction mesurée (sans argument)."""
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    group: str
+
+class BenchSkipped(Exception):
+    """Cas non exécutable dans cet environnement (dépendance optionnelle absente)."""
+
+def _returns(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0.0, 0.01, n)
+
+def _fresh_state() -> Dict[str, Any]:
+    return {"last_invest_ts": 0.0, "equity_curve": [1.0], "consecutive_losses": 0, "cooldown_remaining": 0}
+
+def _intent() -> Dict[str, Any]:
+    return {"asset": "BTC", "side": "BUY", "amount": 100.0, "timestamp": time.time(), "coherence": 0.8}
+
+def _import_forge():
+    # les paquets OS0 / structural core vivent dans le pack forge (hors du paquet src)
+    if str(FORGE_SRC) not in sys.path:
+        sys.path.insert(0, str(FORGE_SRC))
+
+# --- cas ---
+
+def _sim_case(n_sims: int, horizon: int) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        returns = _returns(2000)
+        return lambda: sim_lite_bootstrap(returns, n_sims=n_sims, horizon=horizon, seed=7)
+    return setup
+
+def _features_case(n: int) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        returns = _returns(n)
+        return lambda: extract_features(returns)
+    return setup
+
+def _tmp_dir() -> Path:
+    """Répertoire temporaire (traces, store) supprimé à la sortie du process."""
+    tmp = tempfile.TemporaryDirectory(prefix="obsidia_bench_")
+
+    def cleanup():
+        flush_traces()  # les traces en attente ne doivent pas recréer le répertoire supprimé
+        tmp.cleanup()
+    atexit.register(cleanup)
+    return Path(tmp.name)
+
+def _gates_setup():
+    returns = _returns(2000)
+    features = extract_features(returns)
+    sim = sim_lite_bootstrap(returns, n_sims=100, horizon=10, seed=7)
+    sim["verdict"] = simulation_verdict(sim)
+    return returns, features, sim, _tmp_dir()
+
+def _gates_case():
+    returns, features, sim, base_dir = _gates_setup()
+    return lambda: evaluate_gates(_intent(), features, sim, 0.0, 10.0, _fresh_state(), returns, base_dir)
+
+def _gates_batch_case(n: int) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        returns, features, sim, base_dir = _gates_setup()
+        intents = [_intent() for _ in range(n)]
+        return lambda: evaluate_gates_batch(intents, features, sim, [_fresh_state() for _ in range(n)],
+                                            10.0, returns, base_dir, save=False)
+    return setup
+
+def _structural_case(n: int) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        _import_forge()
+        from obsidia_structural_core.metrics import compute_metrics
+        rng = np.random.default_rng(n)
+        W = rng.uniform(0.0, 1.0, (n, n))
+        W = np.triu(W, 1)
+        W = (W + W.T).tolist()
+        return lambda: compute_metrics(W)
+    return setup
+
+def _sandbox_case(iters: int, compiled: bool) -> Callable[[], Callable[[], Any]]:
+    def setup():
+        _import_forge()
+        from obsidia_os0.sandbox import Sandbox
+        from obsidia_os0.translate import python_like_to_ir
+        program = python_like_to_ir(
+            f"x = 0\ny = 0\nwhile x < {iters}:\n  y = y + 2\n  x = x + 1\n"
+        )
+        return lambda: Sandbox(compiled=compiled).run(program)
+    return setup
+
+def _scenario_env():
+    """Scénarios Proof + fabrique de ScenarioContext ; store et traces dans un répertoire temporaire."""
+    from src.data import open_price_store
+    from src.result_cache import configure_result_cache
+    from src.scenario_runner import ScenarioContext
+    from src.scenarios import load_scenarios
+    scenarios = load_scenarios(BASE_DIR, "trading")
+    if not scenarios:
+        raise BenchSkipped("no deterministic scenarios")
+    base_dir = _tmp_dir()
+    csv_path = str(BASE_DIR / "data" / "trading" / "BTC_1h.csv")
+    store_root = str(base_dir / "price_store")
+    # sans cache de résultats : chaque appel refait OS1 / OS2 au lieu de mesurer des hits
+    configure_result_cache(max_entries=0)
+
+    def open_context():
+        return ScenarioContext(open_price_store(csv_path, store_root).returns, base_dir=base_dir)
+    return scenarios, base_dir, open_context
+
+def _scenario_case():
+    from src.scenario_runner import execute_scenario
+    scenarios, base_dir, open_context = _scenario_env()
+    # un contexte par appel, comme execute_scenario(base_dir, sc) sans contexte
+    return lambda: [execute_scenario(base_dir, sc, open_context()) for sc in scenarios]
+
+def _scenario_batch_case():
+    scenarios, _, open_context = _scenario_env()
+
+    def run():
+        context = open_context()
+        return [context.execute(sc) for sc in scenarios]
+    return run
+
+def default_cases() -> List[BenchCase]:
+    cases = []
+    for n_sims, horizon in ((100, 10), (200, 20), (1000, 20), (1000, 100)):
+        cases.append(BenchCase(f"sim_lite_bootstrap[n_sims={n_sims},horizon={horizon}]", _sim_case(n_sims, horizon), "simulation"))
+    for n in (100, 1000, 10_000):
+        cases.append(BenchCase(f"extract_features[n={n}]", _features_case(n), "features"))
+    cases.append(BenchCase("evaluate_gates", _gates_case, "gates"))
+    for n in (100, 1000):
+        cases.append(BenchCase(f"evaluate_gates_batch[n={n}]", _gates_batch_case(n), "gates"))
+    for n in (8, 16, 32, 64):
+        cases.append(BenchCase(f"compute_metrics[n={n}]", _structural_case(n), "structural"))
+    for iters in (10, 100):
+        for compiled in (False, True):
+            mode = "compiled" if compiled else "interpreted"
+            cases.append(BenchCase(f"sandbox_run[loop={iters},{mode}]", _sandbox_case(iters, compiled), "sandbox"))
+    cases.append(BenchCase("execute_scenario[all_trading]", _scenario_case, "end_to_end"))
+    cases.append(BenchCase("scenario_context[all_trading]", _scenario_batch_case, "end_to_end"))
+    return cases
+
+# --- mesure ---
+
+def measure(fn: Callable[[], Any], repeat: int = 5, min_time: float = 0.05) -> Dict[str, Any]:
+    """Temps par appel : nombre de boucles calibré pour ~min_time par répétition, `repeat` répétitions."""
+    fn()  # échauffement (caches, imports paresseux)
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2 if dt <= 0 else max(2, min(10, int(min_time / dt) + 1))
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - t0) / loops)
+    return {"median_s": float(np.median(samples)), "min_s": float(min(samples)),
+            "max_s": float(max(samples)), "loops": loops, "repeat": repeat}
+
+def run_benchmarks(
+    cases: Optional[List[BenchCase]] = None,
+    filter_: Optional[str] = None,
+    repeat: int = 5,
+    min_time: float = 0.05,
+    log: Callable[[str], None] = print
+) -> Dict[str, Any]:
+    """Exécute les cas (filtrés par sous-chaîne de nom ou de groupe) et retourne le document JSON."""
+    results: Dict[str, Any] = {}
+    skipped: Dict[str, str] = {}
+    for case in cases or default_cases():
+        if filter_ and filter_ not in case.name and filter_ != case.group:
+            continue
+        try:
+            fn = case.setup()
+        except BenchSkipped as e:
+            skipped[case.name] = str(e)
+            log(f"SKIP {case.name}: {e}")
+            continue
+        res = measure(fn, repeat=repeat, min_time=min_time)
+        res["group"] = case.group
+        results[case.name] = res
+        log(f"{case.name:<50} {res['median_s'] * 1e6:>12.1f} us")
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            include_missing: bool = True) -> pd.DataFrame:
+    """
+    Compare les médianes cas par cas. ratio = courant / baseline ;
+    status = "regression" si ratio > 1 + threshold, "improved" si ratio < 1 / (1 + threshold).
+    include_missing=False ignore les cas de la baseline absents du courant (exécution filtrée).
+    """
+    base, cur = baseline.get("results", {}), current.get("results", {})
+    names = set(base) | set(cur) if include_missing else set(cur)
+    rows = []
+    for name in sorted(names):
+        b = base.get(name, {}).get("median_s")
+        c = cur.get(name, {}).get("median_s")
+        if b is None or c is None:
+            rows.append({"case": name, "baseline_us": b and b * 1e6, "current_us": c and c * 1e6,
+                         "ratio": np.nan, "status": "new" if b is None else "missing"})
+            continue
+        ratio = c / b if b > 0 else np.inf
+        status = "regression" if ratio > 1 + threshold else ("improved" if ratio < 1 / (1 + threshold) else "ok")
+        rows.append({"case": name, "baseline_us": b * 1e6, "current_us": c * 1e6, "ratio": ratio, "status": status})
+    return pd.DataFrame(rows, columns=["case", "baseline_us", "current_us", "ratio", "status"])
+
+def _load(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+def _save(doc: Dict[str, Any], path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(doc, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+def _report(table: pd.DataFrame) -> int:
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    regressions = table[table["status"] == "regression"]
+    if len(regressions):
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions['case'])}")
+        return 1
+    print("\nNo regression.")
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmarks du pipeline de gouvernance.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Exécute les benchmarks")
+    run_p.add_argument("--out", default=None, help="Écrit les résultats JSON (ex : benchmarks/current.json)")
+    run_p.add_argument("--filter", default=None, help="Sous-chaîne de nom ou groupe (simulation, gates...)")
+    run_p.add_argument("--repeat", type=int, default=5)
+    run_p.add_argument("--min-time", type=float, default=0.05, help="Durée minimale d'une répétition (s)")
+    run_p.add_argument("--compare", default=None, help="Baseline JSON à comparer après exécution")
+    run_p.add_argument("--update-baseline", action="store_true", help=f"Écrit les résultats dans {DEFAULT_BASELINE.relative_to(BASE_DIR)}")
+    run_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    cmp_p = sub.add_parser("compare", help="Compare deux fichiers de résultats")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="Ralentissement relatif toléré (0.25 = +25%%)")
+
+    args = ap.parse_args(argv)
+    if args.command == "compare":
+        return _report(compare(_load(args.baseline), _load(args.current), args.threshold))
+
+    doc = run_benchmarks(filter_=args.filter, repeat=args.repeat, min_time=args.min_time)
+    if args.out:
+        _save(doc, Path(args.out))
+    if args.update_baseline:
+        _save(doc, DEFAULT_BASELINE)
+    if args.compare:
+        return _report(compare(_load(args.compare), doc, args.threshold, include_missing=not args.filter))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,43 +1,93 @@
-"""Pipeline core qui orchestre features → simulation → gates → roi → intent."""
+"""Pipeline core qui orchestre features → simulation → gates → roi → intent.
+
+Les traces (artifacts + JSONL) de chaque étage passent par le writer asynchrone
+partagé de src.trace_writer ; appeler flush_traces() avant de relire les fichiers.
+La latence de chaque étage et de chaque gate, et les décisions par motif, sont
+enregistrées dans le registre partagé de src.instrumentation (get_instrumentation()).
+"""
 import time
+from collections import Counter
 import numpy as np
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 from src.features.features import extract_features
 from src.simulation.sim_lite import sim_lite_bootstrap
-from src.gates.gate1_integrity import gate1_validate_intent
+from src.gates.gate1_integrity import gate1_validate_intent, REQUIRED_FIELDS
 from src.gates.gate2_x108_temporal import gate2_x108_temporal
 from src.gates.gate3_risk_killswitch import gate3_risk_kill
 from src.roi_policy.roi import roi_decide, RoiState
 from src.execution.erc8004 import build_trade_intent
 from src.utils import save_artifact, log_jsonl
+from src.result_cache import get_result_cache, returns_digest
+from src.instrumentation import get_instrumentation
+
+# Seuils de gouvernance OS3 (partagés par evaluate_gates et evaluate_gates_batch)
+X108_COHERENCE_THRESHOLD = 0.3
+GATE3_CONFIG = {
+    "max_drawdown": 0.15,
+    "max_volatility": 0.50,
+    "max_consecutive_losses": 5,
+    "cooldown_steps": 10
+}
 
-def run_observation(returns: np.ndarray, base_dir: Path) -> Dict[str, Any]:
-    """OS1: Observation - Calcul des features."""
-    features = extract_features(returns)
+def run_observation(returns: np.ndarray, base_dir: Path, use_cache: bool = True) -> Dict[str, Any]:
+    """OS1: Observation - Calcul des features (mis en cache par contenu des returns)."""
+    t0 = time.perf_counter_ns()
+    cache = get_result_cache()
+    key = f"os1:{returns_digest(returns)}"
+    features = cache.get(key) if use_cache else None
+    cache_hit = features is not None
+    if not cache_hit:
+        features = extract_features(returns)
+        if use_cache:
+            cache.put(key, features)
     
     # Sauvegarder
     save_artifact(base_dir, "features.json", {"features": features})
     log_jsonl(base_dir, "decision_log", {
         "stage": "OS1",
         "event": "features_computed",
-        "features": features
+        "features": features,
+        "cache_hit": cache_hit
     })
+    get_instrumentation().record_ns("stage", time.perf_counter_ns() - t0, stage="os1_observation")
     
     return features
 
-def run_simulation(returns: np.ndarray, base_dir: Path, n_sims: int = 200, horizon: int = 20) -> Dict[str, Any]:
-    """OS2: Simulation - Projection Monte Carlo."""
-    sim_result = sim_lite_bootstrap(returns, n_sims=n_sims, horizon=horizon)
-    
-    # Verdict
+def simulation_verdict(sim_result: Dict[str, Any]) -> str:
+    """Verdict OS2 à partir des probabilités de ruine / drawdown."""
     if sim_result["p_ruin"] > 0.10 or sim_result["p_dd"] > 0.25:
-        sim_result["verdict"] = "DESTRUCTIVE"
-    elif sim_result["p_ruin"] > 0.05 or sim_result["p_dd"] > 0.15:
-        sim_result["verdict"] = "UNCERTAIN"
-    else:
-        sim_result["verdict"] = "OK"
+        return "DESTRUCTIVE"
+    if sim_result["p_ruin"] > 0.05 or sim_result["p_dd"] > 0.15:
+        return "UNCERTAIN"
+    return "OK"
+
+def run_simulation(
+    returns: np.ndarray,
+    base_dir: Path,
+    n_sims: int = 200,
+    horizon: int = 20,
+    seed: Optional[int] = None,
+    n_workers: int = 1,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """OS2: Simulation - Projection Monte Carlo (reproductible si `seed` est fourni).
+
+    Seules les simulations seedées sont mises en cache : sans seed, chaque appel
+    est un nouveau tirage.
+    """
+    t0 = time.perf_counter_ns()
+    cache = get_result_cache()
+    cacheable = use_cache and seed is not None
+    key = f"os2:{returns_digest(returns)}:{n_sims}:{horizon}:{seed}" if cacheable else ""
+    sim_result = cache.get(key) if cacheable else None
+    cache_hit = sim_result is not None
+    if not cache_hit:
+        sim_result = sim_lite_bootstrap(returns, n_sims=n_sims, horizon=horizon, seed=seed, n_workers=n_workers)
+        sim_result["verdict"] = simulation_verdict(sim_result)
+        if cacheable:
+            cache.put(key, sim_result)
     
     # Sauvegarder
     save_artifact(base_dir, "simulation.json", {"simulation": sim_result})
@@ -46,8 +96,10 @@ def run_simulation(returns: np.ndarray, base_dir: Path, n_sims: int = 200, horiz
         "event": "simulation_completed",
         "verdict": sim_result["verdict"],
         "p_ruin": sim_result["p_ruin"],
-        "p_dd": sim_result["p_dd"]
+        "p_dd": sim_result["p_dd"],
+        "cache_hit": cache_hit
     })
+    get_instrumentation().record_ns("stage", time.perf_counter_ns() - t0, stage="os2_simulation")
     
     return sim_result
 
@@ -59,13 +111,19 @@ def evaluate_gates(
     tau_seconds: float,
     state: Dict[str, Any],
     returns: np.ndarray,
-    base_dir: Path
+    base_dir: Path,
+    gate3_cfg: Optional[Dict[str, Any]] = None,
+    coherence_threshold: float = X108_COHERENCE_THRESHOLD
 ) -> Dict[str, Any]:
-    """OS3: Governance - Évaluation des gates."""
+    """OS3: Governance - Évaluation des gates (seuils par défaut : GATE3_CONFIG, X108_COHERENCE_THRESHOLD)."""
+    instr = get_instrumentation()
+    t0 = time.perf_counter_ns()
     now_ts = time.time()
     
     # Gate 1: Integrity
     g1_ok, g1_reason = gate1_validate_intent(intent)
+    t1 = time.perf_counter_ns()
+    instr.record_ns("gate", t1 - t0, gate="gate1")
     
     # Gate 2: X-108 Temporal
     g2_ok, g2_reason = gate2_x108_temporal(
@@ -73,17 +131,14 @@ def evaluate_gates(
         now_ts=now_ts,
         hold_seconds=tau_seconds,
         coherence=features.get("coherence", 0.0),
-        coherence_threshold=0.3
+        coherence_threshold=coherence_threshold
     )
+    t2 = time.perf_counter_ns()
+    instr.record_ns("gate", t2 - t1, gate="gate2")
     
     # Gate 3: Risk Killswitch
-    cfg_gate3 = {
-        "max_drawdown": 0.15,
-        "max_volatility": 0.50,
-        "max_consecutive_losses": 5,
-        "cooldown_steps": 10
-    }
-    g3_ok, g3_reason = gate3_risk_kill(state, returns, cfg_gate3)
+    g3_ok, g3_reason = gate3_risk_kill(state, returns, gate3_cfg or GATE3_CONFIG)
+    instr.record_ns("gate", time.perf_counter_ns() - t2, gate="gate3")
     
     # Composition: BLOCK > HOLD > ALLOW
     laws = []
@@ -128,39 +183,190 @@ def evaluate_gates(
         "decision": decision,
         "reason": reason
     })
+    instr.count("decisions", decision=decision, reason=reason)
+    instr.record_ns("stage", time.perf_counter_ns() - t0, stage="os3_gates")
     
     return gates_result
 
+def _broadcast(arg: Union[Dict[str, Any], List[Dict[str, Any]]], n: int, name: str) -> List[Dict[str, Any]]:
+    # un dict partagé → liste de n références au même dict (l'identité compte pour Gate 3)
+    if isinstance(arg, dict):
+        return [arg] * n
+    if len(arg) != n:
+        raise ValueError(f"{name} length {len(arg)} != intents length {n}")
+    return list(arg)
+
+def _gate1_batch(intents: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Gate 1 en colonnes : mêmes règles et même ordre de priorité que gate1_validate_intent."""
+    n = len(intents)
+    reasons = np.full(n, "pass", dtype=object)
+    missing = [[k for k in REQUIRED_FIELDS if k not in it] for it in intents]
+    has_all = np.array([not m for m in missing], dtype=bool)
+    for i in np.flatnonzero(~has_all):
+        reasons[i] = "invalid_intent_missing_fields:" + ",".join(missing[i])
+
+    side_ok = np.array([ok and it["side"] in ("BUY", "SELL") for ok, it in zip(has_all, intents)], dtype=bool)
+    amount = np.array([float(it["amount"]) if ok else np.nan for ok, it in zip(side_ok, intents)])
+    coherence = np.array([float(it["coherence"]) if ok else np.nan for ok, it in zip(side_ok, intents)])
+
+    bad_side = has_all & ~side_ok
+    bad_amount = side_ok & (amount <= 0)
+    bad_coherence = side_ok & ~bad_amount & ~((coherence >= 0.0) & (coherence <= 1.0))
+    reasons[bad_side] = "invalid_intent_side"
+    reasons[bad_amount] = "invalid_intent_amount"
+    reasons[bad_coherence] = "invalid_intent_coherence"
+    ok = side_ok & ~bad_amount & ~bad_coherence
+    return ok, reasons
+
+def _gate3_batch(states: List[Dict[str, Any]], returns: np.ndarray, cfg: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Gate 3 évalué une fois par état distinct, puis diffusé.
+
+    Reproduit des appels séquentiels : si un kill arme le cooldown d'un état partagé,
+    les intents suivants sur ce même état reçoivent "cooldown".
+    """
+    n = len(states)
+    ok = np.empty(n, dtype=bool)
+    reasons = np.empty(n, dtype=object)
+    seen: Dict[int, Tuple[bool, str]] = {}
+    for i, state in enumerate(states):
+        key = id(state)
+        if key not in seen:
+            seen[key] = gate3_risk_kill(state, returns, cfg)
+            ok[i], reasons[i] = seen[key]
+            if int(state.get("cooldown_remaining", 0)) > 0:
+                seen[key] = (False, "cooldown")
+        else:
+            ok[i], reasons[i] = seen[key]
+    return ok, reasons
+
+def evaluate_gates_batch(
+    intents: List[Dict[str, Any]],
+    features: Union[Dict[str, Any], List[Dict[str, Any]]],
+    sim_result: Union[Dict[str, Any], List[Dict[str, Any]]],
+    states: Union[Dict[str, Any], List[Dict[str, Any]]],
+    tau_seconds: float,
+    returns: np.ndarray,
+    base_dir: Path,
+    save: bool = True,
+    gate3_cfg: Optional[Dict[str, Any]] = None,
+    coherence_threshold: float = X108_COHERENCE_THRESHOLD
+) -> Dict[str, Any]:
+    """OS3: Governance en lot - évalue N intents candidats en colonnes.
+
+    `features`, `sim_result` et `states` sont soit partagés (un dict), soit des listes
+    alignées sur `intents`. Retourne un résultat colonne (tableaux numpy de longueur N)
+    avec la même composition BLOCK > HOLD > ALLOW que evaluate_gates, et écrit un seul artifact.
+    """
+    instr = get_instrumentation()
+    t0 = time.perf_counter_ns()
+    n = len(intents)
+    features, sim_result, states = (
+        _broadcast(arg, n, name) for arg, name in
+        ((features, "features"), (sim_result, "sim_result"), (states, "states"))
+    )
+    now_ts = time.time()
+
+    # Gate 1: Integrity
+    t1 = time.perf_counter_ns()
+    g1_ok, g1_reason = _gate1_batch(intents)
+    t2 = time.perf_counter_ns()
+    instr.record_ns("gate_batch", t2 - t1, gate="gate1")
+
+    # Gate 2: X-108 Temporal
+    last_ts = np.array([float(s.get("last_invest_ts", 0.0)) for s in states])
+    coherence = np.array([f.get("coherence", 0.0) for f in features], dtype=float)
+    in_hold = (now_ts - last_ts) < tau_seconds
+    low_coherence = coherence < coherence_threshold
+    g2_ok = ~in_hold & ~low_coherence
+    g2_reason = np.select([in_hold, low_coherence], ["x108_hold", "x108_low_coherence"], default="pass").astype(object)
+    t3 = time.perf_counter_ns()
+    instr.record_ns("gate_batch", t3 - t2, gate="gate2")
+
+    # Gate 3: Risk Killswitch
+    g3_ok, g3_reason = _gate3_batch(states, returns, gate3_cfg or GATE3_CONFIG)
+    instr.record_ns("gate_batch", time.perf_counter_ns() - t3, gate="gate3")
+
+    # Composition: BLOCK > HOLD > ALLOW
+    destructive = np.array([sr.get("verdict") == "DESTRUCTIVE" for sr in sim_result], dtype=bool)
+    conditions = [~g1_ok, ~g3_ok, ~g2_ok, destructive]
+    decision = np.select(conditions, ["BLOCK", "BLOCK", "HOLD", "BLOCK"], default="EXECUTE").astype(object)
+    reason = np.select(conditions, [g1_reason, g3_reason, g2_reason, "simulation_destructive"], default="pass").astype(object)
+    law = np.select(conditions, [
+        "Gate1: Integrity violation → D ⟂",
+        "Gate3: Risk killswitch → D ⟂",
+        f"X-108: T < τ ({tau_seconds}s) → D ⟂ (HOLD)",
+        "Simulation: destructive projection → D ⟂",
+    ], default="All gates PASS → action admissible").astype(object)
+
+    batch_result = {
+        "n": n,
+        "gate1_ok": g1_ok,
+        "gate1_reason": g1_reason,
+        "gate2_ok": g2_ok,
+        "gate2_reason": g2_reason,
+        "gate3_ok": g3_ok,
+        "gate3_reason": g3_reason,
+        "decision": decision,
+        "reason": reason,
+        "law": law
+    }
+
+    counts = {d: int(np.count_nonzero(decision == d)) for d in ("EXECUTE", "HOLD", "BLOCK")}
+    if save:
+        save_artifact(base_dir, "gates_batch.json", {
+            "intents": intents,
+            "gates": {k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in batch_result.items()},
+            "counts": counts
+        })
+        log_jsonl(base_dir, "roi_log", {
+            "stage": "OS3",
+            "event": "gates_batch_evaluated",
+            "n": n,
+            "counts": counts
+        })
+    if instr.enabled:
+        for (d, r), c in Counter(zip(decision.tolist(), reason.tolist())).items():
+            instr.count("decisions", c, decision=d, reason=r)
+    instr.record_ns("stage", time.perf_counter_ns() - t0, stage="os3_gates_batch")
+
+    return batch_result
+
 def emit_erc8004_intent(
     intent: Dict[str, Any],
     gates_result: Dict[str, Any],
     base_dir: Path
 ) -> Dict[str, Any]:
-    """Émet un TradeIntent ERC-8004 (paper)."""
-    if gates_result["decision"] != "EXECUTE":
-        return {"error": f"Intent not emitted. Decision = {gates_result['decision']}"}
-    
-    erc8004_intent = build_trade_intent(
-        asset=intent["asset"],
-        side=intent["side"],
-        amount=intent["amount"],
-        timestamp=intent["timestamp"],
-        metadata={
-            "gates": gates_result,
-            "run_ref": "last_run"
-        }
-    )
-    
-    # Sauvegarder
-    save_artifact(base_dir, "erc8004_intent.json", {
-        "erc8004": erc8004_intent
-    })
-    log_jsonl(base_dir, "intents_log", {
-        "stage": "OS3",
-        "event": "intent_emitted",
-        "asset": intent["asset"],
-        "side": intent["side"],
-        "amount": intent["amount"]
-    })
-    
-    return erc8004_intent
+    """Émet un TradeIntent ERC-8004 (paper) ; latence "stage" étiquetée par outcome (emitted / not_emitted / error)."""
+    t0 = time.perf_counter_ns()
+    outcome = "error"
+    try:
+        if gates_result["decision"] != "EXECUTE":
+            outcome = "not_emitted"
+            return {"error": f"Intent not emitted. Decision = {gates_result['decision']}"}
+        
+        erc8004_intent = build_trade_intent(
+            asset=intent["asset"],
+            side=intent["side"],
+            amount=intent["amount"],
+            timestamp=intent["timestamp"],
+            metadata={
+                "gates": gates_result,
+                "run_ref": "last_run"
+            }
+        )
+        
+        # Sauvegarder
+        save_artifact(base_dir, "erc8004_intent.json", {
+            "erc8004": erc8004_intent
+        })
+        log_jsonl(base_dir, "intents_log", {
+            "stage": "OS3",
+            "event": "intent_emitted",
+            "asset": intent["asset"],
+            "side": intent["side"],
+            "amount": intent["amount"]
+        })
+        outcome = "emitted"
+        return erc8004_intent
+    finally:
+        get_instrumentation().record_ns("stage", time.perf_counter_ns() - t0, stage="os3_emit_intent", outcome=outcome)
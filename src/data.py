@@ -1,7 +1,201 @@
+import hashlib
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 import pandas as pd
 import numpy as np
 
+# Store colonnaire : un fichier binaire brut par colonne, ouvert en np.memmap
+STORE_DIRNAME = ".price_store"
+STORE_VERSION = 1
+LOCK_FILENAME = ".build.lock"
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+_CHUNK_ROWS = 1_000_000
+
+@dataclass
+class PriceStore:
+    """Vue zero-copy (np.memmap, lecture seule) sur un CSV de prix converti."""
+    path: Path
+    manifest: dict
+    timestamp: np.ndarray           # int64, ns depuis epoch (ou index si pas de colonne timestamp)
+    close: np.ndarray               # float64
+    returns: np.ndarray             # float64, diff(close) / close[:-1]
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)  # open/high/low/volume si présents
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _source_stat(path: Path) -> dict:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def _store_dir(csv_path: Path, store_root: Optional[Path]) -> Path:
+    root = Path(store_root) if store_root else csv_path.parent / STORE_DIRNAME
+    return root / csv_path.stem
+
+@contextmanager
+def _build_lock(store: Path) -> Iterator[None]:
+    """Verrou exclusif inter-process sur la construction d'un store (bloquant)."""
+    store.mkdir(parents=True, exist_ok=True)
+    with open(store / LOCK_FILENAME, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+def build_price_store(path: str, store_root: Optional[str] = None) -> Path:
+    """Convertit (une fois) un CSV OHLCV en colonnes binaires + manifest ; retourne le répertoire du store."""
+    csv_path = Path(path)
+    out = _store_dir(csv_path, store_root)
+    with _build_lock(out):
+        _build_store(csv_path, out)
+    return out
+
+def _build_store(csv_path: Path, out: Path) -> None:
+    # appelé sous _build_lock ; noms temporaires propres au process en plus du verrou
+    suffix = f".{os.getpid()}.{uuid.uuid4().hex}.tmp"
+    tmp: Dict[str, Path] = {}
+    files = {}
+    try:
+        src_hash = _file_sha256(csv_path)
+        n_rows = 0
+        for chunk in pd.read_csv(csv_path, chunksize=_CHUNK_ROWS):
+            # expects at least a 'close' column; if not present, uses last column
+            cols = {c: chunk[c].astype(float).values for c in PRICE_COLUMNS if c in chunk.columns}
+            if "close" not in cols:
+                cols["close"] = chunk.iloc[:, -1].astype(float).values
+            if "timestamp" in chunk.columns:
+                ts = pd.to_datetime(chunk["timestamp"]).values.astype("datetime64[ns]").astype(np.int64)
+            else:
+                ts = np.arange(n_rows, n_rows + len(chunk), dtype=np.int64)
+            cols["timestamp"] = ts
+            for name, arr in cols.items():
+                if name not in files:
+                    tmp[name] = out / f"{name}.bin{suffix}"
+                    files[name] = open(tmp[name], "wb")
+                np.ascontiguousarray(arr, dtype=np.int64 if name == "timestamp" else np.float64).tofile(files[name])
+            n_rows += len(chunk)
+        for f in files.values():
+            f.close()
+        for name in files:
+            os.replace(tmp[name], out / f"{name}.bin")
+
+        # returns précalculés par blocs (mémoire constante)
+        close = np.memmap(out / "close.bin", dtype=np.float64, mode="r", shape=(n_rows,)) if n_rows else np.zeros(0)
+        tmp["returns"] = out / f"returns.bin{suffix}"
+        with open(tmp["returns"], "wb") as f:
+            for start in range(0, max(n_rows - 1, 0), _CHUNK_ROWS):
+                block = close[start:start + _CHUNK_ROWS + 1]
+                (np.diff(block) / block[:-1]).tofile(f)
+        os.replace(tmp["returns"], out / "returns.bin")
+
+        manifest = {
+            "version": STORE_VERSION,
+            "source": str(csv_path.resolve()),
+            "source_sha256": src_hash,
+            "source_stat": _source_stat(csv_path),
+            "n_rows": n_rows,
+            "columns": {name: ("int64" if name == "timestamp" else "float64") for name in files},
+        }
+        # écrit en dernier et atomiquement : un manifest lisible implique des colonnes complètes
+        _write_atomic(out / "manifest.json", json.dumps(manifest, indent=2).encode("utf-8"))
+    finally:
+        for f in files.values():
+            f.close()
+        for t in tmp.values():
+            t.unlink(missing_ok=True)
+
+def _read_manifest(store: Path) -> Optional[dict]:
+    """Manifest du store, ou None si absent ou illisible (store à reconstruire)."""
+    mpath = store / "manifest.json"
+    try:
+        manifest = json.loads(mpath.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or "n_rows" not in manifest or "columns" not in manifest:
+        return None
+    return manifest
+
+def _is_fresh(manifest: Optional[dict], csv_path: Path) -> bool:
+    if not manifest or manifest.get("version") != STORE_VERSION:
+        return False
+    # (taille, mtime) inchangés : pas besoin de re-hasher la source
+    if manifest.get("source_stat") == _source_stat(csv_path):
+        return True
+    return manifest.get("source_sha256") == _file_sha256(csv_path)
+
+def open_price_store(path: str, store_root: Optional[str] = None) -> PriceStore:
+    """Ouvre le store colonnaire d'un CSV (le construit si absent ou si la source a changé)."""
+    csv_path = Path(path)
+    store = _store_dir(csv_path, store_root)
+    manifest = _read_manifest(store)
+    if not _is_fresh(manifest, csv_path):
+        with _build_lock(store):
+            # un autre process a pu construire le store pendant l'attente du verrou
+            manifest = _read_manifest(store)
+            if not _is_fresh(manifest, csv_path):
+                _build_store(csv_path, store)
+                manifest = _read_manifest(store)
+
+    n = int(manifest["n_rows"])
+
+    def _map(name: str, dtype, length: int) -> np.ndarray:
+        if length <= 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(store / f"{name}.bin", dtype=dtype, mode="r", shape=(length,))
+
+    extra = {c: _map(c, np.float64, n) for c in manifest["columns"] if c not in ("close", "timestamp")}
+    return PriceStore(
+        path=store,
+        manifest=manifest,
+        timestamp=_map("timestamp", np.int64, n),
+        close=_map("close", np.float64, n),
+        returns=_map("returns", np.float64, n - 1),
+        columns=extra,
+    )
+
 def load_prices_csv(path: str):
+    try:
+        store = open_price_store(path)
+        return store.close, store.returns
+    except (OSError, ValueError):
+        # store non inscriptible (déploiement en lecture seule) ou endommagé : parse direct
+        pass
     df = pd.read_csv(path)
     # expects at least a 'close' column; if not present, uses last column
     if "close" not in df.columns:
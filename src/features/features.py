@@ -35,3 +35,87 @@ def extract_features(returns: np.ndarray) -> dict:
         "friction": friction_from_vol(vol),
         "regime": regime_from_returns(returns, 50),
     }
+
+class RollingMoments:
+    """Moyenne/écart-type sur fenêtre glissante, mis à jour en O(1) (Welford glissant)."""
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self.buf = np.zeros(self.window)
+        self.count = 0
+        self.pos = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._since_resync = 0
+
+    def push(self, x: float) -> None:
+        x = float(x)
+        if self.count < self.window:
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+        else:
+            old = self.buf[self.pos]
+            new_mean = self.mean + (x - old) / self.window
+            self.m2 += (x - old) * (x - new_mean + old - self.mean)
+            self.mean = new_mean
+        self.buf[self.pos] = x
+        self.pos = (self.pos + 1) % self.window
+        # resynchronisation exacte une fois par fenêtre : borne la dérive numérique (O(1) amorti)
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            w = self.buf[:self.count]
+            self.mean = float(np.mean(w))
+            self.m2 = float(np.var(w)) * self.count
+            self._since_resync = 0
+
+    def std(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return float(np.sqrt(max(self.m2, 0.0) / self.count))
+
+    def values(self) -> np.ndarray:
+        """Fenêtre courante, de la plus ancienne à la plus récente valeur."""
+        if self.count < self.window:
+            return self.buf[:self.count]
+        return np.concatenate((self.buf[self.pos:], self.buf[:self.pos]))
+
+class IncrementalFeatureState:
+    """Équivalent streaming de extract_features : une mise à jour O(1) par nouveau return.
+
+    features() renvoie le même dict que extract_features(returns[:t]) (aux arrondis flottants près).
+    """
+
+    def __init__(self, vol_window: int = 20, regime_window: int = 50):
+        self._vol = RollingMoments(vol_window)
+        self._regime = RollingMoments(regime_window)
+        self.n = 0
+
+    def update(self, r: float) -> None:
+        self._vol.push(r)
+        self._regime.push(r)
+        self.n += 1
+
+    def extend(self, returns: np.ndarray) -> None:
+        for r in returns:
+            self.update(r)
+
+    def regime(self) -> str:
+        if self.n < 2:
+            return "unknown"
+        z = self._regime.mean / (self._regime.std() + 1e-12)
+        if z > 0.2:
+            return "trend_up"
+        if z < -0.2:
+            return "trend_down"
+        return "range"
+
+    def features(self) -> dict:
+        vol = self._vol.std()
+        return {
+            "volatility": vol,
+            "coherence": coherence_from_vol(vol),
+            "friction": friction_from_vol(vol),
+            "regime": self.regime(),
+        }
@@ -1,5 +1,9 @@
+from typing import Optional, Sequence
+
 import numpy as np
 
+from src.features.features import RollingMoments
+
 def compute_drawdown(equity_curve):
     peak = equity_curve[0] if len(equity_curve) else 1.0
     max_dd = 0.0
@@ -9,13 +13,118 @@ def compute_drawdown(equity_curve):
         max_dd = max(max_dd, float(dd))
     return float(max_dd)
 
+class RiskKillState:
+    """État de risque Gate 3 mis à jour en O(1) : pic, drawdown, volatilité glissante, pertes consécutives.
+
+    Remplace le recalcul de compute_drawdown sur toute la courbe d'équité à chaque pas.
+    À placer dans l'état des gates sous la clé "risk" : gate3_risk_kill l'utilise alors à la
+    place de "equity_curve" / "consecutive_losses".
+
+    Args:
+        initial_equity: Premier point de la courbe d'équité
+        vol_window: Fenêtre de la volatilité (comme np.std(returns[-50:]))
+        capacity: Taille initiale du tableau d'équité (doublé quand il est plein)
+    """
+
+    def __init__(self, initial_equity: float = 1.0, vol_window: int = 50, capacity: int = 1024):
+        self._equity = np.empty(max(1, int(capacity)))
+        self._n = 0
+        self.peak = float(initial_equity)
+        self.current_drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.consecutive_losses = 0
+        self._vol = RollingMoments(vol_window)
+        self._returns_seen = 0
+        self.push_equity(initial_equity)
+
+    @classmethod
+    def from_equity_curve(cls, equity_curve: Sequence[float], consecutive_losses: int = 0,
+                          vol_window: int = 50) -> "RiskKillState":
+        """Reprend un état dict existant ({"equity_curve": [...], "consecutive_losses": n})."""
+        curve = list(equity_curve) or [1.0]
+        state = cls(curve[0], vol_window=vol_window, capacity=2 * len(curve))
+        for v in curve[1:]:
+            state.push_equity(v)
+        state.consecutive_losses = int(consecutive_losses)
+        return state
+
+    # --- équité ---
+
+    def push_equity(self, equity: float) -> None:
+        """Ajoute un point de la courbe d'équité (mêmes opérations que compute_drawdown)."""
+        equity = float(equity)
+        if self._n == len(self._equity):
+            grown = np.empty(2 * len(self._equity))
+            grown[:self._n] = self._equity[:self._n]
+            self._equity = grown
+        self._equity[self._n] = equity
+        self._n += 1
+        self.peak = max(self.peak, equity)
+        self.current_drawdown = float(1.0 - equity / self.peak)
+        self.max_drawdown = max(self.max_drawdown, self.current_drawdown)
+
+    def record_trade(self, equity: float, pnl: float) -> None:
+        """Équité après un trade exécuté + compteur de pertes consécutives."""
+        self.push_equity(equity)
+        self.consecutive_losses = self.consecutive_losses + 1 if pnl < 0 else 0
+
+    @property
+    def equity_curve(self) -> np.ndarray:
+        return self._equity[:self._n]
+
+    # --- volatilité ---
+
+    def push_return(self, r: float) -> None:
+        self._vol.push(r)
+        self._returns_seen += 1
+
+    def sync_returns(self, returns: np.ndarray) -> None:
+        """Intègre la partie nouvelle de l'historique `returns`.
+
+        Si `returns` ne prolonge pas l'historique déjà vu (nouveau replay, fenêtre glissante de
+        taille fixe...), la volatilité repart de sa dernière fenêtre.
+        """
+        n = len(returns)
+        seen = self._returns_seen
+        if n < seen or not np.array_equal(returns[seen - self._vol.count:seen], self._vol.values()):
+            self._vol = RollingMoments(self._vol.window)
+            seen = self._returns_seen = max(0, n - self._vol.window)
+        for r in returns[seen:n]:
+            self.push_return(r)
+
+    def volatility(self) -> float:
+        return self._vol.std()
+
+    # --- gate ---
+
+    def check(self, cfg: dict) -> Optional[str]:
+        """Motif de kill ("kill_drawdown" / "kill_volatility" / "kill_losses") ou None."""
+        if self.max_drawdown >= float(cfg["max_drawdown"]):
+            return "kill_drawdown"
+        if self.volatility() >= float(cfg["max_volatility"]):
+            return "kill_volatility"
+        if self.consecutive_losses >= int(cfg["max_consecutive_losses"]):
+            return "kill_losses"
+        return None
+
 def gate3_risk_kill(state: dict, returns: np.ndarray, cfg: dict):
     # drawdown/vol/consecutive loss based kill
+    cooldown = int(state.get("cooldown_remaining", 0))
+    risk = state.get("risk")
+    if isinstance(risk, RiskKillState):
+        if cooldown > 0:
+            return False, "cooldown"
+        risk.sync_returns(returns)
+        kill = risk.check(cfg)
+        if kill is None:
+            return True, "pass"
+        state["cooldown_remaining"] = int(cfg["cooldown_steps"])
+        return False, kill
+
     equity = state.get("equity_curve", [1.0])
     dd = compute_drawdown(equity)
     vol = float(np.std(returns[-50:])) if len(returns) else 0.0
     consec_losses = int(state.get("consecutive_losses", 0))
-    cooldown = int(state.get("cooldown_remaining", 0))
 
     if cooldown > 0:
         return False, "cooldown"
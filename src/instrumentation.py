@@ -0,0 +1,258 @@
+"""Instrumentation du pipeline : histogrammes de latence par étage / gate et compteurs de décisions.
+
+Les latences sont gardées dans des histogrammes log-linéaires façon HDR (coût fixe par mesure,
+mémoire bornée, erreur relative < 1/32). Un instantané est disponible à tout moment
+(snapshot) et peut être écrit en JSONL ou au format texte Prometheus, ponctuellement
+ou périodiquement via le writer de traces partagé.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.trace_writer import get_trace_writer
+
+DUMP_FORMATS = ("jsonl", "prometheus")
+QUANTILES = (0.5, 0.9, 0.99)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class LatencyHistogram:
+    """
+    Histogramme de latences en nanosecondes, seaux log-linéaires (HDR).
+
+    Les valeurs < 2^(SUB_BITS+1) ns sont exactes ; au-delà, chaque puissance de 2 est
+    découpée en 2^SUB_BITS seaux, soit une erreur relative < 2^-SUB_BITS.
+    """
+
+    SUB_BITS = 5
+
+    def __init__(self):
+        self.counts: List[int] = [0] * ((64 - self.SUB_BITS + 1) << self.SUB_BITS)
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns = 0
+
+    def _index(self, ns: int) -> int:
+        shift = ns.bit_length() - (self.SUB_BITS + 1)
+        if shift <= 0:
+            return ns
+        return (shift << self.SUB_BITS) + (ns >> shift)
+
+    def _upper(self, idx: int) -> int:
+        if idx < (2 << self.SUB_BITS):
+            return idx
+        shift = (idx >> self.SUB_BITS) - 1
+        sub = idx - (shift << self.SUB_BITS)
+        return ((sub + 1) << shift) - 1
+
+    def record_ns(self, ns: int) -> None:
+        ns = max(0, int(ns))
+        self.counts[self._index(ns)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def quantile_ns(self, q: float) -> int:
+        """Borne haute du seau contenant le quantile q (plafonnée au max observé)."""
+        if self.count == 0:
+            return 0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            if c:
+                seen += c
+                if seen >= rank:
+                    return min(self._upper(idx), self.max_ns)
+        return self.max_ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for idx, c in enumerate(other.counts):
+            if c:
+                self.counts[idx] += c
+        self.count += other.count
+        self.total_ns += other.total_ns
+        if other.min_ns is not None and (self.min_ns is None or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def summary(self) -> Dict[str, Any]:
+        """Résumé en secondes : count, mean, min, max, p50/p90/p99."""
+        out: Dict[str, Any] = {
+            "count": self.count,
+            "mean": self.total_ns / self.count / 1e9 if self.count else 0.0,
+            "min": (self.min_ns or 0) / 1e9,
+            "max": self.max_ns / 1e9,
+        }
+        for q in QUANTILES:
+            out[f"p{int(q * 100)}"] = self.quantile_ns(q) / 1e9
+        return out
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+def _prom_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _prom_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = key + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_prom_escape(v)}"' for k, v in items) + "}"
+
+class Instrumentation:
+    """
+    Registre thread-safe de latences et de compteurs, avec étiquettes.
+
+    - record / timer : latence d'une métrique (ex : "stage" avec stage="os2_simulation")
+    - count : compteur (ex : "decisions" avec decision="BLOCK", reason="kill_drawdown")
+
+    Args:
+        enabled: False = toutes les mesures sont ignorées (coût d'un test de booléen)
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._hist: Dict[Tuple[str, LabelKey], LatencyHistogram] = {}
+        self._counts: Dict[Tuple[str, LabelKey], int] = {}
+        self._keys: Dict[Tuple[str, tuple], Tuple[str, LabelKey]] = {}
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._dump_stop: Optional[threading.Event] = None
+        self._dump_thread: Optional[threading.Thread] = None
+
+    # --- mesures ---
+
+    def record(self, metric: str, seconds: float, **labels: Any) -> None:
+        self.record_ns(metric, int(seconds * 1e9), **labels)
+
+    def record_ns(self, metric: str, ns: int, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = self._key(metric, labels)
+        with self._lock:
+            hist = self._hist.get(key)
+            if hist is None:
+                hist = self._hist[key] = LatencyHistogram()
+            hist.record_ns(ns)
+
+    @contextmanager
+    def timer(self, metric: str, **labels: Any) -> Iterator[None]:
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record_ns(metric, time.perf_counter_ns() - t0, **labels)
+
+    def count(self, metric: str, n: int = 1, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = self._key(metric, labels)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + int(n)
+
+    def _key(self, metric: str, labels: Dict[str, Any]) -> Tuple[str, LabelKey]:
+        # clé normalisée (étiquettes triées, en str) mémorisée par ordre d'appel
+        raw = (metric, tuple(labels.items()))
+        key = self._keys.get(raw)
+        if key is None:
+            key = self._keys[raw] = (metric, _label_key(labels))
+        return key
+
+    # --- lecture ---
+
+    def histogram(self, metric: str, **labels: Any) -> Optional[LatencyHistogram]:
+        with self._lock:
+            return self._hist.get((metric, _label_key(labels)))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Instantané JSON-sérialisable : latences (secondes) et compteurs par métrique et étiquettes."""
+        with self._lock:
+            latency = [{"metric": m, "labels": dict(k), **h.summary()} for (m, k), h in sorted(self._hist.items())]
+            counts = [{"metric": m, "labels": dict(k), "value": v} for (m, k), v in sorted(self._counts.items())]
+        return {"ts": time.time(), "since": self._started, "latency": latency, "counts": counts}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hist.clear()
+            self._counts.clear()
+            self._started = time.time()
+
+    def to_prometheus(self, prefix: str = "obsidia") -> str:
+        """Texte d'exposition Prometheus : une summary par latence, un counter par compteur."""
+        with self._lock:
+            hists = sorted(self._hist.items())
+            counts = sorted(self._counts.items())
+            summaries = [(m, k, h.summary(), h.total_ns / 1e9) for (m, k), h in hists]
+        lines: List[str] = []
+        typed = set()
+        for metric, key, s, total in summaries:
+            name = f"{prefix}_{metric}_latency_seconds"
+            if name not in typed:
+                lines.append(f"# TYPE {name} summary")
+                typed.add(name)
+            for q in QUANTILES:
+                lines.append(f"{name}{_prom_labels(key, (('quantile', str(q)),))} {s[f'p{int(q * 100)}']:.9g}")
+            lines.append(f"{name}_sum{_prom_labels(key)} {total:.9g}")
+            lines.append(f"{name}_count{_prom_labels(key)} {s['count']}")
+        for (metric, key), value in counts:
+            name = f"{prefix}_{metric}_total"
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_prom_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    # --- export ---
+
+    def dump(self, path: Path, fmt: str = "jsonl") -> None:
+        """Écrit l'instantané : ajout d'une ligne (jsonl) ou remplacement du fichier (prometheus)."""
+        if fmt not in DUMP_FORMATS:
+            raise ValueError(f"fmt must be one of {DUMP_FORMATS}, got {fmt!r}")
+        writer = get_trace_writer()
+        if fmt == "jsonl":
+            writer.append_line(Path(path), json.dumps(self.snapshot(), ensure_ascii=False))
+        else:
+            writer.write_file(Path(path), self.to_prometheus())
+
+    def start_periodic_dump(self, path: Path, interval_s: float = 60.0, fmt: str = "jsonl") -> None:
+        """Lance (ou relance) un dump périodique dans un thread de fond."""
+        if fmt not in DUMP_FORMATS:
+            raise ValueError(f"fmt must be one of {DUMP_FORMATS}, got {fmt!r}")
+        self.stop_periodic_dump()
+        stop = threading.Event()
+
+        def _loop() -> None:
+            while not stop.wait(interval_s):
+                self.dump(path, fmt)
+
+        self._dump_stop = stop
+        self._dump_thread = threading.Thread(target=_loop, name="obsidia-instrumentation-dump", daemon=True)
+        self._dump_thread.start()
+
+    def stop_periodic_dump(self) -> None:
+        if self._dump_stop is not None:
+            self._dump_stop.set()
+            self._dump_thread.join()
+            self._dump_stop = self._dump_thread = None
+
+_instrumentation = Instrumentation()
+_instrumentation_lock = threading.Lock()
+
+def get_instrumentation() -> Instrumentation:
+    """Retourne le registre partagé du process."""
+    return _instrumentation
+
+def configure_instrumentation(enabled: bool = True) -> Instrumentation:
+    """Remplace le registre partagé (enabled=False coupe toute mesure)."""
+    global _instrumentation
+    with _instrumentation_lock:
+        _instrumentation.stop_periodic_dump()
+        _instrumentation = Instrumentation(enabled=enabled)
+    return _instrumentation
@@ -0,0 +1,125 @@
+"""Cache de résultats OS1/OS2 partagé par le process (LRU borné + tier disque optionnel)."""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+def returns_digest(returns: np.ndarray) -> str:
+    """Hash de contenu d'un tableau de returns (indépendant de son origine : CSV, memmap, slice)."""
+    arr = np.ascontiguousarray(returns, dtype=np.float64)
+    h = hashlib.sha256()
+    h.update(str(arr.shape).encode("utf-8"))
+    h.update(arr.tobytes())
+    return h.hexdigest()
+
+class ResultCache:
+    """
+    Cache LRU thread-safe de dicts JSON-sérialisables.
+
+    Args:
+        max_entries: Nombre maximal d'entrées gardées en mémoire
+        disk_dir: Répertoire du tier disque (None = mémoire seule)
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[Path] = None):
+        self.max_entries = int(max_entries)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._data: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retourne une copie de la valeur en cache, ou None."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return dict(value)
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store(key, value)
+        return dict(value)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        value = dict(value)
+        with self._lock:
+            self._store(key, value)
+        self._disk_put(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.disk_hits = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses, "disk_hits": self.disk_hits}
+
+    def _store(self, key: str, value: Dict[str, Any]) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        # protège contre une collision de nom de fichier
+        return entry.get("value") if entry.get("key") == key else None
+
+    def _disk_put(self, key: str, value: Dict[str, Any]) -> None:
+        if self.disk_dir is None:
+            return
+        tmp = None
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(key)
+            # fichier temporaire unique : deux writers (threads ou process) ne se marchent pas dessus
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.disk_dir, prefix=path.stem,
+                                             suffix=".tmp", delete=False) as f:
+                tmp = f.name
+                f.write(json.dumps({"key": key, "value": value}, ensure_ascii=False))
+            os.replace(tmp, path)
+        except OSError:
+            # le tier disque est une optimisation : un échec d'écriture n'est pas bloquant
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+_cache = ResultCache()
+_cache_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    """Retourne le cache partagé du process."""
+    return _cache
+
+def configure_result_cache(max_entries: int = 256, disk_dir: Optional[Path] = None) -> ResultCache:
+    """Remplace le cache partagé (ex : activer le tier disque sous traces/cache)."""
+    global _cache
+    with _cache_lock:
+        _cache = ResultCache(max_entries=max_entries, disk_dir=disk_dir)
+    return _cache
@@ -1,6 +1,110 @@
 """Générateur de scénarios non-déterministes pour exploration."""
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List
+
 import numpy as np
-from typing import Dict, Any, List
+import pandas as pd
+
+# Paramètres par régime, dans l'ordre de tirage de generate_random_scenario :
+# (régime, préfixe d'id, nom, description, volatility, coherence, friction, side (None = tiré),
+#  amount, décision attendue, motif attendu) — source des méthodes generate_* et de
+#  generate_batch_columns
+_REGIME_SPECS = (
+    ("crash", "crash", "Market Crash", "Extreme volatility with rapid price decline",
+     (0.45, 0.70), (0.10, 0.30), (0.50, 0.80), "SELL", (500, 5000),
+     "BLOCK", "High volatility + Low coherence"),
+    ("bull", "bull", "Bull Market", "Strong uptrend with high confidence",
+     (0.05, 0.15), (0.70, 0.90), (0.05, 0.15), "BUY", (100, 1000),
+     "EXECUTE", "Favorable conditions"),
+    ("range", "range", "Range-Bound Market", "Sideways movement with mixed signals",
+     (0.20, 0.35), (0.35, 0.55), (0.25, 0.40), None, (200, 800),
+     "HOLD", "Uncertain conditions, X-108 required"),
+    ("pump", "pump", "Pump (Rapid Rise)", "Sudden price surge with high volatility",
+     (0.40, 0.60), (0.20, 0.40), (0.30, 0.50), "BUY", (1000, 3000),
+     "BLOCK", "High volatility despite upward movement"),
+    ("bear", "bear", "Bear Market", "Sustained downtrend with moderate volatility",
+     (0.25, 0.40), (0.50, 0.70), (0.20, 0.35), "SELL", (300, 1500),
+     "HOLD", "Bearish trend, X-108 recommended"),
+)
+
+_SPEC_BY_REGIME = {spec[0]: spec for spec in _REGIME_SPECS}
+
+def _spec_column(i: int, dtype=None) -> np.ndarray:
+    return np.array([spec[i] for spec in _REGIME_SPECS], dtype=dtype)
+
+@dataclass
+class ScenarioBatch:
+    """
+    Lot de scénarios en colonnes (un tableau par champ, une ligne par scénario).
+
+    Les dicts au format generate_* ne sont construits qu'à la demande :
+    batch[i], itération, to_dicts() ; to_frame() donne une table pandas.
+    """
+    regime_index: np.ndarray
+    id_number: np.ndarray
+    volatility: np.ndarray
+    coherence: np.ndarray
+    friction: np.ndarray
+    asset: np.ndarray
+    side: np.ndarray
+    amount: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.regime_index)
+
+    @property
+    def regime(self) -> np.ndarray:
+        return _spec_column(0, object)[self.regime_index]
+
+    @property
+    def ids(self) -> np.ndarray:
+        prefixes = _spec_column(1, object)[self.regime_index]
+        return prefixes + "_" + self.id_number.astype(str).astype(object)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        (regime, prefix, name, description, _, _, _, _, _, expected_decision, expected_reason) = _REGIME_SPECS[self.regime_index[i]]
+        return {
+            "id": f"{prefix}_{self.id_number[i]}",
+            "name": name,
+            "description": description,
+            "market_conditions": {
+                "volatility": float(self.volatility[i]),
+                "coherence": float(self.coherence[i]),
+                "friction": float(self.friction[i]),
+                "regime": regime
+            },
+            "intent": {
+                "asset": str(self.asset[i]),
+                "side": str(self.side[i]),
+                "amount": float(self.amount[i]),
+                "irreversible": True
+            },
+            "expected_decision": expected_decision,
+            "expected_reason": expected_reason
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def to_frame(self) -> pd.DataFrame:
+        idx = self.regime_index
+        return pd.DataFrame({
+            "id": self.ids,
+            "regime": self.regime,
+            "volatility": self.volatility,
+            "coherence": self.coherence,
+            "friction": self.friction,
+            "asset": self.asset,
+            "side": self.side,
+            "amount": self.amount,
+            "irreversible": np.ones(len(self), dtype=bool),
+            "expected_decision": _spec_column(9, object)[idx],
+            "expected_reason": _spec_column(10, object)[idx],
+        })
 
 class ScenarioGenerator:
     """Génère des scénarios de marché aléatoires mais réalistes."""
@@ -13,115 +117,49 @@ class ScenarioGenerator:
         """Initialise le générateur avec une seed optionnelle."""
         self.rng = np.random.RandomState(seed)
     
-    def generate_market_crash(self) -> Dict[str, Any]:
-        """Génère un scénario de crash de marché."""
+    def _generate_regime(self, regime: str) -> Dict[str, Any]:
+        """Scénario d'un régime de _REGIME_SPECS (tirages : id, conditions, actif, sens, montant)."""
+        (_, prefix, name, description, volatility, coherence, friction, side, amount,
+         expected_decision, expected_reason) = _SPEC_BY_REGIME[regime]
         return {
-            "id": f"crash_{self.rng.randint(1000, 9999)}",
-            "name": "Market Crash",
-            "description": "Extreme volatility with rapid price decline",
+            "id": f"{prefix}_{self.rng.randint(1000, 9999)}",
+            "name": name,
+            "description": description,
             "market_conditions": {
-                "volatility": self.rng.uniform(0.45, 0.70),
-                "coherence": self.rng.uniform(0.10, 0.30),
-                "friction": self.rng.uniform(0.50, 0.80),
-                "regime": "crash"
+                "volatility": self.rng.uniform(*volatility),
+                "coherence": self.rng.uniform(*coherence),
+                "friction": self.rng.uniform(*friction),
+                "regime": regime
             },
             "intent": {
                 "asset": self.rng.choice(self.ASSETS),
-                "side": "SELL",
-                "amount": self.rng.uniform(500, 5000),
+                "side": side if side is not None else self.rng.choice(self.SIDES),
+                "amount": self.rng.uniform(*amount),
                 "irreversible": True
             },
-            "expected_decision": "BLOCK",
-            "expected_reason": "High volatility + Low coherence"
+            "expected_decision": expected_decision,
+            "expected_reason": expected_reason
         }
     
+    def generate_market_crash(self) -> Dict[str, Any]:
+        """Génère un scénario de crash de marché."""
+        return self._generate_regime("crash")
+    
     def generate_bull_market(self) -> Dict[str, Any]:
         """Génère un scénario de marché haussier."""
-        return {
-            "id": f"bull_{self.rng.randint(1000, 9999)}",
-            "name": "Bull Market",
-            "description": "Strong uptrend with high confidence",
-            "market_conditions": {
-                "volatility": self.rng.uniform(0.05, 0.15),
-                "coherence": self.rng.uniform(0.70, 0.90),
-                "friction": self.rng.uniform(0.05, 0.15),
-                "regime": "bull"
-            },
-            "intent": {
-                "asset": self.rng.choice(self.ASSETS),
-                "side": "BUY",
-                "amount": self.rng.uniform(100, 1000),
-                "irreversible": True
-            },
-            "expected_decision": "EXECUTE",
-            "expected_reason": "Favorable conditions"
-        }
+        return self._generate_regime("bull")
     
     def generate_range_market(self) -> Dict[str, Any]:
         """Génère un scénario de marché latéral."""
-        return {
-            "id": f"range_{self.rng.randint(1000, 9999)}",
-            "name": "Range-Bound Market",
-            "description": "Sideways movement with mixed signals",
-            "market_conditions": {
-                "volatility": self.rng.uniform(0.20, 0.35),
-                "coherence": self.rng.uniform(0.35, 0.55),
-                "friction": self.rng.uniform(0.25, 0.40),
-                "regime": "range"
-            },
-            "intent": {
-                "asset": self.rng.choice(self.ASSETS),
-                "side": self.rng.choice(self.SIDES),
-                "amount": self.rng.uniform(200, 800),
-                "irreversible": True
-            },
-            "expected_decision": "HOLD",
-            "expected_reason": "Uncertain conditions, X-108 required"
-        }
+        return self._generate_regime("range")
     
     def generate_pump_scenario(self) -> Dict[str, Any]:
         """Génère un scénario de pump (montée rapide)."""
-        return {
-            "id": f"pump_{self.rng.randint(1000, 9999)}",
-            "name": "Pump (Rapid Rise)",
-            "description": "Sudden price surge with high volatility",
-            "market_conditions": {
-                "volatility": self.rng.uniform(0.40, 0.60),
-                "coherence": self.rng.uniform(0.20, 0.40),
-                "friction": self.rng.uniform(0.30, 0.50),
-                "regime": "pump"
-            },
-            "intent": {
-                "asset": self.rng.choice(self.ASSETS),
-                "side": "BUY",
-                "amount": self.rng.uniform(1000, 3000),
-                "irreversible": True
-            },
-            "expected_decision": "BLOCK",
-            "expected_reason": "High volatility despite upward movement"
-        }
+        return self._generate_regime("pump")
     
     def generate_bear_market(self) -> Dict[str, Any]:
         """Génère un scénario de marché baissier."""
-        return {
-            "id": f"bear_{self.rng.randint(1000, 9999)}",
-            "name": "Bear Market",
-            "description": "Sustained downtrend with moderate volatility",
-            "market_conditions": {
-                "volatility": self.rng.uniform(0.25, 0.40),
-                "coherence": self.rng.uniform(0.50, 0.70),
-                "friction": self.rng.uniform(0.20, 0.35),
-                "regime": "bear"
-            },
-            "intent": {
-                "asset": self.rng.choice(self.ASSETS),
-                "side": "SELL",
-                "amount": self.rng.uniform(300, 1500),
-                "irreversible": True
-            },
-            "expected_decision": "HOLD",
-            "expected_reason": "Bearish trend, X-108 recommended"
-        }
+        return self._generate_regime("bear")
     
     def generate_random_scenario(self) -> Dict[str, Any]:
         """Génère un scénario aléatoire."""
@@ -140,6 +178,34 @@ class ScenarioGenerator:
         """Génère un batch de n scénarios aléatoires."""
         return [self.generate_random_scenario() for _ in range(n)]
     
+    def generate_batch_columns(self, n: int = 10) -> ScenarioBatch:
+        """
+        Génère n scénarios aléatoires en colonnes : régimes, conditions de marché, actifs,
+        sens et montants tirés en un seul appel vectorisé par champ (mêmes bornes par régime
+        que generate_*). Même distribution que generate_batch, mais pas le même flux
+        aléatoire : une seed donne des scénarios différents des deux côtés.
+        """
+        rng = self.rng
+        idx = rng.randint(0, len(_REGIME_SPECS), size=n)
+
+        def draw(col: int) -> np.ndarray:
+            bounds = np.array([spec[col] for spec in _REGIME_SPECS], dtype=float)[idx]
+            return rng.uniform(bounds[:, 0], bounds[:, 1])
+
+        volatility, coherence, friction = draw(4), draw(5), draw(6)
+        amount = draw(8)
+        id_number = rng.randint(1000, 9999, size=n)
+        asset = np.array(self.ASSETS, dtype=object)[rng.randint(0, len(self.ASSETS), size=n)]
+        random_side = np.array(self.SIDES, dtype=object)[rng.randint(0, len(self.SIDES), size=n)]
+        side = _spec_column(7, object)[idx]
+        free_side = np.array([spec[7] is None for spec in _REGIME_SPECS])[idx]
+        side[free_side] = random_side[free_side]
+        return ScenarioBatch(idx, id_number, volatility, coherence, friction, asset, side, amount)
+
+    def generate_batch_frame(self, n: int = 10) -> pd.DataFrame:
+        """generate_batch_columns(n) sous forme de DataFrame (une ligne par scénario)."""
+        return self.generate_batch_columns(n).to_frame()
+
     def generate_stress_test_suite(self) -> List[Dict[str, Any]]:
         """Génère une suite complète de stress tests."""
         return [
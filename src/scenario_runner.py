@@ -0,0 +1,241 @@
+"""Exécution headless des scénarios déterministes (Proof Mode), hors Streamlit.
+
+Même chemin que la vue OS5 Auto-Run (execute_scenario : OS1 → OS2 → OS3), exécutable
+en parallèle et utilisable comme garde de déploiement :
+
+    python -m src.scenario_runner                 # scenarios/deterministic/trading_scenarios.json
+    python -m src.scenario_runner --workers 4 --json out/scenarios.json
+
+Affiche une table attendu / obtenu avec la durée de chaque scénario ; code de sortie 1
+si une décision (ou un motif, avec --strict-reason) diffère de l'attendu.
+
+Un lot partage un ScenarioContext : returns, features de base et simulation par seed sont
+calculés une fois, chaque scénario n'applique que ses overlays.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core_pipeline import run_observation, run_simulation, evaluate_gates, simulation_verdict
+from src.data import open_price_store
+from src.features.features import extract_features
+from src.scenarios import load_scenarios, apply_scenario
+from src.simulation.sim_lite import sim_lite_bootstrap
+from src.trace_writer import flush_traces
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+class ScenarioContext:
+    """
+    Données de marché partagées par un lot de scénarios.
+
+    Les returns, les features de base (OS1) et une simulation par seed (OS2) sont calculés
+    une seule fois ; chaque scénario n'y applique que ses overlays (market_conditions,
+    simulation_override). seed=None correspond à un tirage non seedé, lui aussi partagé
+    par tout le lot.
+
+    Args:
+        returns: Returns du marché
+        base_dir: Racine des traces ; None = calcul direct sans artifacts (ex : sweep),
+            execute() n'est alors pas disponible
+        n_sims / horizon: Paramètres SIM-LITE
+    """
+
+    def __init__(self, returns: np.ndarray, base_dir: Optional[Path] = None, n_sims: int = 100, horizon: int = 10):
+        self.returns = returns
+        self.base_dir = Path(base_dir) if base_dir is not None else None
+        self.n_sims = n_sims
+        self.horizon = horizon
+        self._features: Optional[Dict[str, Any]] = None
+        self._sims: Dict[Optional[int], Dict[str, Any]] = {}
+
+    @classmethod
+    def from_base_dir(cls, base_dir: Path, **kwargs) -> "ScenarioContext":
+        """Contexte sur data/trading/BTC_1h.csv, traces sous base_dir."""
+        data_path = Path(base_dir) / "data" / "trading" / "BTC_1h.csv"
+        return cls(open_price_store(str(data_path)).returns, base_dir=base_dir, **kwargs)
+
+    def features(self, market_conditions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Features de base (calculées une fois) + market_conditions du scénario."""
+        if self._features is None:
+            if self.base_dir is not None:
+                self._features = run_observation(self.returns, self.base_dir)
+            else:
+                self._features = extract_features(self.returns)
+        feats = dict(self._features)
+        if market_conditions:
+            feats.update(market_conditions)
+        return feats
+
+    def simulation(self, seed: Optional[int] = None, override: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Simulation de la seed (calculée une fois par seed) + simulation_override du scénario."""
+        if seed not in self._sims:
+            if self.base_dir is not None:
+                sim = run_simulation(self.returns, self.base_dir, n_sims=self.n_sims, horizon=self.horizon, seed=seed)
+            else:
+                sim = sim_lite_bootstrap(self.returns, n_sims=self.n_sims, horizon=self.horizon, seed=seed)
+                sim["verdict"] = simulation_verdict(sim)
+            self._sims[seed] = sim
+        sim = dict(self._sims[seed])
+        if override:
+            sim.update(override)
+        return sim
+
+    def execute(self, scenario: Dict[str, Any]) -> Dict[str, Any]:
+        """Exécute un scénario Proof (OS1 → OS2 → OS3) et retourne les résultats."""
+        if self.base_dir is None:
+            raise ValueError("ScenarioContext.execute requires a base_dir for gate artifacts")
+        # Appliquer le scénario
+        params = apply_scenario(scenario)
+
+        # OS1 / OS2 : données partagées + overlays du scénario
+        features = self.features(params.get("market_conditions"))
+        sim_result = self.simulation(params["seed"], params.get("simulation_override"))
+
+        # OS3: Gates (copie de l'intent : le scénario chargé n'est pas modifié)
+        intent = dict(params.get("intent", {}))
+        intent["timestamp"] = time.time()
+        intent["coherence"] = features.get("coherence", 0.5)
+
+        state = {
+            "last_invest_ts": 0.0,
+            "equity_curve": [1.0],
+            "consecutive_losses": 0,
+            "cooldown_remaining": 0
+        }
+
+        gates_result = evaluate_gates(
+            intent=intent,
+            features=features,
+            sim_result=sim_result,
+            hold_started_ts=params.get("time_elapsed", 0.0),
+            tau_seconds=params.get("tau", 10.0),
+            state=state,
+            returns=self.returns,
+            base_dir=self.base_dir
+        )
+
+        return {
+            "scenario_id": scenario["id"],
+            "expected_decision": params.get("expected_decision"),
+            "expected_reason": params.get("expected_reason"),
+            "actual_decision": gates_result.get("decision"),
+            "actual_reason": gates_result.get("reason"),
+            "features": features,
+            "sim_result": sim_result,
+            "gates_result": gates_result
+        }
+
+def execute_scenario(base_dir: Path, scenario: Dict[str, Any], context: Optional[ScenarioContext] = None) -> Dict[str, Any]:
+    """Exécute un scénario complet (OS1 → OS2 → OS3) ; passer `context` pour partager les données d'un lot."""
+    return (context or ScenarioContext.from_base_dir(base_dir)).execute(scenario)
+
+_WORKER: Dict[str, Any] = {}
+
+def _init_worker(base_dir: Path, returns: np.ndarray) -> None:
+    # returns transmis par le parent : les workers n'ouvrent ni ne construisent le store
+    _WORKER["context"] = ScenarioContext(returns, base_dir=base_dir)
+
+def _timed_scenario(scenario: Dict[str, Any], context: Optional[ScenarioContext] = None) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    try:
+        result = (context or _WORKER["context"]).execute(scenario)
+    except Exception as e:  # un scénario en erreur est un échec de la suite, pas un arrêt du runner
+        params = apply_scenario(scenario)
+        result = {
+            "scenario_id": scenario.get("id"),
+            "expected_decision": params.get("expected_decision"),
+            "expected_reason": params.get("expected_reason"),
+            "actual_decision": "ERROR",
+            "actual_reason": f"{type(e).__name__}: {e}",
+        }
+    result["duration_s"] = time.perf_counter() - t0
+    # les traces du worker doivent être sur disque avant qu'il ne rende la main
+    flush_traces()
+    return result
+
+def run_scenarios(
+    base_dir: Path = BASE_DIR,
+    scenarios: Optional[List[Dict[str, Any]]] = None,
+    domain: str = "trading",
+    n_workers: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Exécute les scénarios (défaut : scenarios/deterministic/{domain}_scenarios.json),
+    en parallèle si n_workers > 1 (un ScenarioContext par worker, sur les returns lus par le parent).
+    Résultats dans l'ordre d'entrée, avec "duration_s".
+    """
+    if scenarios is None:
+        scenarios = load_scenarios(base_dir, domain)
+    # store ouvert (et construit si besoin) une seule fois, dans le parent
+    context = ScenarioContext.from_base_dir(base_dir)
+    if n_workers > 1 and len(scenarios) > 1:
+        returns = np.asarray(context.returns)
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(base_dir, returns)) as pool:
+            return list(pool.map(_timed_scenario, scenarios))
+    return [_timed_scenario(sc, context) for sc in scenarios]
+
+def results_table(results: List[Dict[str, Any]], strict_reason: bool = False) -> pd.DataFrame:
+    """Table attendu / obtenu (une ligne par scénario) ; `match` compare la décision (et le motif si strict)."""
+    rows = []
+    for r in results:
+        match = r["expected_decision"] == r["actual_decision"]
+        if strict_reason and r.get("expected_reason") is not None:
+            match = match and r["expected_reason"] == r["actual_reason"]
+        rows.append({
+            "scenario": r["scenario_id"],
+            "expected": r["expected_decision"],
+            "actual": r["actual_decision"],
+            "match": match,
+            "expected_reason": r.get("expected_reason"),
+            "actual_reason": r["actual_reason"],
+            "ms": r.get("duration_s", 0.0) * 1e3,
+        })
+    return pd.DataFrame(rows, columns=["scenario", "expected", "actual", "match", "expected_reason", "actual_reason", "ms"])
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Exécute les scénarios déterministes sans interface.")
+    ap.add_argument("--domain", default="trading", help="scenarios/deterministic/{domain}_scenarios.json")
+    ap.add_argument("--scenarios", default=None, help="Fichier de scénarios JSON (remplace --domain)")
+    ap.add_argument("--base-dir", default=str(BASE_DIR), help="Racine (data/, traces/)")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--only", nargs="*", default=None, help="IDs de scénarios à exécuter")
+    ap.add_argument("--strict-reason", action="store_true", help="Exige aussi le motif attendu")
+    ap.add_argument("--json", default=None, help="Écrit les résultats complets en JSON")
+    args = ap.parse_args(argv)
+
+    base_dir = Path(args.base_dir).resolve()
+    if args.scenarios:
+        scenarios = json.loads(Path(args.scenarios).read_text(encoding="utf-8"))
+    else:
+        scenarios = load_scenarios(base_dir, args.domain)
+    if args.only:
+        scenarios = [s for s in scenarios if s.get("id") in set(args.only)]
+    if not scenarios:
+        print("No scenarios found.", file=sys.stderr)
+        return 2
+
+    t0 = time.perf_counter()
+    results = run_scenarios(base_dir, scenarios, n_workers=args.workers)
+    elapsed = time.perf_counter() - t0
+    table = results_table(results, strict_reason=args.strict_reason)
+
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+    n_ok = int(table["match"].sum())
+    print(f"\n{n_ok}/{len(table)} scenarios match ({elapsed:.2f}s, {args.workers} worker(s))")
+
+    if args.json:
+        out = Path(args.json)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(results, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+    return 0 if n_ok == len(table) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
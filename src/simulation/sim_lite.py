@@ -1,50 +1,39 @@
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
 
-def max_drawdown_from_returns(returns: np.ndarray) -> float:
-    equity = np.cumprod(1.0 + returns)
-    peak = equity[0] if len(equity) else 1.0
-    max_dd = 0.0
-    for v in equity:
-        peak = max(peak, v)
-        dd = 1.0 - v / peak
-        max_dd = max(max_dd, float(dd))
-    return float(max_dd)
+# Taille fixe des shards du mode seedé : le découpage (donc le résultat) ne dépend
+# que de (seed, n_sims), jamais du nombre de workers.
+SHARD_SIZE = 4096
 
-def sim_lite_bootstrap(
-    returns: np.ndarray,
-    n_sims: int = 200,
-    horizon: int = 20,
-    bootstrap_window: int = 200,
-    dd_threshold: float = 0.05,
-    ruin_threshold: float = 0.10
-) -> dict:
+def max_drawdown_paths(paths: np.ndarray) -> np.ndarray:
+    # paths: (n_paths, horizon) returns -> max drawdown per path, computed on all rows at once
+    paths = np.atleast_2d(paths)
+    if paths.shape[1] == 0:
+        return np.zeros(paths.shape[0])
+    equity = np.cumprod(1.0 + paths, axis=1)
+    peak = np.maximum.accumulate(equity, axis=1)
+    dd = 1.0 - equity / peak
+    # fmax ignores NaN (0/0 peaks) exactly like the former scalar max() loop
+    return np.fmax.reduce(dd, axis=1, initial=0.0)
+
+def max_drawdown_from_returns(returns: np.ndarray) -> float:
     if len(returns) == 0:
-        return {
-            "mu": 0.0, "sigma": 0.0, "p_dd": 0.0, "p_ruin": 0.0, "cvar_95": 0.0,
-            "n_sims": 0, "horizon": horizon
-        }
+        return 0.0
+    return float(max_drawdown_paths(np.asarray(returns, dtype=float))[0])
 
-    window = returns[-bootstrap_window:] if len(returns) >= bootstrap_window else returns
-    horizon = min(horizon, len(window))
-    sims = np.random.choice(window, size=(n_sims, horizon), replace=True)
+def _path_stats(sims: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # (final cumulative return, max drawdown, min cumulative return) per path
     cum = np.cumsum(sims, axis=1)
-    final = cum[:, -1]
+    return cum[:, -1], max_drawdown_paths(sims), cum.min(axis=1)
 
-    # Prob DD above threshold using path equity from returns (approx)
-    p_dd = 0.0
-    p_ruin = 0.0
-    dd_vals = []
-    for i in range(n_sims):
-        rpath = sims[i]
-        dd = max_drawdown_from_returns(rpath)
-        dd_vals.append(dd)
-        if dd > dd_threshold:
-            p_dd += 1.0
-        if np.min(cum[i]) < -ruin_threshold:
-            p_ruin += 1.0
+def _summarize_stats(final: np.ndarray, dd_vals: np.ndarray, min_cum: np.ndarray, horizon: int,
+                     dd_threshold: float, ruin_threshold: float) -> dict:
+    n_sims = len(final)
 
-    p_dd /= n_sims
-    p_ruin /= n_sims
+    # Prob DD above threshold using path equity from returns (approx)
+    p_dd = np.count_nonzero(dd_vals > dd_threshold) / n_sims
+    p_ruin = np.count_nonzero(min_cum < -ruin_threshold) / n_sims
 
     # CVaR 95% on final returns
     q = np.percentile(final, 5)
@@ -61,5 +50,60 @@ def sim_lite_bootstrap(
         "horizon": int(horizon),
         "dd_threshold": float(dd_threshold),
         "ruin_threshold": float(ruin_threshold),
-        "dd_mean": float(np.mean(dd_vals)) if dd_vals else 0.0,
+        "dd_mean": float(np.mean(dd_vals)) if len(dd_vals) else 0.0,
     }
+
+def summarize_paths(sims: np.ndarray, dd_threshold: float = 0.05, ruin_threshold: float = 0.10) -> dict:
+    """Agrège une matrice de trajectoires (n_sims, horizon) en métriques SIM-LITE, en une passe."""
+    final, dd_vals, min_cum = _path_stats(sims)
+    return _summarize_stats(final, dd_vals, min_cum, sims.shape[1], dd_threshold, ruin_threshold)
+
+def _simulate_shard(window: np.ndarray, n: int, horizon: int, seed_seq: np.random.SeedSequence):
+    # Exécuté dans un worker : flux Generator indépendant, aucun état global
+    rng = np.random.default_rng(seed_seq)
+    return _path_stats(rng.choice(window, size=(n, horizon), replace=True))
+
+def _simulate_seeded(window: np.ndarray, n_sims: int, horizon: int, seed: int, n_workers: int):
+    sizes = [min(SHARD_SIZE, n_sims - start) for start in range(0, n_sims, SHARD_SIZE)]
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(window, k, horizon, ss) for k, ss in zip(sizes, streams)]
+    if n_workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(args))) as pool:
+            parts = list(pool.map(_simulate_shard, *zip(*args)))
+    else:
+        parts = [_simulate_shard(*a) for a in args]
+    # Concaténation dans l'ordre des shards : fusion exacte de p_dd/p_ruin/CVaR
+    return tuple(np.concatenate(cols) for cols in zip(*parts))
+
+def sim_lite_bootstrap(
+    returns: np.ndarray,
+    n_sims: int = 200,
+    horizon: int = 20,
+    bootstrap_window: int = 200,
+    dd_threshold: float = 0.05,
+    ruin_threshold: float = 0.10,
+    seed: Optional[int] = None,
+    n_workers: int = 1
+) -> dict:
+    """
+    Projection Monte Carlo par bootstrap des returns récents.
+
+    Sans `seed`, tire avec l'état global np.random (comportement historique).
+    Avec `seed`, utilise des flux Generator indépendants (SeedSequence.spawn) par shard
+    de SHARD_SIZE trajectoires, répartis sur `n_workers` processus : le résultat est
+    identique quel que soit n_workers.
+    """
+    if len(returns) == 0 or n_sims <= 0:
+        # rien à tirer : pas de shard à fusionner
+        return {
+            "mu": 0.0, "sigma": 0.0, "p_dd": 0.0, "p_ruin": 0.0, "cvar_95": 0.0,
+            "n_sims": 0, "horizon": horizon
+        }
+
+    window = returns[-bootstrap_window:] if len(returns) >= bootstrap_window else returns
+    horizon = min(horizon, len(window))
+    if seed is None:
+        sims = np.random.choice(window, size=(n_sims, horizon), replace=True)
+        return summarize_paths(sims, dd_threshold=dd_threshold, ruin_threshold=ruin_threshold)
+    final, dd_vals, min_cum = _simulate_seeded(np.asarray(window), n_sims, horizon, seed, n_workers)
+    return _summarize_stats(final, dd_vals, min_cum, horizon, dd_threshold, ruin_threshold)
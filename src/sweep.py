@@ -0,0 +1,219 @@
+"""Balayage des seuils de gouvernance (Gate3 + X-108) sur scénarios déterministes et replays historiques.
+
+Chaque point de paramètres est évalué dans un worker :
+- scénarios Proof (scenarios/deterministic) → précision décision attendue vs obtenue
+- replays BacktestEngine sur des séries de returns → équité finale, taux d'exécution
+et la latence de décision de chacun. Le résultat est une table (DataFrame), une ligne par point.
+
+Les deux moitiés partagent les mêmes seuils (point_config) : un paramètre absent du point
+prend la valeur par défaut du pipeline (GATE3_CONFIG, X108_COHERENCE_THRESHOLD, DEFAULT_TAU),
+y compris pour les replays. Côté scénarios, chaque décision est prise exactement comme dans
+execute_scenario (même état de départ, tau du point ou à défaut celui du scénario) : la
+précision d'un point par défaut est celle de run_scenarios.
+"""
+import argparse
+import copy
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backtest import BacktestEngine, DEFAULT_BACKTEST_CONFIG
+from src.core_pipeline import GATE3_CONFIG, X108_COHERENCE_THRESHOLD, evaluate_gates_batch
+from src.data import open_price_store
+from src.scenario_runner import ScenarioContext
+from src.scenarios import load_scenarios, apply_scenario
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Paramètres balayables ; les entiers sont arrondis en recherche aléatoire
+SWEEP_PARAMS = ("max_drawdown", "max_volatility", "max_consecutive_losses", "cooldown_steps",
+                "tau_seconds", "coherence_threshold")
+_INT_PARAMS = ("max_consecutive_losses", "cooldown_steps")
+DEFAULT_TAU = 10.0
+
+def _check_space(space: Dict[str, Any]) -> None:
+    unknown = sorted(set(space) - set(SWEEP_PARAMS))
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {unknown} (allowed: {list(SWEEP_PARAMS)})")
+
+def grid_points(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Produit cartésien : {"tau_seconds": [5, 10], ...} → liste de points."""
+    _check_space(space)
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[k] for k in names))]
+
+def random_points(space: Dict[str, Tuple[float, float]], n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Tirage uniforme de n points dans des bornes {"max_drawdown": (0.05, 0.3), ...}."""
+    _check_space(space)
+    rng = np.random.default_rng(seed)
+    points = []
+    for _ in range(n):
+        point = {}
+        for name, (lo, hi) in space.items():
+            v = rng.uniform(lo, hi)
+            point[name] = int(round(v)) if name in _INT_PARAMS else float(v)
+        points.append(point)
+    return points
+
+def point_config(point: Dict[str, Any]) -> Dict[str, Any]:
+    """Seuils effectifs d'un point : valeurs du point, défauts du pipeline pour le reste."""
+    return {
+        "gate3": {k: point.get(k, v) for k, v in GATE3_CONFIG.items()},
+        "tau_seconds": float(point.get("tau_seconds", DEFAULT_TAU)),
+        "coherence_threshold": float(point.get("coherence_threshold", X108_COHERENCE_THRESHOLD)),
+    }
+
+def prepare_scenarios(scenarios: List[Dict[str, Any]], returns: np.ndarray) -> Dict[str, Any]:
+    """Précalcule features / simulation de chaque scénario (comme OS5 execute_scenario, sans artifacts)."""
+    context = ScenarioContext(returns)
+    intents, features, sims, expected, ids, taus = [], [], [], [], [], []
+    for sc in scenarios:
+        params = apply_scenario(sc)
+        feats = context.features(params.get("market_conditions"))
+        sim = context.simulation(params["seed"], params.get("simulation_override"))
+        intent = dict(params.get("intent", {}))
+        intent["coherence"] = feats.get("coherence", 0.5)
+        intents.append(intent)
+        features.append(feats)
+        sims.append(sim)
+        expected.append(params.get("expected_decision"))
+        ids.append(sc.get("id"))
+        taus.append(float(params.get("tau", 10.0)))
+    return {"intents": intents, "features": features, "sims": sims,
+            "expected": np.array(expected, dtype=object), "ids": ids, "returns": returns,
+            "tau": np.array(taus)}
+
+_WORKER: Dict[str, Any] = {}
+
+def _init_worker(prepared: Dict[str, Any], replays: List[np.ndarray], replay_seed: int, replay_warmup: int) -> None:
+    _WORKER.update(prepared=prepared, replays=replays, replay_seed=replay_seed, replay_warmup=replay_warmup)
+
+def _fresh_state() -> Dict[str, Any]:
+    # état de départ d'execute_scenario
+    return {"last_invest_ts": 0.0, "equity_curve": [1.0], "consecutive_losses": 0, "cooldown_remaining": 0}
+
+def evaluate_point(point: Dict[str, Any]) -> Dict[str, Any]:
+    """Évalue un point de paramètres avec le contexte du worker (voir run_sweep)."""
+    prepared = _WORKER["prepared"]
+    cfg = point_config(point)
+    row = dict(point)
+
+    # Scénarios déterministes : un appel colonne par valeur de tau (une seule si le point la fixe)
+    n_sc = len(prepared["intents"])
+    if n_sc:
+        now = time.time()
+        intents = [dict(it, timestamp=now) for it in prepared["intents"]]
+        states = [_fresh_state() for _ in range(n_sc)]
+        taus = np.full(n_sc, cfg["tau_seconds"]) if "tau_seconds" in point else prepared["tau"]
+        decisions = np.empty(n_sc, dtype=object)
+        t0 = time.perf_counter()
+        for tau in np.unique(taus):
+            idx = np.flatnonzero(taus == tau)
+            res = evaluate_gates_batch(
+                [intents[i] for i in idx], [prepared["features"][i] for i in idx],
+                [prepared["sims"][i] for i in idx], [states[i] for i in idx],
+                tau_seconds=float(tau), returns=prepared["returns"], base_dir=None, save=False,
+                gate3_cfg=cfg["gate3"], coherence_threshold=cfg["coherence_threshold"]
+            )
+            decisions[idx] = res["decision"]
+        dt = time.perf_counter() - t0
+        matches = decisions == prepared["expected"]
+        row["scenario_accuracy"] = float(np.mean(matches))
+        row["scenario_mismatches"] = ",".join(i for i, m in zip(prepared["ids"], matches) if not m)
+        row["scenario_us_per_decision"] = dt / n_sc * 1e6
+
+    # Replays historiques : mêmes seuils, appliqués à la config du backtest
+    replays = _WORKER["replays"]
+    if replays:
+        bt_cfg = copy.deepcopy(DEFAULT_BACKTEST_CONFIG)
+        bt_cfg["gate3"].update(cfg["gate3"])
+        bt_cfg["hold_seconds"] = cfg["tau_seconds"]
+        bt_cfg["coherence_threshold"] = cfg["coherence_threshold"]
+        engine = BacktestEngine(bt_cfg, warmup=_WORKER["replay_warmup"], seed=_WORKER["replay_seed"])
+        steps = executed = 0
+        equities = []
+        t0 = time.perf_counter()
+        for returns in replays:
+            result = engine.run(returns)
+            steps += len(result.columns["step"])
+            executed += int(np.count_nonzero(result.columns["passed"]))
+            equities.append(result.final_equity)
+        dt = time.perf_counter() - t0
+        row["replay_steps"] = steps
+        row["replay_execute_rate"] = executed / steps if steps else 0.0
+        row["replay_final_equity_mean"] = float(np.mean(equities))
+        row["replay_us_per_step"] = dt / steps * 1e6 if steps else 0.0
+    return row
+
+def run_sweep(
+    points: List[Dict[str, Any]],
+    scenarios: Optional[List[Dict[str, Any]]] = None,
+    replays: Optional[List[np.ndarray]] = None,
+    n_workers: int = 1,
+    replay_seed: int = 0,
+    replay_warmup: int = 20,
+    base_dir: Path = BASE_DIR
+) -> pd.DataFrame:
+    """
+    Évalue chaque point sur les scénarios et replays, en parallèle si n_workers > 1.
+
+    Par défaut : scénarios trading de scenarios/deterministic et un replay de data/trading/BTC_1h.csv.
+    Retourne une table triée par précision décroissante puis latence croissante.
+    """
+    returns = open_price_store(str(base_dir / "data" / "trading" / "BTC_1h.csv")).returns
+    returns = np.asarray(returns)
+    if scenarios is None:
+        scenarios = load_scenarios(base_dir, "trading")
+    if replays is None:
+        replays = [returns]
+    prepared = prepare_scenarios(scenarios, returns)
+    init_args = (prepared, [np.asarray(r) for r in replays], replay_seed, replay_warmup)
+
+    if n_workers > 1 and len(points) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=init_args) as pool:
+            rows = list(pool.map(evaluate_point, points))
+    else:
+        _init_worker(*init_args)
+        rows = [evaluate_point(p) for p in points]
+
+    table = pd.DataFrame(rows)
+    if "scenario_accuracy" in table.columns:
+        table = table.sort_values(["scenario_accuracy", "scenario_us_per_decision"], ascending=[False, True], kind="stable")
+    return table.reset_index(drop=True)
+
+def main():
+    ap = argparse.ArgumentParser(description="Sweep des seuils Gate3 / X-108.")
+    ap.add_argument("--grid", help='JSON {param: [valeurs]} (ou chemin vers un fichier JSON)')
+    ap.add_argument("--random", help='JSON {param: [min, max]} (ou chemin vers un fichier JSON)')
+    ap.add_argument("--n", type=int, default=20, help="Nombre de points en recherche aléatoire")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--csv", nargs="*", default=None, help="CSV de prix à rejouer (défaut: BTC_1h.csv)")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--out", default=None, help="Écrit la table en CSV")
+    args = ap.parse_args()
+
+    def _load(spec: str) -> dict:
+        path = Path(spec)
+        return json.loads(path.read_text(encoding="utf-8") if path.exists() else spec)
+
+    if args.grid:
+        points = grid_points(_load(args.grid))
+    elif args.random:
+        points = random_points({k: tuple(v) for k, v in _load(args.random).items()}, args.n, args.seed)
+    else:
+        ap.error("one of --grid or --random is required")
+
+    replays = [np.asarray(open_price_store(p).returns) for p in args.csv] if args.csv else None
+    table = run_sweep(points, replays=replays, n_workers=args.workers, replay_seed=args.seed)
+    print(table.to_string(index=False))
+    if args.out:
+        table.to_csv(args.out, index=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Écriture bufferisée et asynchrone des traces (JSONL + artifacts last_run)."""
+import atexit
+import os
+import queue
+import threading
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+FSYNC_POLICIES = ("never", "batch", "always")
+
+_APPEND = "append"
+_REPLACE = "replace"
+_STOP = "stop"
+
+class TraceWriter:
+    """
+    Writer de traces en tâche de fond.
+
+    Les appelants sérialisent leur objet (instantané immuable) puis déposent la ligne
+    dans une file bornée ; un thread dédié regroupe les écritures par fichier
+    (un seul open/append par fichier et par lot) et coalesce les réécritures
+    d'artifacts (seule la dernière version d'un fichier est écrite).
+
+    Args:
+        max_queue: Taille maximale de la file (backpressure : put bloque si pleine)
+        batch_size: Nombre maximal d'événements écrits par lot
+        fsync: "never" (OS buffers), "batch" (fsync par fichier et par lot),
+            "always" (un fsync par événement, sans regroupement)
+        async_mode: False pour écrire directement dans le thread appelant
+    """
+
+    def __init__(self, max_queue: int = 10_000, batch_size: int = 512,
+                 fsync: str = "never", async_mode: bool = True):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.fsync = fsync
+        self.batch_size = 1 if fsync == "always" else max(1, int(batch_size))
+        self.async_mode = async_mode
+        self._q: "queue.Queue[Tuple[str, Optional[Path], str]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._dirs: set = set()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        _writers.add(self)
+
+    # --- API appelant ---
+
+    def append_line(self, path: Path, line: str) -> None:
+        """Ajoute une ligne (sans '\\n') à un fichier JSONL."""
+        self._submit((_APPEND, Path(path), line + "\n"))
+
+    def write_file(self, path: Path, text: str) -> None:
+        """Remplace le contenu d'un fichier (écriture atomique via os.replace)."""
+        self._submit((_REPLACE, Path(path), text))
+
+    def flush(self) -> None:
+        """Bloque jusqu'à ce que tous les événements déposés soient écrits."""
+        if self._thread is not None:
+            self._q.join()
+        self._raise_pending()
+
+    def close(self) -> None:
+        """Vide la file et arrête le thread (appelé automatiquement à la sortie) ; toute écriture ultérieure est refusée."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._q.put((_STOP, None, ""))
+            thread.join()
+        self._raise_pending()
+
+    # --- interne ---
+
+    def _submit(self, item: Tuple[str, Optional[Path], str]) -> None:
+        if not self.async_mode:
+            if self._closed:
+                raise RuntimeError("TraceWriter is closed")
+            self._write_batch([item])
+            self._raise_pending()
+            return
+        # test de fermeture et dépôt sous le verrou : rien ne peut passer derrière le STOP de close()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("TraceWriter is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="obsidia-trace-writer", daemon=True)
+                self._thread.start()
+            self._q.put(item)
+
+    def _after_fork(self) -> None:
+        # le thread du parent n'existe pas dans l'enfant : sans remise à zéro, flush() attendrait
+        # indéfiniment la file héritée. Les événements en attente restent à la charge du parent.
+        self._q = queue.Queue(maxsize=self._q.maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._q.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._q.get_nowait())
+            except queue.Empty:
+                pass
+            stop = any(kind == _STOP for kind, _, _ in batch)
+            try:
+                self._write_batch([it for it in batch if it[0] != _STOP])
+            except BaseException as e:  # remonté à l'appelant au prochain flush()
+                self._error = e
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+            if stop:
+                return
+
+    def _open(self, path: Path, mode: str):
+        parent = path.parent
+        if parent not in self._dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._dirs.add(parent)
+        try:
+            return open(path, mode, encoding="utf-8")
+        except FileNotFoundError:
+            # répertoire supprimé depuis sa mise en cache
+            parent.mkdir(parents=True, exist_ok=True)
+            return open(path, mode, encoding="utf-8")
+
+    def _write_batch(self, batch: List[Tuple[str, Optional[Path], str]]) -> None:
+        appends: Dict[Path, List[str]] = {}
+        replaces: Dict[Path, str] = {}
+        for kind, path, text in batch:
+            if kind == _APPEND:
+                appends.setdefault(path, []).append(text)
+            elif kind == _REPLACE:
+                replaces[path] = text
+
+        for path, lines in appends.items():
+            with self._open(path, "a") as f:
+                f.write("".join(lines))
+                self._maybe_fsync(f)
+
+        for path, text in replaces.items():
+            # suffixe par process : plusieurs workers peuvent réécrire le même artifact
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with self._open(tmp, "w") as f:
+                f.write(text)
+                self._maybe_fsync(f)
+            os.replace(tmp, path)
+
+    def _maybe_fsync(self, f) -> None:
+        if self.fsync != "never":
+            f.flush()
+            os.fsync(f.fileno())
+
+_writers: "weakref.WeakSet[TraceWriter]" = weakref.WeakSet()
+_default_writer: Optional[TraceWriter] = None
+_default_lock = threading.Lock()
+
+def _reinit_after_fork() -> None:
+    global _default_lock
+    _default_lock = threading.Lock()
+    for writer in list(_writers):
+        writer._after_fork()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+def _close_all_writers() -> None:
+    # un seul hook de sortie : _writers ne garde que des références faibles
+    error = None
+    for writer in list(_writers):
+        try:
+            writer.close()
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
+
+atexit.register(_close_all_writers)
+
+def get_trace_writer() -> TraceWriter:
+    """Retourne le writer partagé du process (créé à la première utilisation)."""
+    global _default_writer
+    if _default_writer is None:
+        with _default_lock:
+            if _default_writer is None:
+                _default_writer = TraceWriter()
+    return _default_writer
+
+def configure_trace_writer(**kwargs) -> TraceWriter:
+    """Remplace le writer partagé (après avoir vidé l'ancien). Voir TraceWriter pour les options."""
+    global _default_writer
+    with _default_lock:
+        if _default_writer is not None:
+            _default_writer.close()
+        _default_writer = TraceWriter(**kwargs)
+    return _default_writer
+
+def flush_traces() -> None:
+    """Vide le writer partagé : toutes les traces déposées sont sur disque au retour."""
+    if _default_writer is not None:
+        _default_writer.flush()
@@ -5,13 +5,13 @@ from pathlib import Path
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from src.trace_writer import get_trace_writer, flush_traces
+
 def now_iso():
     return datetime.utcnow().isoformat() + "Z"
 
 def append_jsonl(path: Path, obj: dict):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    get_trace_writer().append_line(path, json.dumps(obj, ensure_ascii=False))
 
 def ensure_dirs(base_dir: Path) -> None:
     """Crée les répertoires nécessaires."""
@@ -20,24 +20,22 @@ def ensure_dirs(base_dir: Path) -> None:
     (traces_dir / "last_run").mkdir(parents=True, exist_ok=True)
 
 def log_jsonl(base_dir: Path, name: str, obj: Dict[str, Any]) -> None:
-    """Ajoute une entrée dans un log JSONL."""
-    ensure_dirs(base_dir)
+    """Ajoute une entrée dans un log JSONL (écriture différée, voir src.trace_writer)."""
     path = base_dir / "traces" / f"{name}.jsonl"
     obj = dict(obj)
     obj.setdefault("ts", time.time())
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    get_trace_writer().append_line(path, json.dumps(obj, ensure_ascii=False))
 
 def save_artifact(base_dir: Path, filename: str, data: Any) -> Path:
-    """Sauvegarde un artifact JSON."""
-    ensure_dirs(base_dir)
+    """Sauvegarde un artifact JSON (écriture différée, seule la dernière version est écrite)."""
     out = base_dir / "traces" / "last_run" / filename
-    with open(out, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Sérialisé ici : l'appelant peut muter `data` ensuite sans affecter la trace
+    get_trace_writer().write_file(out, json.dumps(data, ensure_ascii=False, indent=2))
     return out
 
 def read_artifact(base_dir: Path, filename: str) -> Optional[Dict[str, Any]]:
     """Lit un artifact JSON."""
+    flush_traces()
     path = base_dir / "traces" / "last_run" / filename
     if not path.exists():
         return None
@@ -45,6 +43,7 @@ def read_artifact(base_dir: Path, filename: str) -> Optional[Dict[str, Any]]:
 
 def zip_last_run(base_dir: Path) -> Path:
     """Crée un ZIP de tous les artifacts de last_run."""
+    flush_traces()
     ensure_dirs(base_dir)
     zpath = base_dir / "traces" / "last_run" / "artifacts.zip"
     with zipfile.ZipFile(zpath, "w", zipfile.ZIP_DEFLATED) as z:
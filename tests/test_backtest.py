@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.backtest import BacktestEngine
+from src.features.features import extract_features
+from src.gates.gate3_risk_killswitch import gate3_risk_kill
+
+_rng = np.random.default_rng(11)
+# calme, puis choc de volatilité, puis reprise : toutes les gates finissent par bloquer
+RETURNS = np.concatenate([_rng.normal(0.002, 0.005, 200), _rng.normal(-0.01, 0.08, 60), _rng.normal(0.001, 0.01, 200)])
+
+
+def _gate3_full(state, returns, cfg):
+    # Gate 3 d'origine : courbe d'équité entière et np.std(returns[-50:]) recalculés à chaque pas
+    risk = state["risk"]
+    legacy = {"equity_curve": list(risk.equity_curve), "consecutive_losses": risk.consecutive_losses,
+              "cooldown_remaining": state["cooldown_remaining"]}
+    ok, reason = gate3_risk_kill(legacy, returns, cfg)
+    state["cooldown_remaining"] = legacy["cooldown_remaining"]
+    return ok, reason
+
+
+def test_incremental_engine_matches_full_recomputation():
+    fast = BacktestEngine(seed=7, warmup=20).run(RETURNS)
+    slow = BacktestEngine(seed=7, warmup=20, feature_fn=extract_features, gate3=_gate3_full).run(RETURNS)
+    for name, col in fast.columns.items():
+        if col.dtype == object or col.dtype == bool or np.issubdtype(col.dtype, np.integer):
+            np.testing.assert_array_equal(col, slow.columns[name], err_msg=name)
+        else:
+            np.testing.assert_allclose(col, slow.columns[name], rtol=1e-9, atol=1e-12, err_msg=name)
+    assert fast.final_equity == slow.final_equity
+    assert set(fast.columns["gate"].tolist()) >= {0, 2, 3}
+
+
+def test_fixed_seed_is_reproducible():
+    first = BacktestEngine(seed=7, warmup=20).run(RETURNS).columns
+    again = BacktestEngine(seed=7, warmup=20).run(RETURNS).columns
+    other = BacktestEngine(seed=8, warmup=20).run(RETURNS).columns
+    for name in first:
+        np.testing.assert_array_equal(first[name], again[name], err_msg=name)
+    assert not np.array_equal(first["p_dd"], other["p_dd"])
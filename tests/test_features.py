@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from src.features.features import IncrementalFeatureState, extract_features
+
+
+def test_incremental_state_matches_extract_features():
+    rng = np.random.default_rng(3)
+    # alternance de régimes pour traverser trend_up / range / trend_down
+    returns = np.concatenate([rng.normal(mu, 0.01, 300) for mu in (0.004, 0.0, -0.004, 0.001)])
+    state = IncrementalFeatureState()
+    seen = set()
+    for t in range(len(returns)):
+        expected = extract_features(returns[:t])
+        got = state.features()
+        assert got["volatility"] == pytest.approx(expected["volatility"], rel=1e-9, abs=1e-12)
+        assert got["coherence"] == pytest.approx(expected["coherence"], abs=1e-9)
+        assert got["friction"] == pytest.approx(expected["friction"], abs=1e-9)
+        w = returns[:t][-50:]
+        z = np.mean(w) / (np.std(w) + 1e-12) if t >= 2 else 0.0
+        if min(abs(z - 0.2), abs(z + 0.2)) > 1e-9:  # hors seuil : même régime
+            assert got["regime"] == expected["regime"]
+        seen.add(expected["regime"])
+        state.update(returns[t])
+    assert seen == {"unknown", "trend_up", "range", "trend_down"}
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from src.gates.gate3_risk_killswitch import RiskKillState, compute_drawdown
+
+
+def _histories(returns):
+    # historique croissant, fenêtre glissante de taille fixe, puis nouveau replay plus court
+    for t in range(1, 120):
+        yield returns[:t]
+    for t in range(120, len(returns)):
+        yield returns[t - 80:t]
+    for t in range(1, 30):
+        yield returns[:t]
+
+
+def test_risk_state_matches_full_recomputation():
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0, 0.02, 300)
+    equity = np.cumprod(1.0 + rng.normal(0.0, 0.01, 400))
+
+    state = RiskKillState(1.0, capacity=4)
+    curve = [1.0]
+    for v, hist in zip(equity, _histories(returns)):
+        state.push_equity(v)
+        curve.append(v)
+        state.sync_returns(hist)
+        assert state.max_drawdown == pytest.approx(compute_drawdown(curve), abs=1e-12)
+        assert state.volatility() == pytest.approx(float(np.std(hist[-50:])), abs=1e-12)
+    np.testing.assert_array_equal(state.equity_curve, curve)
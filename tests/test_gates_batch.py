@@ -0,0 +1,59 @@
+import copy
+import time
+
+import numpy as np
+
+from src.core_pipeline import GATE3_CONFIG, evaluate_gates, evaluate_gates_batch
+
+RETURNS = np.random.default_rng(0).normal(0.0, 0.01, 200)
+
+
+def _intent(**overrides):
+    intent = {"asset": "BTC", "side": "BUY", "amount": 100.0, "timestamp": time.time(), "coherence": 0.8}
+    intent.update(overrides)
+    return intent
+
+
+def _cases():
+    now = time.time()
+    fresh = {"last_invest_ts": 0.0, "equity_curve": [1.0], "consecutive_losses": 0, "cooldown_remaining": 0}
+    intents = [
+        _intent(), _intent(side="HOLD"), _intent(amount=0.0), _intent(coherence=1.5),
+        {"asset": "BTC", "side": "BUY"}, _intent(), _intent(), _intent(), _intent(), _intent(), _intent(),
+    ]
+    features = [{"coherence": 0.1 if i == 5 else 0.9} for i in range(len(intents))]
+    sims = [{"verdict": "SAFE"}] * 10 + [{"verdict": "DESTRUCTIVE"}]
+    states = [dict(fresh) for _ in intents]
+    states[6]["last_invest_ts"] = now - 5.0               # X-108 : en attente
+    states[7]["equity_curve"] = [1.0, 1.2, 0.9]           # drawdown 25 %
+    states[8]["consecutive_losses"] = 10
+    states[9]["cooldown_remaining"] = 2
+    return intents, features, sims, states
+
+
+def _loop(intents, features, sims, states, tmp_path):
+    results = [
+        evaluate_gates(it, f, s, 0.0, 10.0, st, RETURNS, tmp_path)
+        for it, f, s, st in zip(intents, features, sims, states)
+    ]
+    return [r["decision"] for r in results], [r["reason"] for r in results]
+
+
+def test_batch_matches_looping_evaluate_gates(tmp_path):
+    intents, features, sims, states = _cases()
+    expected = _loop(intents, features, sims, copy.deepcopy(states), tmp_path)
+    batch = evaluate_gates_batch(intents, features, sims, copy.deepcopy(states), 10.0, RETURNS, tmp_path)
+    assert (batch["decision"].tolist(), batch["reason"].tolist()) == expected
+    assert len(set(expected[1])) == 11  # chaque motif est couvert
+
+
+def test_shared_state_sees_cooldown_armed_by_a_kill(tmp_path):
+    intents = [_intent() for _ in range(4)]
+    state = {"last_invest_ts": 0.0, "equity_curve": [1.0, 0.5], "consecutive_losses": 0, "cooldown_remaining": 0}
+    loop_state = copy.deepcopy(state)
+    expected = _loop(intents, [{"coherence": 0.9}] * 4, [{}] * 4, [loop_state] * 4, tmp_path)
+    batch = evaluate_gates_batch(intents, {"coherence": 0.9}, {}, state, 10.0, RETURNS, tmp_path,
+                                 gate3_cfg=GATE3_CONFIG)
+    assert (batch["decision"].tolist(), batch["reason"].tolist()) == expected
+    assert expected[1] == ["kill_drawdown", "cooldown", "cooldown", "cooldown"]
+    assert state == loop_state
@@ -0,0 +1,24 @@
+import time
+
+import pytest
+
+from src.core_pipeline import emit_erc8004_intent
+from src.instrumentation import configure_instrumentation
+
+
+@pytest.fixture
+def instr():
+    yield configure_instrumentation()
+    configure_instrumentation()
+
+
+def test_emit_stage_is_recorded_for_every_outcome(instr, tmp_path):
+    intent = {"asset": "BTC", "side": "BUY", "amount": 1.0, "timestamp": time.time()}
+    emit_erc8004_intent(intent, {"decision": "HOLD"}, tmp_path)
+    emit_erc8004_intent(intent, {"decision": "EXECUTE"}, tmp_path)
+    with pytest.raises(KeyError):
+        emit_erc8004_intent({}, {"decision": "EXECUTE"}, tmp_path)
+
+    for outcome in ("not_emitted", "emitted", "error"):
+        hist = instr.histogram("stage", stage="os3_emit_intent", outcome=outcome)
+        assert hist is not None and hist.count == 1
@@ -0,0 +1,35 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from src.data import LOCK_FILENAME, load_prices_csv, open_price_store
+
+CSV = str(Path(__file__).resolve().parents[1] / "data" / "trading" / "BTC_1h.csv")
+
+
+def _open(root):
+    store = open_price_store(CSV, root)
+    return len(store), float(store.close[-1]), float(store.returns.sum())
+
+
+def test_concurrent_builds_on_a_fresh_store(tmp_path):
+    with ProcessPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(_open, [str(tmp_path)] * 8))
+    assert len(set(results)) == 1
+    names = sorted(p.name for p in (tmp_path / "BTC_1h").iterdir())
+    assert not [n for n in names if n.endswith(".tmp")]
+    assert LOCK_FILENAME in names and "manifest.json" in names
+
+
+def test_unreadable_manifest_triggers_a_rebuild(tmp_path):
+    expected = _open(str(tmp_path))
+    manifest = tmp_path / "BTC_1h" / "manifest.json"
+    for damaged in ("", "{", "[1]", '{"version": 1}'):
+        manifest.write_text(damaged, encoding="utf-8")
+        assert _open(str(tmp_path)) == expected
+
+
+def test_load_prices_csv_matches_direct_parse():
+    close, returns = load_prices_csv(CSV)
+    assert np.allclose(returns, np.diff(close) / close[:-1])
@@ -0,0 +1,30 @@
+from src.result_cache import ResultCache
+
+
+def test_lru_hit_miss_and_eviction():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}  # "a" devient le plus récent
+    cache.put("c", {"v": 3})           # évince "b"
+    assert cache.get("b") is None
+    assert cache.get("c") == {"v": 3}
+    assert cache.stats() == {"entries": 2, "hits": 2, "misses": 1, "disk_hits": 0}
+
+    value = cache.get("a")
+    value["v"] = 99
+    assert cache.get("a") == {"v": 1}
+
+
+def test_disk_round_trip(tmp_path):
+    writer = ResultCache(max_entries=1, disk_dir=tmp_path)
+    writer.put("key", {"p_dd": 0.25, "verdict": "SAFE"})
+    writer.put("key", {"p_dd": 0.5, "verdict": "SAFE"})
+    writer.put("other", {"p_dd": 0.0})  # évince "key" de la mémoire
+    assert not list(tmp_path.glob("*.tmp"))
+
+    assert writer.get("key") == {"p_dd": 0.5, "verdict": "SAFE"}
+    reader = ResultCache(disk_dir=tmp_path)
+    assert reader.get("key") == {"p_dd": 0.5, "verdict": "SAFE"}
+    assert reader.get("missing") is None
+    assert reader.stats() == {"entries": 1, "hits": 1, "misses": 1, "disk_hits": 1}
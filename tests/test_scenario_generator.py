@@ -0,0 +1,31 @@
+from src.scenario_generator import ScenarioGenerator, _REGIME_SPECS
+
+
+def _keys(d):
+    return {k: _keys(v) if isinstance(v, dict) else None for k, v in d.items()}
+
+
+def test_batch_columns_draw_within_regime_bounds():
+    batch = ScenarioGenerator(seed=0).generate_batch_columns(2000)
+    assert set(batch.regime_index.tolist()) == set(range(len(_REGIME_SPECS)))
+    for k, spec in enumerate(_REGIME_SPECS):
+        rows = batch.regime_index == k
+        for column, (lo, hi) in zip((batch.volatility, batch.coherence, batch.friction, batch.amount),
+                                    (spec[4], spec[5], spec[6], spec[8])):
+            assert ((column[rows] >= lo) & (column[rows] < hi)).all()
+        expected_sides = {"BUY", "SELL"} if spec[7] is None else {spec[7]}
+        assert set(batch.side[rows].tolist()) == expected_sides
+
+
+def test_batch_rows_have_the_generate_batch_shape():
+    batch = ScenarioGenerator(seed=1).generate_batch_columns(200)
+    scenarios = ScenarioGenerator(seed=1).generate_batch(200)
+    by_regime = {sc["market_conditions"]["regime"]: sc for sc in scenarios}
+    assert len(by_regime) == len(_REGIME_SPECS)
+    for i in range(len(batch)):
+        row = batch[i]
+        reference = by_regime[row["market_conditions"]["regime"]]
+        assert _keys(row) == _keys(reference)
+        for key in ("name", "description", "expected_decision", "expected_reason"):
+            assert row[key] == reference[key]
+        assert row["id"].split("_")[0] == reference["id"].split("_")[0]
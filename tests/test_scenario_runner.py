@@ -0,0 +1,84 @@
+import copy
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.core_pipeline import evaluate_gates, run_observation, run_simulation
+from src.scenario_runner import ScenarioContext
+from src.scenarios import apply_scenario, load_scenarios
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# serial puis parallèle dans un même process : le pool forké hérite du writer de traces
+# déjà démarré et du store déjà ouvert par le lot serial
+_SERIAL_THEN_PARALLEL = """
+import json, sys
+from pathlib import Path
+sys.path.insert(0, {root!r})
+from src.scenario_runner import run_scenarios
+base_dir = Path({base_dir!r})
+serial = run_scenarios(base_dir, n_workers=1)
+parallel = run_scenarios(base_dir, n_workers=2)
+print(json.dumps([[(r["scenario_id"], r["actual_decision"], r["actual_reason"]) for r in rs] for rs in (serial, parallel)]))
+"""
+
+
+def _base_dir(tmp_path: Path) -> Path:
+    (tmp_path / "data" / "trading").mkdir(parents=True)
+    shutil.copy(ROOT / "data" / "trading" / "BTC_1h.csv", tmp_path / "data" / "trading")
+    shutil.copytree(ROOT / "scenarios", tmp_path / "scenarios")
+    return tmp_path
+
+
+def test_serial_then_parallel_run_in_one_process(tmp_path):
+    base_dir = _base_dir(tmp_path)
+    code = _SERIAL_THEN_PARALLEL.format(root=str(ROOT), base_dir=str(base_dir))
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    serial, parallel = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert serial and serial == parallel
+    assert (base_dir / "traces").is_dir()
+
+
+def _execute_scenario_alone(base_dir: Path, scenario: dict) -> dict:
+    # execute_scenario d'origine (vue OS5) : données relues et recalculées à chaque scénario,
+    # simulation seedée par la seed du scénario comme dans ScenarioContext
+    params = apply_scenario(scenario)
+    df = pd.read_csv(base_dir / "data" / "trading" / "BTC_1h.csv")
+    returns = pd.Series(df["close"].values).pct_change().dropna().values
+    features = run_observation(returns, base_dir, use_cache=False)
+    if "market_conditions" in params:
+        features.update(params["market_conditions"])
+    sim_result = run_simulation(returns, base_dir, n_sims=100, horizon=10, seed=params["seed"], use_cache=False)
+    if params.get("simulation_override"):
+        sim_result.update(params["simulation_override"])
+    intent = params.get("intent", {})
+    intent["timestamp"] = time.time()
+    intent["coherence"] = features.get("coherence", 0.5)
+    state = {"last_invest_ts": 0.0, "equity_curve": [1.0], "consecutive_losses": 0, "cooldown_remaining": 0}
+    gates_result = evaluate_gates(intent=intent, features=features, sim_result=sim_result,
+                                  hold_started_ts=params.get("time_elapsed", 0.0),
+                                  tau_seconds=params.get("tau", 10.0), state=state, returns=returns,
+                                  base_dir=base_dir)
+    return {"features": features, "sim_result": sim_result, "gates_result": gates_result}
+
+
+def test_shared_context_matches_per_scenario_execution(tmp_path):
+    base_dir = _base_dir(tmp_path)
+    scenarios = load_scenarios(base_dir, "trading")
+    loaded = copy.deepcopy(scenarios)
+    context = ScenarioContext.from_base_dir(base_dir)
+    for scenario in scenarios:
+        shared = context.execute(scenario)
+        alone = _execute_scenario_alone(base_dir, copy.deepcopy(scenario))
+        # returns du price store vs pct_change : égaux au dernier bit près
+        assert shared["features"] == pytest.approx(alone["features"], rel=1e-9)
+        assert shared["sim_result"] == pytest.approx(alone["sim_result"], rel=1e-9)
+        assert shared["gates_result"] == alone["gates_result"], scenario["id"]
+    assert scenarios == loaded  # le contexte ne modifie pas les scénarios chargés
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from src.simulation.sim_lite import SHARD_SIZE, max_drawdown_paths, sim_lite_bootstrap
+
+RETURNS = np.random.default_rng(0).normal(0.0, 0.02, 500)
+
+
+def _max_drawdown_loop(returns):
+    # calcul scalaire d'origine, une trajectoire à la fois
+    equity = np.cumprod(1.0 + returns)
+    peak = equity[0] if len(equity) else 1.0
+    max_dd = 0.0
+    for v in equity:
+        peak = max(peak, v)
+        dd = 1.0 - v / peak
+        max_dd = max(max_dd, float(dd))
+    return float(max_dd)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")  # 0/0 voulu
+def test_max_drawdown_paths_matches_per_path_loop():
+    rng = np.random.default_rng(1)
+    paths = rng.normal(0.0, 0.05, (300, 25))
+    paths[::7, 3] = -1.0  # équité nulle : pics à 0 puis 0/0
+    paths[::11, 0] = -1.0
+    np.testing.assert_array_equal(max_drawdown_paths(paths), [_max_drawdown_loop(p) for p in paths])
+    np.testing.assert_array_equal(max_drawdown_paths(np.empty((4, 0))), np.zeros(4))
+
+
+def test_unseeded_summary_matches_per_path_loop():
+    np.random.seed(5)
+    result = sim_lite_bootstrap(RETURNS, n_sims=300, horizon=15)
+    np.random.seed(5)
+    sims = np.random.choice(RETURNS[-200:], size=(300, 15), replace=True)
+    dd = np.array([_max_drawdown_loop(p) for p in sims])
+    assert result["p_dd"] == np.mean(dd > 0.05)
+    assert result["p_ruin"] == np.mean(np.cumsum(sims, axis=1).min(axis=1) < -0.10)
+    assert result["dd_mean"] == np.mean(dd)
+
+
+def test_seeded_result_does_not_depend_on_workers():
+    n_sims = 2 * SHARD_SIZE + 17
+    serial = sim_lite_bootstrap(RETURNS, n_sims=n_sims, seed=42, n_workers=1)
+    assert sim_lite_bootstrap(RETURNS, n_sims=n_sims, seed=42, n_workers=3) == serial
+    assert sim_lite_bootstrap(RETURNS, n_sims=n_sims, seed=43, n_workers=1) != serial
+
+
+def test_zero_sims_returns_the_empty_result():
+    empty = sim_lite_bootstrap(np.array([]), horizon=20)
+    assert sim_lite_bootstrap(RETURNS, n_sims=0, seed=1) == empty
+    assert sim_lite_bootstrap(RETURNS, n_sims=0) == empty
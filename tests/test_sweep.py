@@ -0,0 +1,36 @@
+import copy
+import shutil
+from pathlib import Path
+
+from src.backtest import DEFAULT_BACKTEST_CONFIG
+from src.core_pipeline import GATE3_CONFIG, X108_COHERENCE_THRESHOLD
+from src.scenario_runner import run_scenarios
+from src.sweep import DEFAULT_TAU, point_config, run_sweep
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _base_dir(tmp_path: Path) -> Path:
+    (tmp_path / "data" / "trading").mkdir(parents=True)
+    shutil.copy(ROOT / "data" / "trading" / "BTC_1h.csv", tmp_path / "data" / "trading")
+    shutil.copytree(ROOT / "scenarios", tmp_path / "scenarios")
+    return tmp_path
+
+
+def test_point_config_uses_pipeline_defaults():
+    cfg = point_config({"max_drawdown": 0.3})
+    assert cfg["gate3"] == dict(GATE3_CONFIG, max_drawdown=0.3)
+    assert cfg["tau_seconds"] == DEFAULT_TAU
+    assert cfg["coherence_threshold"] == X108_COHERENCE_THRESHOLD
+
+
+def test_default_point_matches_run_scenarios(tmp_path):
+    base_dir = _base_dir(tmp_path)
+    results = run_scenarios(base_dir)
+    mismatches = [r["scenario_id"] for r in results if r["actual_decision"] != r["expected_decision"]]
+
+    before = copy.deepcopy(DEFAULT_BACKTEST_CONFIG)
+    row = run_sweep([{}], replays=[], base_dir=base_dir).iloc[0]
+    assert row["scenario_accuracy"] == 1 - len(mismatches) / len(results)
+    assert row["scenario_mismatches"] == ",".join(mismatches)
+    assert DEFAULT_BACKTEST_CONFIG == before
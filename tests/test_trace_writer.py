@@ -0,0 +1,52 @@
+import gc
+import multiprocessing as mp
+import os
+import weakref
+
+import pytest
+
+from src.trace_writer import TraceWriter
+
+
+def _flush_in_child(writer, path):
+    writer.append_line(path, "child")
+    writer.flush()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork start method only")
+def test_flush_in_forked_child_does_not_hang(tmp_path):
+    writer = TraceWriter()
+    path = tmp_path / "trace.jsonl"
+    writer.append_line(path, "parent")
+    writer.flush()  # thread du writer démarré dans le parent
+
+    child = mp.get_context("fork").Process(target=_flush_in_child, args=(writer, path))
+    child.start()
+    child.join(timeout=10)
+    if child.is_alive():
+        child.kill()
+        pytest.fail("flush() hung in the forked child")
+    assert child.exitcode == 0
+    writer.close()
+    assert path.read_text(encoding="utf-8").splitlines() == ["parent", "child"]
+
+
+@pytest.mark.parametrize("async_mode", [True, False])
+def test_submit_after_close_is_rejected(tmp_path, async_mode):
+    writer = TraceWriter(async_mode=async_mode)
+    writer.append_line(tmp_path / "trace.jsonl", "a")
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.append_line(tmp_path / "trace.jsonl", "b")
+    writer.flush()
+    assert (tmp_path / "trace.jsonl").read_text(encoding="utf-8") == "a\n"
+
+
+def test_unused_writer_is_not_kept_alive_until_exit(tmp_path):
+    writer = TraceWriter()
+    writer.append_line(tmp_path / "trace.jsonl", "a")
+    writer.close()
+    ref = weakref.ref(writer)
+    del writer
+    gc.collect()
+    assert ref() is None